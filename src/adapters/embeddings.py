@@ -171,6 +171,36 @@ class VectorStoreAdapter:
         vectors = self.vector_store.search_vectors(data_vector, brain_id, store, k)
         return sorted(vectors, key=lambda x: x.distance, reverse=True)
 
+    def search_vectors_batch(
+        self,
+        data_vectors: list[list[float]],
+        brain_id: str = "default",
+        store: str = "default",
+        k: int = 10,
+    ) -> list[list[Vector]]:
+        """
+        Search the top k vectors for each of the given vectors in one round trip, returning one list per input vector.
+        """
+        if not data_vectors:
+            return []
+        results = self.vector_store.search_vectors_batch(
+            data_vectors, brain_id, store, k
+        )
+        return [
+            sorted(vectors, key=lambda x: x.distance, reverse=True)
+            for vectors in results
+        ]
+
+    def similarity(self, vector: Vector) -> float | None:
+        """
+        Cosine similarity of a search hit to its query, whether the client reports a similarity or a distance.
+        """
+        if vector.distance is None:
+            return None
+        if getattr(self.vector_store, "distance_is_similarity", True):
+            return vector.distance
+        return 1.0 - vector.distance
+
     def get_by_ids(
         self, ids: list[str], store: str, brain_id: str = "default"
     ) -> list[Vector]:
@@ -8,8 +8,9 @@ Modified By: Christian Nonis <alch.infoemail@gmail.com>
 -----
 """
 
+import re
 from abc import ABC, abstractmethod
-from typing import Dict, List, Literal, Optional, Tuple
+from typing import Callable, Dict, List, Literal, Optional, Tuple
 from src.adapters.interfaces.graph import GraphClient, PredicateWithFlowKey
 from src.constants.embeddings import Vector
 from src.constants.kg import (
@@ -83,6 +84,23 @@ class NeighborVectorReductionStrategyFactory:
         return SimilarityOnlyReductionStrategy()
 
 
+# Clauses that make a raw graph operation a write (Cypher and SQL); matching one is enough to notify the listeners.
+_WRITE_OPERATION_PATTERN = re.compile(
+    r"\b(CREATE|MERGE|SET|DELETE|DETACH|REMOVE|DROP|INSERT|UPDATE)\b", re.IGNORECASE
+)
+
+_write_listeners: List[Callable[[str], None]] = []
+
+
+def add_graph_write_listener(listener: Callable[[str], None]) -> None:
+    """
+    Register a callback that every GraphAdapter calls with the brain id after writing to that brain's graph,
+    e.g. to drop cached graph reads.
+    """
+    if listener not in _write_listeners:
+        _write_listeners.append(listener)
+
+
 class GraphAdapter:
     """
     Adapter for the graph client.
@@ -118,6 +136,14 @@ class GraphAdapter:
         """
         self.graph = client
 
+    @staticmethod
+    def _written(brain_id: str) -> None:
+        """
+        Notify the write listeners that `brain_id`'s graph changed (or may have, when the write failed midway).
+        """
+        for listener in _write_listeners:
+            listener(brain_id)
+
     def execute_operation(self, operation: str, brain_id: str = "default") -> str:
         """
         Execute a generic graph operation.
@@ -128,6 +154,9 @@ class GraphAdapter:
         except Exception as e:  # pylint: disable=broad-exception-caught
             print(f"Error executing graph operation: {e} - {operation}")
             return f"Error executing graph operation: {e}"
+        finally:
+            if _WRITE_OPERATION_PATTERN.search(operation or ""):
+                self._written(brain_id)
 
     def add_nodes(
         self,
@@ -139,7 +168,10 @@ class GraphAdapter:
         """
         Add nodes to the graph.
         """
-        return self.graph.add_nodes(nodes, brain_id, identification_params, metadata)
+        try:
+            return self.graph.add_nodes(nodes, brain_id, identification_params, metadata)
+        finally:
+            self._written(brain_id)
 
     def add_relationship(
         self,
@@ -151,7 +183,25 @@ class GraphAdapter:
         """
         Add a relationship between two nodes to the graph.
         """
-        return self.graph.add_relationship(subject, predicate, to_object, brain_id)
+        try:
+            return self.graph.add_relationship(subject, predicate, to_object, brain_id)
+        finally:
+            self._written(brain_id)
+
+    def add_relationships(
+        self,
+        relationships: list[tuple[Node, Predicate, Node]],
+        brain_id: str = "default",
+    ) -> list:
+        """
+        Add several (subject, predicate, object) relationships to the graph in bulk.
+        """
+        if not relationships:
+            return []
+        try:
+            return self.graph.add_relationships(relationships, brain_id)
+        finally:
+            self._written(brain_id)
 
     def search_graph(
         self,
@@ -355,7 +405,10 @@ class GraphAdapter:
         """
         Deprecate a relationship from the graph.
         """
-        return self.graph.deprecate_relationship(subject, predicate, object, brain_id)
+        try:
+            return self.graph.deprecate_relationship(subject, predicate, object, brain_id)
+        finally:
+            self._written(brain_id)
 
     def update_properties(
         self,
@@ -382,9 +435,12 @@ class GraphAdapter:
             new_properties = {}
         if properties_to_remove is None:
             properties_to_remove = []
-        return self.graph.update_properties(
-            uuid, updating, brain_id, new_properties, properties_to_remove
-        )
+        try:
+            return self.graph.update_properties(
+                uuid, updating, brain_id, new_properties, properties_to_remove
+            )
+        finally:
+            self._written(brain_id)
 
     def get_graph_relationship_types(self, brain_id: str = "default") -> list[str]:
         """
@@ -441,15 +497,18 @@ class GraphAdapter:
         Returns:
             Node | None: The updated node if the update succeeded, or `None` if the node was not found.
         """
-        return self.graph.update_node(
-            uuid,
-            brain_id,
-            new_name,
-            new_description,
-            new_labels,
-            new_properties,
-            properties_to_remove,
-        )
+        try:
+            return self.graph.update_node(
+                uuid,
+                brain_id,
+                new_name,
+                new_description,
+                new_labels,
+                new_properties,
+                properties_to_remove,
+            )
+        finally:
+            self._written(brain_id)
 
     def get_schema(self, brain_id: str = "default") -> dict:
         """
@@ -796,7 +855,10 @@ class GraphAdapter:
         """
         Remove nodes from the graph.
         """
-        return self.graph.remove_nodes(uuids, brain_id)
+        try:
+            return self.graph.remove_nodes(uuids, brain_id)
+        finally:
+            self._written(brain_id)
 
     def remove_relationships(
         self,
@@ -806,7 +868,10 @@ class GraphAdapter:
         """
         Remove relationships from the graph.
         """
-        return self.graph.remove_relationships(relationships, brain_id)
+        try:
+            return self.graph.remove_relationships(relationships, brain_id)
+        finally:
+            self._written(brain_id)
 
     def list_relationships(
         self,
@@ -38,6 +38,10 @@ class VectorStoreClient(ABC):
     Abstract base class for vector store clients.
     """
 
+    # Whether search results carry a similarity (higher is closer) in `Vector.distance`, as Milvus' COSINE metric
+    # does, rather than a distance (lower is closer).
+    distance_is_similarity: bool = True
+
     @abstractmethod
     def add_vectors(
         self, vectors: list[Vector], store: str, brain_id: str
@@ -56,6 +60,18 @@ class VectorStoreClient(ABC):
         """
         raise NotImplementedError("search_vectors method not implemented")
 
+    def search_vectors_batch(
+        self, data_vectors: list[list[float]], brain_id: str, store: str, k: int = 10
+    ) -> list[list[Vector]]:
+        """
+        Search the top k vectors for each of the given vectors, in order.
+        Clients whose backend takes several query vectors in one request should override this.
+        """
+        return [
+            self.search_vectors(data_vector, brain_id, store, k)
+            for data_vector in data_vectors
+        ]
+
     @abstractmethod
     def get_by_ids(self, ids: list[str], store: str, brain_id: str) -> list[Vector]:
         """
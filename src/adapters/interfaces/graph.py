@@ -82,6 +82,21 @@ class GraphClient(ABC):
         """
         raise NotImplementedError("add_relationship method not implemented")
 
+    def add_relationships(
+        self,
+        relationships: List[Tuple[Node, Predicate, Node]],
+        brain_id: str,
+    ) -> list:
+        """
+        Add several (subject, predicate, object) relationships to the graph.
+
+        Backends that can write relationships in bulk override this; the default adds them one by one.
+        """
+        return [
+            self.add_relationship(subject, predicate, to_object, brain_id)
+            for subject, predicate, to_object in relationships
+        ]
+
     @abstractmethod
     def search_graph(
         self,
@@ -547,6 +547,17 @@ class Config:
         self.agentic_architecture: Literal["custom", "langchain"] = os.getenv(
             "AGENTIC_ARCHITECTURE", "custom"
         )
+        self.scout_cache_enabled = os.getenv("SCOUT_CACHE_ENABLED", "false") == "true"
+        self.scout_cache_similarity_threshold = float(
+            os.getenv("SCOUT_CACHE_SIMILARITY_THRESHOLD", "0.92")
+        )
+        self.scout_cache_semantic_enabled = (
+            os.getenv("SCOUT_CACHE_SEMANTIC_ENABLED", "false") == "true"
+        )
+        self.scout_cache_ttl = int(os.getenv("SCOUT_CACHE_TTL", "86400"))
+        self.janitor_tool_cache_enabled = (
+            os.getenv("JANITOR_TOOL_CACHE_ENABLED", "false") == "true"
+        )
 
 
 config = Config()
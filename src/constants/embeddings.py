@@ -24,6 +24,7 @@ EMBEDDING_STORES_SIZES = {
     "observations": OBSERVATIONS_DIMENSION,
     "data": DATA_DIMENSION,
     "relationships": EMBEDDING_RELATIONSHIPS_DIMENSION,
+    "scout_cache": EMBEDDING_NODES_DIMENSION,
 }
 
 
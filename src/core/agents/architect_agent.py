@@ -8,12 +8,13 @@ Modified By: Christian Nonis <alch.infoemail@gmail.com>
 -----
 """
 
-import json
+import logging
 import os
 import uuid
-from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from concurrent.futures import TimeoutError as FutureTimeoutError
-from typing import Callable, Dict, List, Literal, Optional, Tuple
+from typing import Callable, Dict, List, Literal, Optional, Tuple, Union
 
 from langchain.tools import BaseTool
 from pydantic import BaseModel
@@ -56,6 +57,11 @@ from src.core.agents.tools.architect_agent.ArchitectAgentCheckUsedEntitiesTool i
 )
 from src.core.agents.tools.architect_agent.ArchitectAgentCreateRelationshipTool import (
     ArchitectAgentCreateRelationshipTool,
+    FixedRelationshipScorer,
+    embed_fixed_relationship_texts,
+    index_fixed_relationships,
+    relationship_key,
+    relationship_texts,
 )
 from src.core.agents.tools.architect_agent.ArchitectAgentGetRemainingEntitiesToProcessTool import (
     ArchitectAgentGetRemainingEntitiesToProcessTool,
@@ -63,11 +69,22 @@ from src.core.agents.tools.architect_agent.ArchitectAgentGetRemainingEntitiesToP
 from src.core.agents.tools.architect_agent.ArchitectAgentMarkEntitiesAsUsedTool import (
     ArchitectAgentMarkEntitiesAsUsedTool,
 )
+from src.core.agents.tools.janitor_agent.tool_cache import janitor_tool_cache
 from src.core.plugins.prompts import prompt_registry
 from src.core.saving.ingestion_manager import IngestionManager
+from src.lib.neo4j.client import _neo4j_client
+from src.lib.redis.client import _redis_client
 from src.services.api.constants.requests import IngestionTripleSet
-from src.utils.cleanup import strip_properties
-from src.utils.similarity.vectors import cosine_similarity
+from src.services.input.agents import (
+    embeddings_adapter,
+    embeddings_small_adapter,
+    graph_adapter,
+    llm_small_adapter,
+    vector_store_adapter,
+)
+from src.utils.cleanup import strip_model, strip_properties
+from src.utils.serialization.data import join_json_fragments
+from src.utils.similarity.vectors import relationship_embedding_cache
 from src.utils.tokens import merge_token_details, token_detail_from_token_counts
 
 # from src.core.agents.tools.kg_agent import (
@@ -77,6 +94,41 @@ from src.utils.tokens import merge_token_details, token_detail_from_token_counts
 HISTORY_MAX_MESSAGES = 25
 HISTORY_MAX_MESSAGES_DELETE = 8
 MAX_RECURSION_LIMIT = 100
+JANITOR_AGENT_CACHE_SIZE = 4
+AGENT_DEBUG = os.environ.get("DEBUG", "false").lower() == "true"
+
+logger = logging.getLogger(__name__)
+
+
+def _dispatch_relationships(
+    relationships_json: str, brain_id: str, session_id: Optional[str]
+) -> None:
+    """
+    Queue a `process_architect_relationships` task. The session's pending-task counter has already been
+    incremented by the caller, so it is decremented again when the task cannot be queued.
+    """
+    # Deferred: the ingestion tasks module imports this module.
+    from src.workers.tasks.ingestion import process_architect_relationships
+
+    try:
+        task_result = process_architect_relationships.delay(
+            {
+                "relationships_json": relationships_json,
+                "brain_id": brain_id,
+                "session_id": session_id,
+            }
+        )
+    except Exception:
+        logger.exception(
+            "[architect_agent] Failed to queue relationships for session %s",
+            session_id,
+        )
+        if session_id:
+            _redis_client.client.decr(f"{brain_id}:session:{session_id}:pending_tasks")
+        return
+    logger.debug(
+        "[architect_agent] Task %s queued for session %s", task_result.id, session_id
+    )
 
 
 def _ingestion_partial_node_entity(node) -> ArchitectAgentEntity:
@@ -161,11 +213,20 @@ class ArchitectAgent:
         self.cached_tokens = 0
         self.reasoning_tokens = 0
         self.relationships_set: List[ArchitectAgentRelationship] = []
-        self.used_entities_dict = {}
+        # Serialized JSON of each relationships_set entry, appended alongside it so session snapshots never re-dump the history.
+        self.relationships_set_json: List[str] = []
+        # uuid -> entity still to process (a ScoutEntity, or its stripped dump in run_tooler). Tools look entities
+        # up and pop them by uuid, so every run rebuilds it keyed by uuid rather than as a list.
+        self.entities: Dict[str, Union[ScoutEntity, dict]] = {}
+        # uuid -> stripped dump of an entity the agent marked as used.
+        self.used_entities_dict: Dict[str, dict] = {}
+        self.used_entities_version = 0
         self.ingestion_manager = ingestion_manager
         self.session_id: Optional[str] = None
-        self.janitor_agent = None
-        self._janitor_agent_brain_id = None
+        # brain_id -> JanitorAgent, least recently used first.
+        self._janitor_agents: OrderedDict = OrderedDict()
+        self._dispatch_executor: Optional[ThreadPoolExecutor] = None
+        self._pending_dispatches: List[Future] = []
         # self.database_desc = database_desc
 
     def _get_tools(
@@ -294,7 +355,7 @@ class ArchitectAgent:
             tools=tools,
             system_prompt=system_prompt,
             output_schema=response_format,
-            debug=os.environ.get("DEBUG", "false").lower() == "true",
+            debug=AGENT_DEBUG,
             architecture=config.agentic_architecture,
             use_custom_backend=(mode == "coarse"),
         )
@@ -594,7 +655,7 @@ class ArchitectAgent:
 
         return ArchitectAgentResponse(
             new_nodes=[
-                ArchitectAgentNew(**new_node.model_dump(mode="json"))
+                ArchitectAgentNew(**new_node.model_dump())
                 for new_node in all_new_nodes
             ],
             relationships=[
@@ -619,7 +680,7 @@ class ArchitectAgent:
         if not self.session_id:
             self.session_id = str(uuid.uuid4())
 
-        rel_key = str(uuid.uuid4())
+        rel_key = uuid.uuid4().hex
         input_rels = [
             _ArchitectAgentRelationship(
                 tip=rel.tip,
@@ -633,31 +694,17 @@ class ArchitectAgent:
         ]
         output_rels: List[ArchitectAgentRelationship] = []
         fixed_relationships = []
-        fixed_rels_sets = set()
         janitor_response = None
         janitor_new_entities: List[ScoutEntity] = []
+        input_embeddings = None
 
         if mode == "granular":
-            from src.core.agents.janitor_agent import JanitorAgent
-            from src.lib.neo4j.client import _neo4j_client
-            from src.services.input.agents import (
-                embeddings_adapter,
-                graph_adapter,
-                llm_small_adapter,
-                vector_store_adapter,
+            # Embed the input-side texts while the janitor LLM call is in flight.
+            input_embeddings = relationship_embedding_cache.prefetch(
+                embeddings_small_adapter, relationship_texts(input_rels)
             )
 
-            janitor_agent = self.janitor_agent
-            if janitor_agent is None or self._janitor_agent_brain_id != brain_id:
-                janitor_agent = JanitorAgent(
-                    llm_small_adapter,
-                    kg=graph_adapter,
-                    vector_store=vector_store_adapter,
-                    embeddings=embeddings_adapter,
-                    database_desc=_neo4j_client.graphdb_description,
-                )
-                self.janitor_agent = janitor_agent
-                self._janitor_agent_brain_id = brain_id
+            janitor_agent = self.get_janitor_agent(brain_id)
             start_input_tokens = janitor_agent.input_tokens
             start_output_tokens = janitor_agent.output_tokens
             start_cached_tokens = janitor_agent.cached_tokens
@@ -700,10 +747,6 @@ class ArchitectAgent:
                 getattr(janitor_response, "fixed_relationships", []) or []
             )
             if fixed_relationships:
-                fixed_rels_sets = set(
-                    frozenset((fr.tip.uuid, fr.tail.uuid, fr.name))
-                    for fr in fixed_relationships
-                )
                 output_rels.extend(
                     [
                         ArchitectAgentRelationship(
@@ -723,115 +766,76 @@ class ArchitectAgent:
                     ]
                 )
 
-        from src.services.input.agents import embeddings_small_adapter
-
-        texts_to_embed = set()
-        for rel in input_rels:
-            texts_to_embed.add(rel.description if rel.description else rel.name)
-        for rel in fixed_relationships:
-            texts_to_embed.add(rel.description if rel.description else rel.name)
-
-        text_to_embedding = {}
-        if texts_to_embed:
-            texts_list = list(texts_to_embed)
-            vectors = embeddings_small_adapter.embed_texts(texts_list)
-            for embed_text, vector in zip(texts_list, vectors):
-                text_to_embedding[embed_text] = vector.embeddings
-
-        for rel in input_rels:
-            have_similar_relation = False
-            if frozenset((rel.tip.uuid, rel.tail.uuid, rel.name)) in fixed_rels_sets:
-                have_similar_relation = True
-            else:
-                rels_with_same_subject_and_object = [
-                    fr
-                    for fr in fixed_relationships
-                    if (fr.tip.uuid == rel.tip.uuid and fr.tail.uuid == rel.tail.uuid)
-                    or (fr.tip.uuid == rel.tail.uuid and fr.tail.uuid == rel.tip.uuid)
-                ]
-
-                if rels_with_same_subject_and_object:
-                    input_rel_text = rel.description if rel.description else rel.name
-                    input_embedding = text_to_embedding.get(input_rel_text)
-
-                    candidates = []
-                    for fr in rels_with_same_subject_and_object:
-                        fixed_rel_text = fr.description if fr.description else fr.name
-                        fixed_embedding = text_to_embedding.get(fixed_rel_text)
-
-                        if input_embedding and fixed_embedding:
-                            candidates.append(
-                                (
-                                    cosine_similarity(fixed_embedding, input_embedding),
-                                    fr,
-                                )
-                            )
-
-                    if candidates:
-                        similarity_score, _ = max(candidates, key=lambda x: x[0])
-                        if similarity_score > 0.90:
-                            have_similar_relation = True
-
-            if not have_similar_relation:
-                source_rel = next(
-                    (
-                        r
-                        for r in relationships
-                        if r.tip.uuid == rel.tip.uuid
-                        and r.tail.uuid == rel.tail.uuid
-                        and r.name == rel.name
+        if fixed_relationships:
+            fixed_rels_keys, fixed_rels_by_pair = index_fixed_relationships(
+                fixed_relationships
+            )
+            scorer = FixedRelationshipScorer(fixed_rels_by_pair)
+            # Unit vectors, so each comparison is a dot product; only the pairs that a near-identical predicate
+            # name does not already decide need their fixed relationship texts embedded.
+            text_to_embedding = embed_fixed_relationship_texts(
+                input_embeddings,
+                scorer.fixed_relationships_to_embed(input_rels, fixed_rels_keys),
+                embeddings_small_adapter,
+            )
+            new_rels = []
+            for rel in input_rels:
+                if relationship_key(rel) in fixed_rels_keys:
+                    continue
+                similarity_score, _ = scorer.most_similar(rel, text_to_embedding)
+                if similarity_score is not None and similarity_score > 0.90:
+                    continue
+                new_rels.append(rel)
+        else:
+            # Nothing came back from the janitor to deduplicate against.
+            new_rels = input_rels
+
+        # (tip, tail, name) -> first input relationship with that key, to carry its uuid/flow_key over.
+        source_rels: Dict[tuple, object] = {}
+        for r in relationships:
+            source_rels.setdefault((r.tip.uuid, r.tail.uuid, r.name), r)
+
+        for rel in new_rels:
+            source_rel = source_rels.get((rel.tip.uuid, rel.tail.uuid, rel.name))
+            output_rels.append(
+                ArchitectAgentRelationship(
+                    uuid=getattr(source_rel, "uuid", None) or str(uuid.uuid4()),
+                    flow_key=getattr(source_rel, "flow_key", None) or rel_key,
+                    tip=rel.tip,
+                    name=rel.name,
+                    description=rel.description,
+                    tail=rel.tail,
+                    properties=getattr(rel, "properties", {}),
+                    **(
+                        {"amount": getattr(rel, "amount", None)}
+                        if getattr(rel, "amount", None)
+                        else {}
                     ),
-                    None,
-                )
-                output_rels.append(
-                    ArchitectAgentRelationship(
-                        uuid=getattr(source_rel, "uuid", None) or str(uuid.uuid4()),
-                        flow_key=getattr(source_rel, "flow_key", None) or rel_key,
-                        tip=rel.tip,
-                        name=rel.name,
-                        description=rel.description,
-                        tail=rel.tail,
-                        properties=getattr(rel, "properties", {}),
-                        **(
-                            {"amount": getattr(rel, "amount", None)}
-                            if getattr(rel, "amount", None)
-                            else {}
-                        ),
-                    )
                 )
+            )
 
         relationships_data = [
-            rel.model_dump(mode="json")
+            rel.model_dump_json()
             for rel in output_rels
             if isinstance(rel, ArchitectAgentRelationship)
         ]
         if relationships_data:
-            from src.lib.redis.client import _redis_client
-            from src.workers.tasks.ingestion import process_architect_relationships
-
             if self.session_id:
                 _redis_client.client.incr(
                     f"{brain_id}:session:{self.session_id}:pending_tasks"
                 )
 
-            process_architect_relationships.delay(
-                {
-                    "relationships": relationships_data,
-                    "brain_id": brain_id,
-                    "session_id": self.session_id,
-                }
+            self.dispatch_relationships(
+                join_json_fragments(relationships_data), brain_id, self.session_id
             )
 
         self.relationships_set.extend(output_rels)
+        self.relationships_set_json.extend(relationships_data)
 
         if self.session_id and output_rels:
-            from src.lib.redis.client import _redis_client
-
             _redis_client.set(
                 f"session:{self.session_id}:relationships",
-                json.dumps(
-                    [rel.model_dump(mode="json") for rel in self.relationships_set]
-                ),
+                join_json_fragments(self.relationships_set_json),
                 brain_id=brain_id,
                 expires_in=3600,
             )
@@ -955,6 +959,7 @@ class ArchitectAgent:
         self.entities = entities_dict
         self.session_id = str(uuid.uuid4())
         self.relationships_set.clear()
+        self.relationships_set_json.clear()
 
         self._get_agent(
             output_schema=_ArchitectAgentResponse,
@@ -1282,9 +1287,10 @@ class ArchitectAgent:
                     all_relationships.append(rel)
                     pending_batch.append(_to_architect_relationship(rel))
 
+        self.wait_for_dispatches()
         return ArchitectAgentResponse(
             new_nodes=[
-                ArchitectAgentNew(**new_node.model_dump(mode="json"))
+                ArchitectAgentNew(**new_node.model_dump())
                 for new_node in all_new_nodes
             ],
             relationships=relationships_to_persist,
@@ -1322,17 +1328,11 @@ class ArchitectAgent:
         Raises:
             TimeoutError: If the agent fails to produce a response within `timeout` after the allowed retry attempts.
         """
-        import uuid
-
-        from src.lib.redis.client import _redis_client
-
         self.session_id = str(uuid.uuid4())
         self.relationships_set.clear()
+        self.relationships_set_json.clear()
 
-        entities_dict = {
-            entity.uuid: strip_properties([entity.model_dump(mode="json")])[0]
-            for entity in entities
-        }
+        entities_dict = {entity.uuid: strip_model(entity) for entity in entities}
         self.entities = entities_dict
 
         self._get_agent(
@@ -1503,9 +1503,65 @@ class ArchitectAgent:
                 raise
 
         _invoke_and_process(accumulated_messages)
+        self.wait_for_dispatches()
 
         return list(self.relationships_set)
 
+    def dispatch_relationships(
+        self, relationships_json: str, brain_id: str, session_id: Optional[str]
+    ) -> None:
+        """
+        Queue `process_architect_relationships` for a batch without blocking on the broker round-trip.
+
+        Publishes run in submission order on one background thread; callers increment the session's pending-task
+        counter before dispatching, as the worker decrements it. `wait_for_dispatches` waits for them.
+        """
+        # The worker will change the brain's graph later; janitor search/schema results are not cached until it has.
+        janitor_tool_cache.begin_write(brain_id, session_id)
+        if self._dispatch_executor is None:
+            self._dispatch_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="architect-dispatch"
+            )
+        self._pending_dispatches.append(
+            self._dispatch_executor.submit(
+                _dispatch_relationships, relationships_json, brain_id, session_id
+            )
+        )
+
+    def wait_for_dispatches(self) -> None:
+        """
+        Block until every relationship batch dispatched so far has been handed to the broker (or failed),
+        so callers that wait on the session's pending tasks see all of them.
+        """
+        pending_dispatches, self._pending_dispatches = self._pending_dispatches, []
+        for future in pending_dispatches:
+            future.result()
+
+    def get_janitor_agent(self, brain_id: str):
+        """
+        Return the JanitorAgent used for `brain_id`, reusing one of the last JANITOR_AGENT_CACHE_SIZE brains' agents
+        so alternating brains do not rebuild them.
+        """
+        janitor_agent = self._janitor_agents.get(brain_id)
+        if janitor_agent is not None:
+            self._janitor_agents.move_to_end(brain_id)
+            return janitor_agent
+
+        # Deferred: janitor_agent imports this module.
+        from src.core.agents.janitor_agent import JanitorAgent
+
+        janitor_agent = JanitorAgent(
+            llm_small_adapter,
+            kg=graph_adapter,
+            vector_store=vector_store_adapter,
+            embeddings=embeddings_adapter,
+            database_desc=_neo4j_client.graphdb_description,
+        )
+        self._janitor_agents[brain_id] = janitor_agent
+        if len(self._janitor_agents) > JANITOR_AGENT_CACHE_SIZE:
+            self._janitor_agents.popitem(last=False)
+        return janitor_agent
+
     def _update_token_counts(self, usage_metadata: dict):
         """
         Update the agent's token counters from an LLM usage metadata dictionary.
@@ -1517,14 +1573,20 @@ class ArchitectAgent:
                 - "input_token_details": dict with "cache_read" (int) for cached input token reads.
                 - "output_token_details": dict with "reasoning" (int) for tokens spent on reasoning.
         """
+        if not usage_metadata:
+            return
+        get = usage_metadata.get
+
         # Base counts
-        self.input_tokens += usage_metadata.get("input_tokens", 0)
-        self.output_tokens += usage_metadata.get("output_tokens", 0)
+        self.input_tokens += get("input_tokens", 0)
+        self.output_tokens += get("output_tokens", 0)
 
-        # Input details (caching)
-        input_details = usage_metadata.get("input_token_details", {})
-        self.cached_tokens += input_details.get("cache_read", 0)
+        # Input details (caching), skipped without allocating a default dict
+        input_details = get("input_token_details")
+        if input_details:
+            self.cached_tokens += input_details.get("cache_read", 0)
 
         # Output details (reasoning)
-        output_details = usage_metadata.get("output_token_details", {})
-        self.reasoning_tokens += output_details.get("reasoning", 0)
+        output_details = get("output_token_details")
+        if output_details:
+            self.reasoning_tokens += output_details.get("reasoning", 0)
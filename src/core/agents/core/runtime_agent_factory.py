@@ -21,6 +21,7 @@ class RuntimeAgentFactory:
         debug: bool = False,
         architecture: str = "custom",
         use_custom_backend: bool = False,
+        checkpointer: Any = None,
     ):
         if use_custom_backend or architecture == "custom":
             custom_agent_cls = self._custom_agent_cls
@@ -35,12 +36,14 @@ class RuntimeAgentFactory:
                 output_schema=output_schema,
                 debug=debug,
             )
+        extra_kwargs = {"checkpointer": checkpointer} if checkpointer is not None else {}
         return self._create_agent_fn(
             model=model,
             tools=tools,
             system_prompt=system_prompt,
             response_format=output_schema,
             debug=debug,
+            **extra_kwargs,
         )
 
 
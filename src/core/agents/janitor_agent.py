@@ -10,6 +10,7 @@ Modified By: Christian Nonis <alch.infoemail@gmail.com>
 
 import json
 import os
+import threading
 from functools import reduce
 from typing import Callable, List, Literal, Optional, Tuple, Union
 from langchain.agents.structured_output import ToolStrategy
@@ -50,6 +51,11 @@ from src.core.agents.tools.janitor_agent import (
     JanitorAgentSearchEntitiesTool,
     JanitorAgentExecuteGraphReadOperationTool,
 )
+from src.core.agents.tools.janitor_agent.JanitorAgentGetSchemaTool import (
+    SCHEMA_TOOL_NAME,
+    schema_json,
+)
+from src.core.agents.tools.janitor_agent.tool_cache import janitor_tool_cache
 from src.core.agents.tools.janitor_agent.JanitorAgentSearchRelationshipTool import (
     JanitorAgentSearchRelationshipsTool,
 )
@@ -59,6 +65,45 @@ from src.utils.tokens import token_detail_from_token_counts
 
 HISTORY_MAX_MESSAGES = 25
 HISTORY_MAX_MESSAGES_DELETE = 8
+AGENT_DEBUG = os.environ.get("DEBUG", "false").lower() == "true"
+
+# Threads are only started on the first submit, so building the executor at import time is fork-safe.
+_SCHEMA_PREFETCH_EXECUTOR = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="janitor-schema-prefetch"
+)
+
+
+_SCHEMA_PREFETCHES_IN_FLIGHT: set[str] = set()
+_SCHEMA_PREFETCH_LOCK = threading.Lock()
+
+
+def _prefetch_relationship_schema(kg: GraphAdapter, brain_id: str) -> None:
+    try:
+        schema_json(kg, brain_id, "relationship_types")
+    except Exception as e:
+        print(f"[!] Janitor schema prefetch failed for {brain_id}: {e}")
+    finally:
+        with _SCHEMA_PREFETCH_LOCK:
+            _SCHEMA_PREFETCHES_IN_FLIGHT.discard(brain_id)
+
+
+def _submit_relationship_schema_prefetch(kg: GraphAdapter, brain_id: str) -> None:
+    """
+    Warm the cached relationship types of `brain_id` in the background. Skipped when the result could not be cached
+    (cache disabled or writes to the brain pending), is cached already, or a prefetch for the brain is still running.
+    """
+    if janitor_tool_cache.epoch(brain_id) is None:
+        return
+    if (
+        janitor_tool_cache.get(brain_id, SCHEMA_TOOL_NAME, "relationship_types")
+        is not None
+    ):
+        return
+    with _SCHEMA_PREFETCH_LOCK:
+        if brain_id in _SCHEMA_PREFETCHES_IN_FLIGHT:
+            return
+        _SCHEMA_PREFETCHES_IN_FLIGHT.add(brain_id)
+    _SCHEMA_PREFETCH_EXECUTOR.submit(_prefetch_relationship_schema, kg, brain_id)
 
 
 class JanitorAgentInputOutput(BaseModel):
@@ -191,7 +236,7 @@ class JanitorAgent:
             tools=(tools if tools else self._get_tools(brain_id)),
             system_prompt=system_prompt,
             output_schema=response_format,
-            debug=os.environ.get("DEBUG", "false").lower() == "true",
+            debug=AGENT_DEBUG,
             architecture=config.agentic_architecture,
         )
 
@@ -623,6 +668,10 @@ class JanitorAgent:
             TimeoutError: If the agent invocation times out or fails after the configured retry attempts.
         """
 
+        # The atomic janitor prompt always has the agent look up the relationship types with get_schema; warm that
+        # answer while the agent is built and the first LLM turn runs.
+        _submit_relationship_schema_prefetch(self.kg, brain_id)
+
         self._get_agent(
             output_schemas=AtomicJanitorAgentInputOutput,
             brain_id=brain_id,
@@ -783,14 +832,20 @@ class JanitorAgent:
                 - "input_token_details": dict with optional "cache_read" to add to `cached_tokens`
                 - "output_token_details": dict with optional "reasoning" to add to `reasoning_tokens`
         """
+        if not usage_metadata:
+            return
+        get = usage_metadata.get
+
         # Base counts
-        self.input_tokens += usage_metadata.get("input_tokens", 0)
-        self.output_tokens += usage_metadata.get("output_tokens", 0)
+        self.input_tokens += get("input_tokens", 0)
+        self.output_tokens += get("output_tokens", 0)
 
-        # Input details (caching)
-        input_details = usage_metadata.get("input_token_details", {})
-        self.cached_tokens += input_details.get("cache_read", 0)
+        # Input details (caching), skipped without allocating a default dict
+        input_details = get("input_token_details")
+        if input_details:
+            self.cached_tokens += input_details.get("cache_read", 0)
 
         # Output details (reasoning)
-        output_details = usage_metadata.get("output_token_details", {})
-        self.reasoning_tokens += output_details.get("reasoning", 0)
+        output_details = get("output_token_details")
+        if output_details:
+            self.reasoning_tokens += output_details.get("reasoning", 0)
@@ -9,6 +9,7 @@ Modified By: Christian Nonis <alch.infoemail@gmail.com>
 """
 
 import os
+import uuid
 from typing import Callable, Iterable, List, Literal, Optional, Union
 from langchain.tools import BaseTool
 from pydantic import BaseModel
@@ -39,6 +40,7 @@ from src.constants.prompts.kg_agent import (
     KG_AGENT_VERIFY_ENTITY_EXISTENCE_SYSTEM_PROMPT,
 )
 from src.core.agents.core import parse_structured_from_messages, runtime_agent_factory
+from src.core.agents.core.parsing import normalize_message_content
 from src.core.plugins.prompts import prompt_registry
 from src.core.agents.tools.kg_agent import (
     KGAgentAddTripletsTool,
@@ -60,6 +62,8 @@ from src.utils.tokens import token_detail_from_token_counts
 
 MAX_RECURSION_LIMIT = 50
 MAX_RECURSION_LIMIT_GRAPH_CONSOLIDATOR = 50
+FAST_PATH_TIMEOUT_SECONDS = 3600
+AGENT_DEBUG = os.environ.get("DEBUG", "false").lower() == "true"
 
 
 class EntityExistenceResult(BaseModel):
@@ -212,12 +216,75 @@ class KGAgent:
             ),
             system_prompt=system_prompt,
             output_schema=output_schema if output_schema else None,
-            debug=os.environ.get("DEBUG", "false").lower() == "true",
+            debug=AGENT_DEBUG,
             architecture=config.agentic_architecture,
         )
         self._agent_type = type_
         self._agent_brain_id = brain_id
 
+    def _get_db_schema_prompt(self) -> str:
+        """
+        Build the extra system prompt describing the graph property keys, relationships and entities.
+        """
+        graph_db_prop_keys = self.kg.get_graph_property_keys()
+        graph_db_relationships = self.kg.get_graph_relationships()
+        graph_db_entities = self.kg.get_graph_entities()
+
+        return f"""
+        The following are the information and schemas about the db, you must only use the following information to operate with the db:
+        {{
+            "property_keys": {graph_db_prop_keys},
+            "relationships": {graph_db_relationships},
+            "entities": {graph_db_entities},
+        }}
+        """
+
+    @staticmethod
+    def _build_looking_for_prompt(
+        looking_for: Optional[Union[str, Iterable[str]]],
+    ) -> str:
+        """
+        Build the neighbor retrieval reasons section from a single reason or an iterable of reasons.
+        """
+        if not looking_for:
+            reasons = ""
+        elif isinstance(looking_for, str):
+            reasons = f"- {looking_for}"
+        else:
+            reasons = " ".join(f"- {reason}" for reason in looking_for)
+
+        return f"""
+        You must look for neighbors for the main node considering this reasons:
+        {reasons}
+        """
+
+    def session(
+        self,
+        identification_params: Optional[dict] = None,
+        metadata: Optional[dict] = None,
+        brain_id: str = "default",
+        thread_id: Optional[str] = None,
+    ) -> "KGAgentSession":
+        """
+        Open a multi-turn session that compiles a single agent for paired update/retrieve calls.
+
+        Parameters:
+            identification_params (Optional[dict]): Identification details used by the add/search tools.
+            metadata (Optional[dict]): Metadata appended to the nodes created during the session.
+            brain_id (str): Identifier of the knowledge graph brain to target.
+            thread_id (Optional[str]): Checkpointer thread id (e.g. the ingestion session id); a random one is used if omitted.
+
+        Returns:
+            KGAgentSession: A session exposing `update(...)` and `retrieve(...)`.
+        """
+        return KGAgentSession(
+            self,
+            identification_params=identification_params or {},
+            metadata=metadata or {},
+            brain_id=brain_id,
+            thread_id=thread_id,
+        )
+
     def search_kg(self, query: str) -> str:
         """
         Search the knowledge graph for information.
@@ -411,18 +478,7 @@ class KGAgent:
             RetrieveNeighborsOutputSchema: Structured neighbor data containing the matching nodes, relationships, and associated properties.
         """
 
-        graph_db_prop_keys = self.kg.get_graph_property_keys()
-        graph_db_relationships = self.kg.get_graph_relationships()
-        graph_db_entities = self.kg.get_graph_entities()
-
-        extra_system_prompt_str = f"""
-        The following are the information and schemas about the db, you must only use the following information to operate with the db:
-        {{
-            "property_keys": {graph_db_prop_keys},
-            "relationships": {graph_db_relationships},
-            "entities": {graph_db_entities},
-        }}
-        """
+        extra_system_prompt_str = self._get_db_schema_prompt()
 
         self._get_agent(
             type_="normal",
@@ -441,15 +497,7 @@ class KGAgent:
             brain_id=brain_id,
         )
 
-        if isinstance(looking_for, str):
-            looking_for_items = [looking_for]
-        else:
-            looking_for_items = list(looking_for) if looking_for else []
-
-        looking_for_prompt = f"""
-        You must look for neighbors for the main node considering this reasons:
-        {" ".join([f"- {reason}" for reason in looking_for_items])}
-        """
+        looking_for_prompt = self._build_looking_for_prompt(looking_for)
 
         _response = self.agent.invoke(
             {
@@ -480,7 +528,7 @@ class KGAgent:
         self,
         task: str,
         brain_id: str = "default",
-        timeout: int = 180,
+        timeout: Optional[int] = 180,
         max_retries: int = 3,
         reuse_agent: bool = True,
     ) -> str:
@@ -490,7 +538,8 @@ class KGAgent:
         Parameters:
             task (str): Natural-language instruction describing the consolidation operation to run.
             brain_id (str): Identifier of the knowledge graph brain to target; defaults to "default".
-            timeout (int): Maximum seconds to wait for a single agent invocation before timing out.
+            timeout (Optional[int]): Maximum seconds to wait for a single agent invocation before timing out.
+                None (or at least FAST_PATH_TIMEOUT_SECONDS) invokes the agent on the calling thread and relies on the LLM client's own timeouts.
             max_retries (int): Maximum number of retry attempts for the agent invocation when timeouts occur.
 
         Returns:
@@ -584,7 +633,7 @@ class KGAgent:
             """
             Invoke the graph-consolidator agent with a timeout and update token accounting from the response.
 
-            Waits up to `timeout` seconds for the agent invocation to complete. For any returned message that contains `usage_metadata`, updates the agent's token counters and `token_detail`. Returns the agent response dictionary.
+            Waits up to `timeout` seconds for the agent invocation to complete, or invokes it inline on the fast path. For any returned message that contains `usage_metadata`, updates the agent's token counters and `token_detail`. Returns the agent response dictionary.
 
             Returns:
                 dict: The agent response.
@@ -592,26 +641,32 @@ class KGAgent:
             Raises:
                 TimeoutError: If the agent invocation does not complete within `timeout` seconds.
             """
-            try:
-                with ThreadPoolExecutor(max_workers=1) as executor:
-                    future = executor.submit(_invoke_agent)
-                    response = future.result(timeout=timeout)
-                    for m in response.get("messages", []):
-                        if hasattr(m, "usage_metadata"):
-                            self._update_token_counts(m.usage_metadata)
-                            self.token_detail = token_detail_from_token_counts(
-                                self.input_tokens,
-                                self.output_tokens,
-                                self.cached_tokens,
-                                self.reasoning_tokens,
-                                "kg_agent",
-                            )
-                    return response
-            except FutureTimeoutError:
-                raise TimeoutError(
-                    f"Graph consolidator operator invoke timed out after {timeout} seconds. "
-                    "This may indicate a network issue or the LLM service is unresponsive."
+            if timeout is None or timeout >= FAST_PATH_TIMEOUT_SECONDS:
+                response = _invoke_agent()
+            else:
+                try:
+                    with ThreadPoolExecutor(max_workers=1) as executor:
+                        future = executor.submit(_invoke_agent)
+                        response = future.result(timeout=timeout)
+                except FutureTimeoutError:
+                    raise TimeoutError(
+                        f"Graph consolidator operator invoke timed out after {timeout} seconds. "
+                        "This may indicate a network issue or the LLM service is unresponsive."
+                    )
+            usage_seen = False
+            for m in response.get("messages", []):
+                if hasattr(m, "usage_metadata"):
+                    self._update_token_counts(m.usage_metadata)
+                    usage_seen = True
+            if usage_seen:
+                self.token_detail = token_detail_from_token_counts(
+                    self.input_tokens,
+                    self.output_tokens,
+                    self.cached_tokens,
+                    self.reasoning_tokens,
+                    "kg_agent",
                 )
+            return response
 
         try:
             response = _invoke_agent_with_retry()
@@ -646,14 +701,192 @@ class KGAgent:
                 - "input_token_details": dict with "cache_read" (int) for cached input tokens
                 - "output_token_details": dict with "reasoning" (int) for reasoning/output tokens
         """
+        if not usage_metadata:
+            return
+        get = usage_metadata.get
+
         # Base counts
-        self.input_tokens += usage_metadata.get("input_tokens", 0)
-        self.output_tokens += usage_metadata.get("output_tokens", 0)
+        self.input_tokens += get("input_tokens", 0)
+        self.output_tokens += get("output_tokens", 0)
 
-        # Input details (caching)
-        input_details = usage_metadata.get("input_token_details", {})
-        self.cached_tokens += input_details.get("cache_read", 0)
+        # Input details (caching), skipped without allocating a default dict
+        input_details = get("input_token_details")
+        if input_details:
+            self.cached_tokens += input_details.get("cache_read", 0)
 
         # Output details (reasoning)
-        output_details = usage_metadata.get("output_token_details", {})
-        self.reasoning_tokens += output_details.get("reasoning", 0)
+        output_details = get("output_token_details")
+        if output_details:
+            self.reasoning_tokens += output_details.get("reasoning", 0)
+
+
+class KGAgentSession:
+    """
+    Graph-aware KG agent session.
+
+    Compiles one agent with the add, search and graph operation toolsets and keeps it
+    alive across turns, so that `update` followed by `retrieve` on the same node does
+    not rebuild the agent nor re-send the db schema.
+
+    With the langchain architecture the compiled graph gets an in-memory LangGraph
+    checkpointer and each turn only ships the new user message under `thread_id`.
+    The custom backend has no checkpointer, so the user prompts and final assistant
+    answers are carried between turns instead, without the intermediate tool traffic.
+    """
+
+    def __init__(
+        self,
+        kg_agent: KGAgent,
+        identification_params: dict,
+        metadata: dict,
+        brain_id: str = "default",
+        thread_id: Optional[str] = None,
+    ):
+        self.kg_agent = kg_agent
+        self.identification_params = identification_params
+        self.metadata = metadata
+        self.brain_id = brain_id
+        self.thread_id = thread_id or str(uuid.uuid4())
+        self.history: list[dict] = []
+        self.checkpointer = None
+        if config.agentic_architecture != "custom":
+            from langgraph.checkpoint.memory import InMemorySaver
+
+            self.checkpointer = InMemorySaver()
+        self.agent = runtime_agent_factory.build(
+            model=kg_agent.llm_adapter.llm.langchain_model,
+            tools=[
+                KGAgentAddTripletsTool(
+                    kg_agent,
+                    kg_agent.kg,
+                    kg_agent.vector_store,
+                    kg_agent.embeddings,
+                    identification_params,
+                    metadata,
+                    brain_id=brain_id,
+                ),
+                KGAgentSearchGraphTool(
+                    kg_agent,
+                    kg_agent.kg,
+                    kg_agent.vector_store,
+                    kg_agent.embeddings,
+                    identification_params,
+                    metadata,
+                    brain_id=brain_id,
+                ),
+                KGAgentExecuteGraphOperationTool(
+                    kg_agent,
+                    kg_agent.kg,
+                    kg_agent.database_desc,
+                    brain_id=brain_id,
+                ),
+            ],
+            system_prompt=KGAgent._SYSTEM_PROMPT_BUILDERS["normal"](
+                kg_agent._get_db_schema_prompt()
+            ),
+            debug=AGENT_DEBUG,
+            architecture=config.agentic_architecture,
+            checkpointer=self.checkpointer,
+        )
+
+    def _invoke(self, content: str) -> dict:
+        """
+        Send a user turn to the session agent and record the final answer.
+
+        With a checkpointer the previous turns are resumed from the `thread_id` state,
+        otherwise they are replayed from the session history.
+        """
+        user_message = {"role": "user", "content": content}
+        invoke_config = {
+            "recursion_limit": MAX_RECURSION_LIMIT,
+            "tags": ["kg_agent", "kg_agent_session"],
+            "metadata": {"agent": "kg_agent", "brain_id": self.brain_id},
+        }
+        if self.checkpointer is not None:
+            invoke_config["configurable"] = {"thread_id": self.thread_id}
+            response = self.agent.invoke(
+                {"messages": [user_message]}, config=invoke_config
+            )
+        else:
+            response = self.agent.invoke(
+                {"messages": [*self.history, user_message]}, config=invoke_config
+            )
+        messages = response.get("messages", [])
+        for m in messages:
+            if hasattr(m, "usage_metadata"):
+                self.kg_agent._update_token_counts(m.usage_metadata)
+        if self.checkpointer is not None:
+            return response
+        self.history.append(user_message)
+        if messages:
+            last = messages[-1]
+            answer = normalize_message_content(
+                last.get("content")
+                if isinstance(last, dict)
+                else getattr(last, "content", None)
+            )
+            if answer:
+                self.history.append({"role": "assistant", "content": answer})
+        return response
+
+    def update(
+        self,
+        information: str,
+        preferred_entities: Optional[list[str]] = None,
+    ) -> dict:
+        """
+        Update the knowledge graph with new information within the session.
+        """
+        preferred_entities_prompt = f"""
+        You must prioritize the extraction of the following entities: {preferred_entities}, 
+        search and extract triplets including these entities first.
+        """
+        return self._invoke(
+            prompt_registry.get("KG_AGENT_UPDATE_PROMPT", KG_AGENT_UPDATE_PROMPT).format(
+                information=information,
+                preferred_entities=(
+                    preferred_entities_prompt if preferred_entities else ""
+                ),
+                metadata=self.metadata,
+                identification_params=self.identification_params,
+            )
+        )
+
+    def retrieve(
+        self,
+        node: Node,
+        looking_for: Optional[Union[str, Iterable[str]]] = None,
+        limit: int = 10,
+    ) -> RetrieveNeighborsOutputSchema:
+        """
+        Retrieve the neighbors of a node within the session, reusing the context of previous turns.
+
+        The session agent is built without an output schema, so the answer is parsed from the
+        last message. When that fails, the neighbors are retrieved with the one-shot
+        `KGAgent.retrieve_neighbors`, which enforces `RetrieveNeighborsOutputSchema`.
+        """
+        response = self._invoke(
+            prompt_registry.get(
+                "KG_AGENT_RETRIEVE_NEIGHBORS_PROMPT",
+                KG_AGENT_RETRIEVE_NEIGHBORS_PROMPT,
+            ).format(
+                main_node=node,
+                looking_for=KGAgent._build_looking_for_prompt(looking_for),
+                limit=limit,
+            )
+        )
+        structured = response.get("structured_response")
+        if isinstance(structured, RetrieveNeighborsOutputSchema):
+            return structured
+        parsed = parse_structured_from_messages(
+            response.get("messages", []), RetrieveNeighborsOutputSchema
+        )
+        if parsed is not None:
+            return parsed
+        print(
+            "[!] KG agent session answer is not a valid neighbors output, "
+            "falling back to a one-shot retrieval"
+        )
+        return self.kg_agent.retrieve_neighbors(
+            node, looking_for, limit, brain_id=self.brain_id
+        )
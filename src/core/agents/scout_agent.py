@@ -8,15 +8,22 @@ Modified By: Christian Nonis <alch.infoemail@gmail.com>
 -----
 """
 
+import asyncio
+import hashlib
+import logging
 import os
+import sys
+import threading
+import time
 import uuid
 from concurrent.futures import ThreadPoolExecutor
 from concurrent.futures import TimeoutError as FutureTimeoutError
-from typing import Dict, List, Literal, Optional
+from typing import Dict, List, Literal, Optional, Union
 
 from langchain.tools import BaseTool
 from pydantic import BaseModel, Field
 from tenacity import (
+    AsyncRetrying,
     RetryError,
     retry,
     retry_if_exception_type,
@@ -24,11 +31,22 @@ from tenacity import (
     wait_exponential,
 )
 
+try:
+    import httpx
+except ModuleNotFoundError:
+    httpx = None
+
+try:
+    import openai
+except ModuleNotFoundError:
+    openai = None
+
 from src.adapters.cache import CacheAdapter
 from src.adapters.embeddings import EmbeddingsAdapter, VectorStoreAdapter
 from src.adapters.graph import GraphAdapter
 from src.adapters.llm import LLMAdapter
 from src.config import config
+from src.constants.embeddings import Vector
 from src.constants.kg import Node
 from src.constants.prompts.scout_agent import (
     SCOUT_AGENT_COARSE_EXTRACT_ENTITIES_PROMPT,
@@ -42,6 +60,80 @@ from src.core.plugins.prompts import prompt_registry
 from src.services.api.constants.requests import IngestionTripleSet
 from src.utils.tokens import token_detail_from_token_counts
 
+logger = logging.getLogger(__name__)
+
+FAST_PATH_TIMEOUT_SECONDS = 3600
+SCOUT_AGENT_EXECUTOR_WORKERS = 4
+SCOUT_CACHE_STORE = "scout_cache"
+SCOUT_CACHE_KEY_PREFIX = "scout_cache:"
+SCOUT_CACHE_SEMANTIC_CANDIDATES = 5
+AGENT_DEBUG = os.environ.get("DEBUG", "false").lower() == "true"
+
+# Transient failures worth retrying with backoff: timeouts, dropped connections and provider-side
+# 5xx / rate limits. Client errors (4xx, validation) are not retried.
+SCOUT_RETRYABLE_EXCEPTIONS: tuple = (TimeoutError, ConnectionError)
+if httpx is not None:
+    SCOUT_RETRYABLE_EXCEPTIONS += (httpx.TransportError,)
+if openai is not None:
+    SCOUT_RETRYABLE_EXCEPTIONS += (
+        openai.APIConnectionError,
+        openai.InternalServerError,
+        openai.RateLimitError,
+    )
+
+_EXTRACT_PROMPTS_BY_MODE = {
+    "granular": (
+        "SCOUT_AGENT_EXTRACT_ENTITIES_PROMPT",
+        SCOUT_AGENT_EXTRACT_ENTITIES_PROMPT,
+    ),
+    "coarse": (
+        "SCOUT_AGENT_COARSE_EXTRACT_ENTITIES_PROMPT",
+        SCOUT_AGENT_COARSE_EXTRACT_ENTITIES_PROMPT,
+    ),
+}
+
+
+def _is_free_threaded() -> bool:
+    """
+    True on free-threaded interpreters (3.13t+) running with the GIL disabled.
+    """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def _log_retry(retry_state) -> None:
+    """
+    tenacity `before_sleep` hook: log the failed scout attempt before backing off.
+    """
+    logger.warning(
+        "Scout agent invoke failed (attempt %d), retrying: %r",
+        retry_state.attempt_number,
+        retry_state.outcome.exception() if retry_state.outcome else None,
+    )
+
+
+def _prompt_digest(system_prompt: str, user_prompt: str) -> str:
+    return hashlib.sha256(
+        "\x00".join((system_prompt, user_prompt)).encode("utf-8")
+    ).hexdigest()
+
+
+def _with_prompt_cache_key(model, prompt_cache_key: str):
+    """
+    Tag OpenAI chat models with a `prompt_cache_key` so that calls sharing the static scout system prompt
+    are routed to the same prompt cache; other providers (and OpenAI-compatible endpoints) are returned unchanged.
+    """
+    if type(model).__name__ != "ChatOpenAI" or (config.openai and config.openai.base_url):
+        return model
+    return model.model_copy(
+        update={
+            "model_kwargs": {
+                **(model.model_kwargs or {}),
+                "prompt_cache_key": prompt_cache_key,
+            }
+        }
+    )
+
 
 class _ScoutEntity(BaseModel):
     """
@@ -83,6 +175,7 @@ class ScoutAgentResponse(BaseModel):
     entities: List[ScoutEntity]
     input_tokens: int
     output_tokens: int
+    cached_tokens: int = 0
 
 
 class ScoutAgent:
@@ -97,11 +190,13 @@ class ScoutAgent:
         kg: GraphAdapter,
         vector_store: VectorStoreAdapter,
         embeddings: EmbeddingsAdapter,
+        executor: Optional[ThreadPoolExecutor] = None,
     ):
         """
         Initialize a ScoutAgent with the provided adapters and reset internal agent and token-tracking state.
 
         Stores the provided LLM, cache, knowledge graph, vector store, and embeddings adapters on the instance, sets the agent and token_detail to None, and initializes input_tokens, output_tokens, cached_tokens, and reasoning_tokens counters to zero.
+        The timed invocations run on `executor` when given (so several agents can share one pool), otherwise on a pool owned by this agent and released by `close()`.
         """
         self.llm_adapter = llm_adapter
         self.cache_adapter = cache_adapter
@@ -114,6 +209,21 @@ class ScoutAgent:
         self.output_tokens = 0
         self.cached_tokens = 0
         self.reasoning_tokens = 0
+        self._system_prompts: Dict[tuple, str] = {}
+        self._usage_lock = threading.Lock()
+        self._agents: Dict[tuple, object] = {}
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=SCOUT_AGENT_EXECUTOR_WORKERS,
+            thread_name_prefix="scout-agent",
+        )
+
+    def close(self) -> None:
+        """
+        Release the invocation thread pool if it is owned by this agent.
+        """
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
 
     def _get_tools(self, brain_id: str = "default") -> List[BaseTool]:
         """
@@ -127,6 +237,21 @@ class ScoutAgent:
         """
         return []
 
+    @staticmethod
+    def _system_template(mode: Literal["granular", "coarse"]) -> str:
+        """
+        Resolve the system prompt template of `mode`, honouring prompt_registry overrides.
+        """
+        if mode == "granular":
+            return prompt_registry.get(
+                "SCOUT_AGENT_SYSTEM_PROMPT", SCOUT_AGENT_SYSTEM_PROMPT
+            )
+        if mode == "coarse":
+            return prompt_registry.get(
+                "SCOUT_AGENT_COARSE_SYSTEM_PROMPT", SCOUT_AGENT_COARSE_SYSTEM_PROMPT
+            )
+        raise ValueError(f"Invalid mode for scout agent: {mode}")
+
     def _get_agent(
         self,
         tools: Optional[List[BaseTool]] = None,
@@ -135,36 +260,56 @@ class ScoutAgent:
         brain_id: str = "default",
         mode: Literal["granular", "coarse"] = "granular",
     ):
-        if mode == "granular":
-            system_prompt = prompt_registry.get(
-                "SCOUT_AGENT_SYSTEM_PROMPT", SCOUT_AGENT_SYSTEM_PROMPT
-            ).format(
-                extra_system_prompt=extra_system_prompt if extra_system_prompt else ""
-            )
-        elif mode == "coarse":
-            system_prompt = prompt_registry.get(
-                "SCOUT_AGENT_COARSE_SYSTEM_PROMPT", SCOUT_AGENT_COARSE_SYSTEM_PROMPT
-            ).format(
-                extra_system_prompt=extra_system_prompt if extra_system_prompt else ""
-            )
-        else:
-            raise ValueError(f"Invalid mode for scout agent: {mode}")
-
-        self.agent = runtime_agent_factory.build(
-            model=self.llm_adapter.llm.langchain_model,
-            tools=(tools if tools else self._get_tools(brain_id)),
-            system_prompt=system_prompt,
-            output_schema=output_schema if output_schema else None,
-            debug=os.environ.get("DEBUG", "false").lower() == "true",
-            architecture=config.agentic_architecture,
-            use_custom_backend=(mode == "coarse"),
+        """
+        Return the agent for the given mode and output schema, also exposing it as `self.agent`.
+
+        Formatted system prompts are memoized per template. Compiled langchain graphs are stateless and are
+        reused across calls; the custom AgentBase keeps per-invocation state, so it is built for every call
+        to stay safe under concurrent `arun_batch` invocations.
+        """
+        template = self._system_template(mode)
+
+        extra = extra_system_prompt if extra_system_prompt else ""
+        prompt_key = (template, str(extra))
+        system_prompt = self._system_prompts.get(prompt_key)
+        if system_prompt is None:
+            system_prompt = template.format(extra_system_prompt=extra)
+            self._system_prompts[prompt_key] = system_prompt
+
+        use_custom_backend = mode == "coarse"
+        reusable = (
+            not tools
+            and not use_custom_backend
+            and config.agentic_architecture != "custom"
         )
+        agent_key = (
+            system_prompt,
+            brain_id,
+            getattr(output_schema, "__name__", None),
+        )
+        agent = self._agents.get(agent_key) if reusable else None
+        if agent is None:
+            agent = runtime_agent_factory.build(
+                model=_with_prompt_cache_key(
+                    self.llm_adapter.llm.langchain_model, f"scout_agent_{mode}_v1"
+                ),
+                tools=(tools if tools else self._get_tools(brain_id)),
+                system_prompt=system_prompt,
+                output_schema=output_schema if output_schema else None,
+                debug=AGENT_DEBUG,
+                architecture=config.agentic_architecture,
+                use_custom_backend=use_custom_backend,
+            )
+            if reusable:
+                self._agents[agent_key] = agent
+        self.agent = agent
+        return agent
 
     def run_structured(
         self,
         text: str,
         brain_id: str = "default",
-        timeout: int = 300,
+        timeout: Optional[int] = 300,
         max_retries: int = 3,
         ingestion_session_id: Optional[str] = None,
         partial_triples: List[IngestionTripleSet] = [],
@@ -179,8 +324,8 @@ class ScoutAgent:
             text: The input text to extract entities from.
             targeting: Optional Node providing contextual targeting information (name, description, properties) to bias extraction.
             brain_id: Identifier for the agent/brain configuration to use.
-            timeout: Maximum seconds to wait for a single agent invocation before treating it as a timeout.
-            max_retries: Maximum number of retry attempts for timed-out invocations using exponential backoff.
+            timeout: Maximum seconds to wait for a single agent invocation before treating it as a timeout. None (or any value of at least FAST_PATH_TIMEOUT_SECONDS) skips the worker thread and relies on the LLM client's own timeouts.
+            max_retries: Maximum number of attempts for timed-out or transiently failing invocations using exponential backoff.
             ingestion_session_id: Identifier for the ingestion session to use.
             mode: Mode to use for the scout agent. "granular" for a more granular extraction, "coarse" to extract the most important entities only.
             partial_triples: List of partial triples to use for the extraction.
@@ -194,7 +339,7 @@ class ScoutAgent:
         Raises:
             TimeoutError: If a single invocation exceeds `timeout`, or if all retry attempts fail due to timeouts.
         """
-        self._get_agent(
+        agent = self._get_agent(
             output_schema=_ScoutAgentResponse,
             brain_id=brain_id,
             mode="granular",
@@ -252,107 +397,23 @@ class ScoutAgent:
             current_entities=current_entities,
         )
 
-        def _invoke_agent():
-            return self.agent.invoke(
-                {
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": prompt,
-                        }
-                    ],
-                },
-                config={
-                    "tags": ["scout_agent"],
-                    "metadata": {
-                        "agent": "scout_agent",
-                        "brain_id": brain_id,
-                        **(
-                            {"ingestion_session_id": ingestion_session_id}
-                            if ingestion_session_id
-                            else {}
-                        ),
-                    },
-                },
-            )
-
-        @retry(
-            stop=stop_after_attempt(max_retries),
-            wait=wait_exponential(multiplier=1, min=2, max=30),
-            retry=retry_if_exception_type(TimeoutError),
-            reraise=True,
+        response = self._invoke_agent_with_retry(
+            prompt,
+            brain_id=brain_id,
+            timeout=timeout,
+            max_retries=max_retries,
+            ingestion_session_id=ingestion_session_id,
+            agent=agent,
         )
-        def _invoke_agent_with_retry():
-            """
-            Invoke the agent in a separate thread, enforce the configured timeout, and update token accounting from the agent's response.
 
-            Returns:
-                dict: The agent response dictionary.
-
-            Raises:
-                TimeoutError: If the agent invocation exceeds the specified timeout.
-            """
-            try:
-                with ThreadPoolExecutor(max_workers=1) as executor:
-                    future = executor.submit(_invoke_agent)
-                    response = future.result(timeout=timeout)
-                    for m in response.get("messages", []):
-                        if hasattr(m, "usage_metadata"):
-                            self._update_token_counts(m.usage_metadata)
-                            self.token_detail = token_detail_from_token_counts(
-                                self.input_tokens,
-                                self.output_tokens,
-                                self.cached_tokens,
-                                self.reasoning_tokens,
-                                "scout_agent",
-                            )
-                    return response
-            except FutureTimeoutError:
-                raise TimeoutError(
-                    f"Scout agent invoke timed out after {timeout} seconds. "
-                    "This may indicate a network issue or the LLM service is unresponsive."
-                )
-
-        try:
-            response = _invoke_agent_with_retry()
-        except RetryError as e:
-            last_attempt = e.last_attempt
-            raise TimeoutError(
-                f"Scout agent invoke failed after {last_attempt.attempt_number} attempts. "
-                f"Last error: {last_attempt.exception()}"
-            ) from last_attempt.exception()
-        except TimeoutError:
-            raise
-
-        structured = response.get("structured_response")
-        if isinstance(structured, dict):
-            try:
-                structured = _ScoutAgentResponse.model_validate(structured)
-            except Exception:
-                structured = None
-        if structured is None or not getattr(structured, "entities", None):
-            fallback = parse_structured_from_messages(
-                response.get("messages", []), _ScoutAgentResponse
-            )
-            if fallback is not None and getattr(fallback, "entities", None):
-                structured = fallback
-        if structured is None:
-            structured = _ScoutAgentResponse(entities=[])
-        return ScoutAgentResponse(
-            entities=[
-                ScoutEntity(**entity.model_dump(mode="json"))
-                for entity in structured.entities
-            ],
-            input_tokens=self.input_tokens,
-            output_tokens=self.output_tokens,
-        )
+        return self._build_response(response)
 
     def run(
         self,
         text: str,
         targeting: Optional[Node] = None,
         brain_id: str = "default",
-        timeout: int = 300,
+        timeout: Optional[int] = 300,
         max_retries: int = 3,
         ingestion_session_id: Optional[str] = None,
         mode: Literal["granular", "coarse"] = "granular",
@@ -366,8 +427,8 @@ class ScoutAgent:
             text: The input text to extract entities from.
             targeting: Optional Node providing contextual targeting information (name, description, properties) to bias extraction.
             brain_id: Identifier for the agent/brain configuration to use.
-            timeout: Maximum seconds to wait for a single agent invocation before treating it as a timeout.
-            max_retries: Maximum number of retry attempts for timed-out invocations using exponential backoff.
+            timeout: Maximum seconds to wait for a single agent invocation before treating it as a timeout. None (or any value of at least FAST_PATH_TIMEOUT_SECONDS) skips the worker thread and relies on the LLM client's own timeouts.
+            max_retries: Maximum number of attempts for timed-out or transiently failing invocations using exponential backoff.
             ingestion_session_id: Identifier for the ingestion session to use.
             mode: Mode to use for the scout agent. "granular" for a more granular extraction, "coarse" to extract the most important entities only.
         Returns:
@@ -379,12 +440,222 @@ class ScoutAgent:
         Raises:
             TimeoutError: If a single invocation exceeds `timeout`, or if all retry attempts fail due to timeouts.
         """
-        self._get_agent(
+        prompt = self._build_prompt(text, targeting=targeting, mode=mode)
+
+        cache_key, cache_context, cache_vector = None, None, None
+        if config.scout_cache_enabled:
+            cache_key, cache_context = self._cache_identity(prompt, targeting, mode)
+            cached, cache_vector = self._cache_lookup(
+                cache_key, cache_context, text, targeting, brain_id
+            )
+            if cached is not None:
+                return cached
+
+        agent = self._get_agent(
+            output_schema=_ScoutAgentResponse,
+            brain_id=brain_id,
+            mode=mode,
+        )
+
+        response = self._invoke_agent_with_retry(
+            prompt,
+            brain_id=brain_id,
+            timeout=timeout,
+            max_retries=max_retries,
+            ingestion_session_id=ingestion_session_id,
+            agent=agent,
+        )
+
+        result = self._build_response(response)
+        if cache_key is not None:
+            self._cache_store(cache_key, cache_context, cache_vector, result, brain_id)
+        return result
+
+    async def arun(
+        self,
+        text: str,
+        targeting: Optional[Node] = None,
+        brain_id: str = "default",
+        timeout: Optional[int] = 300,
+        max_retries: int = 3,
+        ingestion_session_id: Optional[str] = None,
+        mode: Literal["granular", "coarse"] = "granular",
+    ) -> ScoutAgentResponse:
+        """
+        Async counterpart of `run`: extract entities from the text without blocking a thread on the LLM round-trip.
+
+        Uses the agent's `ainvoke` when available (falling back to `invoke` in a worker thread for agents without one),
+        enforces `timeout` with `asyncio.timeout` and retries timed-out attempts with exponential backoff.
+
+        Parameters:
+            See `run`.
+
+        Returns:
+            ScoutAgentResponse: The extracted entities and the accumulated token usage.
+
+        Raises:
+            TimeoutError: If a single invocation exceeds `timeout`, or if all retry attempts fail due to timeouts.
+        """
+        prompt = self._build_prompt(text, targeting=targeting, mode=mode)
+
+        cache_key, cache_context, cache_vector = None, None, None
+        if config.scout_cache_enabled:
+            cache_key, cache_context = self._cache_identity(prompt, targeting, mode)
+            cached, cache_vector = await asyncio.to_thread(
+                self._cache_lookup, cache_key, cache_context, text, targeting, brain_id
+            )
+            if cached is not None:
+                return cached
+
+        agent = self._get_agent(
             output_schema=_ScoutAgentResponse,
             brain_id=brain_id,
             mode=mode,
         )
 
+        response = await self._ainvoke_agent_with_retry(
+            prompt,
+            brain_id=brain_id,
+            timeout=timeout,
+            max_retries=max_retries,
+            ingestion_session_id=ingestion_session_id,
+            agent=agent,
+        )
+
+        result = self._build_response(response)
+        if cache_key is not None:
+            await asyncio.to_thread(
+                self._cache_store,
+                cache_key,
+                cache_context,
+                cache_vector,
+                result,
+                brain_id,
+            )
+        return result
+
+    async def arun_batch(
+        self,
+        texts: List[str],
+        *,
+        max_concurrency: int = 8,
+        targeting: Optional[Node] = None,
+        brain_id: str = "default",
+        timeout: Optional[int] = 300,
+        max_retries: int = 3,
+        ingestion_session_id: Optional[str] = None,
+        mode: Literal["granular", "coarse"] = "granular",
+    ) -> List[Union[ScoutAgentResponse, BaseException]]:
+        """
+        Scout several texts concurrently with `arun`, at most `max_concurrency` LLM calls in flight.
+
+        Returns:
+            List[Union[ScoutAgentResponse, BaseException]]: One entry per text, in input order; a failed text yields
+            its exception instead of aborting the whole batch.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _run_one(text: str) -> ScoutAgentResponse:
+            async with semaphore:
+                return await self.arun(
+                    text,
+                    targeting=targeting,
+                    brain_id=brain_id,
+                    timeout=timeout,
+                    max_retries=max_retries,
+                    ingestion_session_id=ingestion_session_id,
+                    mode=mode,
+                )
+
+        return await asyncio.gather(
+            *(_run_one(text) for text in texts), return_exceptions=True
+        )
+
+    def run_batch(
+        self,
+        texts: List[str],
+        *,
+        max_concurrency: int = 8,
+        targeting: Optional[Node] = None,
+        brain_id: str = "default",
+        timeout: Optional[int] = 300,
+        max_retries: int = 3,
+        ingestion_session_id: Optional[str] = None,
+        mode: Literal["granular", "coarse"] = "granular",
+    ) -> List[Union[ScoutAgentResponse, BaseException]]:
+        """
+        Synchronous wrapper around `arun_batch` for callers outside an event loop.
+        """
+        return asyncio.run(
+            self.arun_batch(
+                texts,
+                max_concurrency=max_concurrency,
+                targeting=targeting,
+                brain_id=brain_id,
+                timeout=timeout,
+                max_retries=max_retries,
+                ingestion_session_id=ingestion_session_id,
+                mode=mode,
+            )
+        )
+
+    def run_parallel(
+        self,
+        texts: List[str],
+        *,
+        max_concurrency: int = 8,
+        targeting: Optional[Node] = None,
+        brain_id: str = "default",
+        timeout: Optional[int] = 300,
+        max_retries: int = 3,
+        ingestion_session_id: Optional[str] = None,
+        mode: Literal["granular", "coarse"] = "granular",
+    ) -> List[Union[ScoutAgentResponse, BaseException]]:
+        """
+        Scout several texts on parallel threads when the interpreter runs without the GIL.
+
+        On free-threaded builds (3.13t+) the CPU-bound parts of a run (response parsing, pydantic validation)
+        scale across `max_concurrency` worker threads, each calling `run`. Timed invocations still go through the
+        agent's executor, so pass a matching `executor` to the constructor to avoid capping the parallelism.
+        With the GIL enabled this falls back to the asyncio `run_batch` path.
+
+        Returns:
+            List[Union[ScoutAgentResponse, BaseException]]: One entry per text, in input order; a failed text yields
+            its exception instead of aborting the whole batch.
+        """
+        kwargs = dict(
+            targeting=targeting,
+            brain_id=brain_id,
+            timeout=timeout,
+            max_retries=max_retries,
+            ingestion_session_id=ingestion_session_id,
+            mode=mode,
+        )
+        if not _is_free_threaded():
+            return self.run_batch(texts, max_concurrency=max_concurrency, **kwargs)
+
+        def _run_one(text: str) -> Union[ScoutAgentResponse, BaseException]:
+            try:
+                return self.run(text, **kwargs)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="scout-parallel"
+        ) as pool:
+            return list(pool.map(_run_one, texts))
+
+    def _build_prompt(
+        self,
+        text: str,
+        targeting: Optional[Node] = None,
+        mode: Literal["granular", "coarse"] = "granular",
+    ) -> str:
+        """
+        Format the entity extraction user prompt for the given text, targeting context and mode.
+
+        Called once per run, outside the retry loop, so retries reuse the formatted prompt.
+        """
         targeting_str = (
             f"""
                                 The information is related to:
@@ -394,97 +665,202 @@ class ScoutAgent:
             if targeting
             else ""
         )
-        if mode == "granular":
-            prompt = prompt_registry.get(
-                "SCOUT_AGENT_EXTRACT_ENTITIES_PROMPT",
-                SCOUT_AGENT_EXTRACT_ENTITIES_PROMPT,
-            ).format(
-                text=text,
-                targeting=targeting_str,
-            )
-        elif mode == "coarse":
-            prompt = prompt_registry.get(
-                "SCOUT_AGENT_COARSE_EXTRACT_ENTITIES_PROMPT",
-                SCOUT_AGENT_COARSE_EXTRACT_ENTITIES_PROMPT,
-            ).format(
-                text=text,
-                targeting=targeting_str,
-            )
-        else:
-            raise ValueError(f"Invalid mode for scout agent: {mode}")
+        try:
+            prompt_name, default_prompt = _EXTRACT_PROMPTS_BY_MODE[mode]
+        except KeyError:
+            raise ValueError(f"Invalid mode for scout agent: {mode}") from None
+        prompt = prompt_registry.get(prompt_name, default_prompt).format(
+            text=text,
+            targeting=targeting_str,
+        )
+        return prompt
 
-        def _invoke_agent():
-            return self.agent.invoke(
-                {
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": prompt,
-                        }
-                    ],
-                },
-                config={
-                    "tags": ["scout_agent"],
-                    "metadata": {
-                        "agent": "scout_agent",
-                        "brain_id": brain_id,
-                        **(
-                            {"ingestion_session_id": ingestion_session_id}
-                            if ingestion_session_id
-                            else {}
-                        ),
-                    },
+    def _build_invoke_payload(
+        self,
+        prompt: str,
+        brain_id: str,
+        ingestion_session_id: Optional[str] = None,
+    ) -> tuple[dict, dict]:
+        """
+        Build the agent input and the invoke config (tags and tracing metadata) for a user prompt.
+        """
+        return (
+            {
+                "messages": [
+                    {
+                        "role": "user",
+                        "content": prompt,
+                    }
+                ],
+            },
+            {
+                "tags": ["scout_agent"],
+                "metadata": {
+                    "agent": "scout_agent",
+                    "brain_id": brain_id,
+                    **(
+                        {"ingestion_session_id": ingestion_session_id}
+                        if ingestion_session_id
+                        else {}
+                    ),
                 },
+            },
+        )
+
+    def _record_usage(self, response: dict) -> None:
+        """
+        Accumulate the token usage of every message in the agent response and refresh token_detail.
+        """
+        usage_metadatas = [
+            m.usage_metadata
+            for m in response.get("messages", [])
+            if hasattr(m, "usage_metadata")
+        ]
+        if not usage_metadatas:
+            return
+        # Counters are shared by concurrent runs (threads of run_parallel / arun_batch).
+        with self._usage_lock:
+            for usage_metadata in usage_metadatas:
+                self._update_token_counts(usage_metadata)
+            self.token_detail = token_detail_from_token_counts(
+                self.input_tokens,
+                self.output_tokens,
+                self.cached_tokens,
+                self.reasoning_tokens,
+                "scout_agent",
             )
 
-        @retry(
-            stop=stop_after_attempt(max_retries),
-            wait=wait_exponential(multiplier=1, min=2, max=30),
-            retry=retry_if_exception_type(TimeoutError),
-            reraise=True,
+    def _invoke_agent_with_retry(
+        self,
+        prompt: str,
+        brain_id: str,
+        timeout: Optional[int],
+        max_retries: int,
+        ingestion_session_id: Optional[str] = None,
+        agent=None,
+    ) -> dict:
+        """
+        Invoke the configured agent with the given user prompt, retrying with exponential backoff on timeouts
+        and transient connection/provider errors (SCOUT_RETRYABLE_EXCEPTIONS).
+
+        When `timeout` is None or at least FAST_PATH_TIMEOUT_SECONDS the agent is invoked directly on the
+        calling thread and the LLM client's own timeouts apply; this is the fast path for trusted internal calls.
+        Otherwise the invocation runs on the agent's long-lived executor and is abandoned after `timeout` seconds.
+
+        Returns:
+            dict: The agent response dictionary.
+
+        Raises:
+            TimeoutError: If a single invocation exceeds `timeout`, or if all retry attempts fail.
+        """
+
+        agent = agent or self.agent
+        agent_input, agent_config = self._build_invoke_payload(
+            prompt, brain_id, ingestion_session_id
         )
-        def _invoke_agent_with_retry():
-            """
-            Invoke the agent in a separate thread, enforce the configured timeout, and update token accounting from the agent's response.
 
-            Returns:
-                dict: The agent response dictionary.
+        def _invoke_agent():
+            return agent.invoke(agent_input, config=agent_config)
 
-            Raises:
-                TimeoutError: If the agent invocation exceeds the specified timeout.
-            """
+        def _invoke_agent_with_timeout():
+            if timeout is None or timeout >= FAST_PATH_TIMEOUT_SECONDS:
+                return _invoke_agent()
+            future = self._executor.submit(_invoke_agent)
             try:
-                with ThreadPoolExecutor(max_workers=1) as executor:
-                    future = executor.submit(_invoke_agent)
-                    response = future.result(timeout=timeout)
-                    for m in response.get("messages", []):
-                        if hasattr(m, "usage_metadata"):
-                            self._update_token_counts(m.usage_metadata)
-                            self.token_detail = token_detail_from_token_counts(
-                                self.input_tokens,
-                                self.output_tokens,
-                                self.cached_tokens,
-                                self.reasoning_tokens,
-                                "scout_agent",
-                            )
-                    return response
+                return future.result(timeout=timeout)
             except FutureTimeoutError:
                 raise TimeoutError(
                     f"Scout agent invoke timed out after {timeout} seconds. "
                     "This may indicate a network issue or the LLM service is unresponsive."
                 )
 
+        @retry(
+            stop=stop_after_attempt(max_retries),
+            wait=wait_exponential(multiplier=1, min=2, max=30),
+            retry=retry_if_exception_type(SCOUT_RETRYABLE_EXCEPTIONS),
+            before_sleep=_log_retry,
+            reraise=True,
+        )
+        def _invoke_and_track():
+            response = _invoke_agent_with_timeout()
+            self._record_usage(response)
+            return response
+
         try:
-            response = _invoke_agent_with_retry()
+            return _invoke_and_track()
         except RetryError as e:
             last_attempt = e.last_attempt
             raise TimeoutError(
                 f"Scout agent invoke failed after {last_attempt.attempt_number} attempts. "
                 f"Last error: {last_attempt.exception()}"
             ) from last_attempt.exception()
-        except TimeoutError:
-            raise
 
+    async def _ainvoke_agent_with_retry(
+        self,
+        prompt: str,
+        brain_id: str,
+        timeout: Optional[int],
+        max_retries: int,
+        ingestion_session_id: Optional[str] = None,
+        agent=None,
+    ) -> dict:
+        """
+        Await the configured agent with the given user prompt, retrying with exponential backoff on timeouts
+        and transient connection/provider errors (SCOUT_RETRYABLE_EXCEPTIONS).
+
+        Returns:
+            dict: The agent response dictionary.
+
+        Raises:
+            TimeoutError: If a single invocation exceeds `timeout`, or if all retry attempts fail.
+        """
+        agent = agent or self.agent
+        agent_input, agent_config = self._build_invoke_payload(
+            prompt, brain_id, ingestion_session_id
+        )
+
+        async def _ainvoke_agent():
+            if hasattr(agent, "ainvoke"):
+                return await agent.ainvoke(agent_input, config=agent_config)
+            return await asyncio.to_thread(agent.invoke, agent_input, config=agent_config)
+
+        try:
+            async for attempt in AsyncRetrying(
+                stop=stop_after_attempt(max_retries),
+                wait=wait_exponential(multiplier=1, min=2, max=30),
+                retry=retry_if_exception_type(SCOUT_RETRYABLE_EXCEPTIONS),
+                before_sleep=_log_retry,
+                reraise=True,
+            ):
+                with attempt:
+                    if timeout is None or timeout >= FAST_PATH_TIMEOUT_SECONDS:
+                        response = await _ainvoke_agent()
+                    else:
+                        try:
+                            async with asyncio.timeout(timeout):
+                                response = await _ainvoke_agent()
+                        except asyncio.TimeoutError:
+                            raise TimeoutError(
+                                f"Scout agent invoke timed out after {timeout} seconds. "
+                                "This may indicate a network issue or the LLM service is unresponsive."
+                            )
+                    self._record_usage(response)
+            return response
+        except RetryError as e:
+            last_attempt = e.last_attempt
+            raise TimeoutError(
+                f"Scout agent invoke failed after {last_attempt.attempt_number} attempts. "
+                f"Last error: {last_attempt.exception()}"
+            ) from last_attempt.exception()
+
+    def _build_response(self, response: dict) -> ScoutAgentResponse:
+        """
+        Convert the raw agent response into a ScoutAgentResponse.
+
+        Reads the structured response (falling back to parsing the last message) and promotes the
+        already-validated entities to ScoutEntity field by field via model_construct, so neither the
+        entities nor the response are validated twice and no intermediate dicts are dumped.
+        """
         structured = response.get("structured_response")
         if isinstance(structured, dict):
             try:
@@ -499,13 +875,164 @@ class ScoutAgent:
                 structured = fallback
         if structured is None:
             structured = _ScoutAgentResponse(entities=[])
-        return ScoutAgentResponse(
+        return ScoutAgentResponse.model_construct(
             entities=[
-                ScoutEntity(**entity.model_dump(mode="json"))
+                ScoutEntity.model_construct(
+                    type=entity.type,
+                    name=entity.name,
+                    properties=entity.properties,
+                    description=entity.description,
+                    polarity=entity.polarity,
+                    uuid=str(uuid.uuid4()),
+                )
                 for entity in structured.entities
             ],
             input_tokens=self.input_tokens,
             output_tokens=self.output_tokens,
+            cached_tokens=self.cached_tokens,
+        )
+
+    def _cache_identity(
+        self,
+        prompt: str,
+        targeting: Optional[Node],
+        mode: Literal["granular", "coarse"],
+    ) -> tuple[str, str]:
+        """
+        Cache identity of a scout request, as an exact-match key and a semantic-match context.
+
+        The key hashes the resolved system template with the fully formatted user prompt, so a different text, mode,
+        targeting node (name, description or properties) or prompt_registry override misses. The context hashes the
+        same with an empty text; semantic hits are only accepted from entries stored under the same context.
+        """
+        system_template = self._system_template(mode)
+        context_prompt = self._build_prompt("", targeting=targeting, mode=mode)
+        return (
+            f"{SCOUT_CACHE_KEY_PREFIX}{_prompt_digest(system_template, prompt)}",
+            _prompt_digest(system_template, context_prompt),
+        )
+
+    def _cache_lookup(
+        self,
+        cache_key: str,
+        cache_context: str,
+        text: str,
+        targeting: Optional[Node],
+        brain_id: str,
+    ) -> tuple[Optional[ScoutAgentResponse], Optional[Vector]]:
+        """
+        Look up a previous extraction for the same (or, when enabled, a semantically near-duplicate) request.
+
+        Tries the exact hash key first. When `config.scout_cache_semantic_enabled` is set, a miss embeds the text and
+        searches the `scout_cache` vector store; only unexpired entries stored under the same `cache_context` are
+        considered, and the closest one is accepted when its similarity reaches
+        `config.scout_cache_similarity_threshold`. Entries that expired or whose cached extraction is gone are removed
+        from the vector store. Cache failures are treated as misses.
+
+        Returns:
+            tuple: The cached response (with freshly generated entity uuids) or None, and the query vector
+            computed on a semantic miss so that `_cache_store` does not embed the text again.
+        """
+        try:
+            cached = self.cache_adapter.get(cache_key, brain_id=brain_id)
+            if cached:
+                return self._cached_response(cached), None
+            if not config.scout_cache_semantic_enabled:
+                return None, None
+
+            vector = self.embeddings.embed_text(
+                f"{targeting.name}: {text}" if targeting else text
+            )
+            if not vector.embeddings:
+                return None, None
+            hits = self.vector_store.search_vectors(
+                vector.embeddings,
+                brain_id=brain_id,
+                store=SCOUT_CACHE_STORE,
+                k=SCOUT_CACHE_SEMANTIC_CANDIDATES,
+            )
+
+            now = time.time()
+            stale_ids = []
+            best_hit, best_similarity = None, None
+            for hit in hits:
+                if hit.metadata.get("expires_at", 0) < now:
+                    stale_ids.append(hit.id)
+                    continue
+                if hit.metadata.get("context") != cache_context:
+                    continue
+                similarity = self.vector_store.similarity(hit)
+                if (
+                    similarity is not None
+                    and similarity >= config.scout_cache_similarity_threshold
+                    and (best_similarity is None or similarity > best_similarity)
+                ):
+                    best_hit, best_similarity = hit, similarity
+
+            result = None
+            if best_hit is not None:
+                cached = self.cache_adapter.get(
+                    best_hit.metadata.get("cache_key", ""), brain_id=brain_id
+                )
+                if cached:
+                    result = self._cached_response(cached)
+                else:
+                    stale_ids.append(best_hit.id)
+            if stale_ids:
+                self.vector_store.remove_vectors(
+                    stale_ids, store=SCOUT_CACHE_STORE, brain_id=brain_id
+                )
+            if result is not None:
+                return result, None
+            return None, vector
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Scout cache lookup failed: %s", e)
+            return None, None
+
+    def _cache_store(
+        self,
+        cache_key: str,
+        cache_context: str,
+        vector: Optional[Vector],
+        result: ScoutAgentResponse,
+        brain_id: str,
+    ) -> None:
+        """
+        Store the extracted entities under the exact key and, when a query vector is available, index it for semantic hits.
+
+        Entities are serialized through `_ScoutAgentResponse`, so their uuids are not cached. The indexed vector
+        carries the request's cache context, so that only requests with the same prompts can hit it, and the same
+        expiry as the cached extraction.
+        """
+        if not result.entities:
+            return
+        try:
+            self.cache_adapter.set(
+                cache_key,
+                _ScoutAgentResponse.model_construct(
+                    entities=result.entities
+                ).model_dump_json(),
+                brain_id=brain_id,
+                expires_in=config.scout_cache_ttl,
+            )
+            if vector is not None and vector.embeddings:
+                vector.metadata = {
+                    "cache_key": cache_key,
+                    "context": cache_context,
+                    "expires_at": time.time() + config.scout_cache_ttl,
+                }
+                self.vector_store.add_vectors(
+                    [vector], store=SCOUT_CACHE_STORE, brain_id=brain_id
+                )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Scout cache store failed: %s", e)
+
+    def _cached_response(self, cached: str) -> ScoutAgentResponse:
+        """
+        Rebuild a ScoutAgentResponse from a cached extraction; entities get new uuids and no tokens are spent.
+        """
+        return self._build_response(
+            {"structured_response": _ScoutAgentResponse.model_validate_json(cached)}
         )
 
     def _update_token_counts(self, usage_metadata: dict):
@@ -519,14 +1046,20 @@ class ScoutAgent:
                 - "input_token_details": dict with optional "cache_read" integer to add to cached_tokens (defaults to 0)
                 - "output_token_details": dict with optional "reasoning" integer to add to reasoning_tokens (defaults to 0)
         """
+        if not usage_metadata:
+            return
+        get = usage_metadata.get
+
         # Base counts
-        self.input_tokens += usage_metadata.get("input_tokens", 0)
-        self.output_tokens += usage_metadata.get("output_tokens", 0)
+        self.input_tokens += get("input_tokens", 0)
+        self.output_tokens += get("output_tokens", 0)
 
-        # Input details (caching)
-        input_details = usage_metadata.get("input_token_details", {})
-        self.cached_tokens += input_details.get("cache_read", 0)
+        # Input details (caching), skipped without allocating a default dict
+        input_details = get("input_token_details")
+        if input_details:
+            self.cached_tokens += input_details.get("cache_read", 0)
 
         # Output details (reasoning)
-        output_details = usage_metadata.get("output_token_details", {})
-        self.reasoning_tokens += output_details.get("reasoning", 0)
+        output_details = get("output_token_details")
+        if output_details:
+            self.reasoning_tokens += output_details.get("reasoning", 0)
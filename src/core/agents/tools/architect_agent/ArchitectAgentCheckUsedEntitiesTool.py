@@ -9,15 +9,38 @@ Modified By: Christian Nonis <alch.infoemail@gmail.com>
 -----
 """
 
-import json
+import logging
+from typing import Optional, Tuple
+
 from langchain.tools import BaseTool
+from pydantic import Field
+
+from src.utils.serialization.data import json_dumps
+
+logger = logging.getLogger(__name__)
+
+MAX_USED_ENTITIES_PAGE_SIZE = 200
 
-from src.utils.cleanup import strip_properties
+_ARGS_SCHEMA: dict = {
+    "type": "object",
+    "properties": {
+        "limit": {
+            "type": "integer",
+            "description": "Optional maximum number of used entities to return in one page.",
+        },
+        "cursor": {
+            "type": "string",
+            "description": "Optional uuid of the last entity of the previous page (the returned next_cursor).",
+        },
+    },
+}
 
 
 class ArchitectAgentCheckUsedEntitiesTool(BaseTool):
     name: str = "architect_agent_check_used_entities"
     architect_agent: object
+    cached_result: Optional[Tuple[int, str]] = None
+    args_schema: dict = Field(default_factory=lambda: _ARGS_SCHEMA)
 
     def __init__(
         self,
@@ -26,7 +49,7 @@ class ArchitectAgentCheckUsedEntitiesTool(BaseTool):
         """
         Initialize the tool with the given architect agent and set its description.
 
-        This tool inspects the architect agent's used_entities_set to report entities that have been used; it should be invoked after relationships are created and entities are marked as used.
+        This tool inspects the architect agent's used_entities_dict to report entities that have been used; it should be invoked after relationships are created and entities are marked as used.
 
         Parameters:
             architect_agent (object): The architect agent instance whose used entities the tool will check.
@@ -34,7 +57,8 @@ class ArchitectAgentCheckUsedEntitiesTool(BaseTool):
         description: str = (
             "Tool for checking used entities. "
             "You must call this tool after calling the architect_agent_create_relationship tool and after marking entities as used."
-            "Returns a list of entities that have been used."
+            "Returns a list of entities that have been used. "
+            "Pass a limit (and the returned next_cursor) to page through a long list instead of receiving it all at once."
         )
         super().__init__(
             architect_agent=architect_agent,
@@ -45,18 +69,53 @@ class ArchitectAgentCheckUsedEntitiesTool(BaseTool):
         """
         Collect the set of entities marked as used by the architect agent and return them as a JSON string.
 
-        Each entity is converted to a plain mapping by calling `model_dump()` if present on the entity, otherwise `dict()`, and the resulting list of mappings is serialized to JSON.
+        Entities marked as used are stored as already-stripped mappings, so they are serialized as they are.
+        The full list is memoized against the architect agent's `used_entities_version` and only rebuilt after entities are marked as used.
+
+        When a `limit` (and optionally a `cursor`) is given, only that page of entities is serialized, in marking order,
+        and returned together with the `next_cursor` to continue from.
 
         Returns:
-            json_str (str): JSON-formatted string containing a list of serialized entity mappings.
+            json_str (str): JSON-formatted string containing a list of serialized entity mappings, or a
+                `{"entities": [...], "next_cursor": str | None}` page when `limit` is provided.
         """
-        entities_list = [
-            (
-                strip_properties([entity.model_dump(mode="json")])[0]
-                if hasattr(entity, "model_dump")
-                else entity
-            )
-            for entity in self.architect_agent.used_entities_dict.values()
-        ]
-        print("[DEBUG (architect_agent_check_used_entities)]: ", entities_list)
-        return json.dumps(entities_list)
+        params = args[0] if args and isinstance(args[0], dict) else kwargs
+        limit = params.get("limit")
+        if limit is not None:
+            return self._run_page(limit, params.get("cursor"))
+
+        version = self.architect_agent.used_entities_version
+        if self.cached_result is not None and self.cached_result[0] == version:
+            return self.cached_result[1]
+
+        entities_list = list(self.architect_agent.used_entities_dict.values())
+        logger.debug(
+            "[architect_agent_check_used_entities] used_entities=%d", len(entities_list)
+        )
+        result = json_dumps(entities_list)
+        self.cached_result = (version, result)
+        return result
+
+    def _run_page(self, limit: int, cursor: Optional[str] = None) -> str:
+        """
+        Serialize one page of used entities, starting right after `cursor` (or from the first entity
+        when the cursor is missing or unknown). `limit` is clamped to `MAX_USED_ENTITIES_PAGE_SIZE`.
+        """
+        limit = max(1, min(int(limit), MAX_USED_ENTITIES_PAGE_SIZE))
+        used_entities_dict = self.architect_agent.used_entities_dict
+        keys = list(used_entities_dict)
+        start = 0
+        if cursor is not None and cursor in used_entities_dict:
+            start = keys.index(cursor) + 1
+        page_keys = keys[start : start + limit]
+        next_cursor = (
+            page_keys[-1] if page_keys and start + limit < len(keys) else None
+        )
+        entities_list = [used_entities_dict[key] for key in page_keys]
+        logger.debug(
+            "[architect_agent_check_used_entities] page cursor=%s next_cursor=%s size=%d",
+            cursor,
+            next_cursor,
+            len(entities_list),
+        )
+        return json_dumps({"entities": entities_list, "next_cursor": next_cursor})
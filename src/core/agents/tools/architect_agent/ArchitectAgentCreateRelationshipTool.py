@@ -8,11 +8,14 @@ Modified By: Christian Nonis <alch.infoemail@gmail.com>
 -----
 """
 
-from dataclasses import dataclass
-from typing import Dict, List, Literal, Optional
+from concurrent.futures import Future
+import heapq
+from typing import Dict, List, Literal, Optional, Tuple
 import json
+import logging
 import uuid
 from langchain.tools import BaseTool
+import numpy as np
 
 from src.adapters.graph import GraphAdapter
 from src.constants.agents import (
@@ -23,20 +26,175 @@ from src.constants.agents import (
 )
 from src.constants.kg import Node
 from src.core.agents.scout_agent import ScoutEntity
-from src.services.input.agents import (
-    embeddings_adapter,
-    embeddings_small_adapter,
-    graph_adapter,
-    llm_small_adapter,
-    vector_store_adapter,
-)
-from src.lib.neo4j.client import _neo4j_client
+from src.services.input.agents import embeddings_small_adapter
+from src.lib.redis.client import _redis_client
 from src.utils.cleanup import strip_properties
-from src.utils.nlp.names import levenshtein_similarity
-from src.utils.serialization.data import is_uuid
-from src.utils.similarity.vectors import cosine_similarity
+from src.utils.nlp.names import levenshtein_similarities
+from src.utils.serialization.data import is_uuid, join_json_fragments
+from src.utils.similarity.vectors import relationship_embedding_cache
 from src.utils.tokens import merge_token_details, token_detail_from_token_counts
 
+logger = logging.getLogger(__name__)
+
+
+def relationship_texts(relationships: list) -> List[str]:
+    """
+    The distinct texts relationships are compared by: their description, or their name when there is none.
+    """
+    return list(
+        {rel.description if rel.description else rel.name for rel in relationships}
+    )
+
+
+def embed_fixed_relationship_texts(
+    input_embeddings: Optional[Future],
+    fixed_relationships: list,
+    embeddings_adapter,
+) -> Dict[str, object]:
+    """
+    Collect the unit embeddings needed to compare input relationships with fixed ones.
+
+    Waits for the input-side prefetch and embeds only the fixed relationship texts it did not already cover;
+    returns an empty mapping when there are no fixed relationships to compare against.
+    """
+    if not fixed_relationships or input_embeddings is None:
+        return {}
+    text_to_embedding = input_embeddings.result()
+    missing_texts = [
+        text
+        for text in relationship_texts(fixed_relationships)
+        if text not in text_to_embedding
+    ]
+    if missing_texts:
+        text_to_embedding.update(
+            relationship_embedding_cache.embed(embeddings_adapter, missing_texts)
+        )
+    return text_to_embedding
+
+
+def relationship_pair(rel) -> Tuple[str, str]:
+    """
+    Direction-insensitive node pair of a relationship: its two node uuids in sorted order.
+    """
+    tip, tail = rel.tip.uuid, rel.tail.uuid
+    return (tip, tail) if tip <= tail else (tail, tip)
+
+
+def relationship_key(rel) -> Tuple[str, str, str]:
+    """
+    Direction-insensitive identity of a relationship: its `relationship_pair`, then its name.
+    """
+    return relationship_pair(rel) + (rel.name,)
+
+
+def index_fixed_relationships(
+    fixed_relationships: list,
+) -> Tuple[set, Dict[Tuple[str, str], list]]:
+    """
+    Index the janitor's fixed relationships in one pass.
+
+    Returns:
+        tuple: the `relationship_key`s of the fixed relationships, and the fixed relationships
+            grouped by their `relationship_pair`, in their original order.
+    """
+    fixed_rels_keys = set()
+    fixed_rels_by_pair: Dict[Tuple[str, str], list] = {}
+    for fr in fixed_relationships:
+        fixed_rels_keys.add(relationship_key(fr))
+        fixed_rels_by_pair.setdefault(relationship_pair(fr), []).append(fr)
+    return fixed_rels_keys, fixed_rels_by_pair
+
+
+# Predicate names at least this close (normalized Levenshtein, case-insensitive) are treated as the same
+# relationship without comparing embeddings.
+SURFACE_MATCH_THRESHOLD = 0.95
+
+
+class FixedRelationshipScorer:
+    """
+    Scores input relationships against the janitor's fixed relationships between the same two nodes.
+
+    A near-identical predicate name decides a match on its own; otherwise the unit embeddings of the pair's
+    fixed relationships are stacked into one matrix on first use, so scoring is a single matrix-vector product.
+    """
+
+    def __init__(self, fixed_rels_by_pair: Dict[Tuple[str, str], list]) -> None:
+        self._fixed_rels_by_pair = fixed_rels_by_pair
+        self._matrices: Dict[Tuple[str, str], tuple] = {}
+        self._surface_matches: Dict[int, Optional[Tuple[float, object]]] = {}
+
+    def _surface_match(self, rel) -> Optional[Tuple[float, object]]:
+        key = id(rel)
+        if key not in self._surface_matches:
+            candidates = self._fixed_rels_by_pair[relationship_pair(rel)]
+            similarities = levenshtein_similarities(
+                rel.name.lower(), [fr.name.lower() for fr in candidates]
+            )
+            best = max(range(len(candidates)), key=similarities.__getitem__)
+            self._surface_matches[key] = (
+                (similarities[best], candidates[best])
+                if similarities[best] >= SURFACE_MATCH_THRESHOLD
+                else None
+            )
+        return self._surface_matches[key]
+
+    def fixed_relationships_to_embed(
+        self, input_rels: list, fixed_rels_keys: set
+    ) -> list:
+        """
+        The fixed relationships whose embeddings `most_similar` can need: those sharing a node pair with an input
+        relationship that neither an exact key nor its predicate name already matches.
+        """
+        pairs = {
+            relationship_pair(rel)
+            for rel in input_rels
+            if relationship_pair(rel) in self._fixed_rels_by_pair
+            and relationship_key(rel) not in fixed_rels_keys
+            and self._surface_match(rel) is None
+        }
+        return [fr for pair in pairs for fr in self._fixed_rels_by_pair[pair]]
+
+    def _matrix(
+        self, pair: Tuple[str, str], text_to_embedding: Dict[str, np.ndarray]
+    ) -> tuple:
+        matrix = self._matrices.get(pair)
+        if matrix is None:
+            embedded_rels = []
+            embeddings = []
+            for fr in self._fixed_rels_by_pair[pair]:
+                fixed_embedding = text_to_embedding.get(
+                    fr.description if fr.description else fr.name
+                )
+                if fixed_embedding is not None:
+                    embedded_rels.append(fr)
+                    embeddings.append(fixed_embedding)
+            matrix = (np.stack(embeddings) if embeddings else None, embedded_rels)
+            self._matrices[pair] = matrix
+        return matrix
+
+    def most_similar(
+        self, rel, text_to_embedding: Dict[str, np.ndarray]
+    ) -> Tuple[Optional[float], Optional[object]]:
+        """
+        Return the similarity and the closest fixed relationship between `rel`'s nodes,
+        or `(None, None)` when there is nothing to compare against.
+        """
+        pair = relationship_pair(rel)
+        if pair not in self._fixed_rels_by_pair:
+            return None, None
+        surface_match = self._surface_match(rel)
+        if surface_match is not None:
+            return surface_match
+        input_embedding = text_to_embedding.get(
+            rel.description if rel.description else rel.name
+        )
+        fixed_matrix, embedded_rels = self._matrix(pair, text_to_embedding)
+        if input_embedding is None or fixed_matrix is None:
+            return None, None
+        scores = fixed_matrix @ input_embedding
+        best = int(scores.argmax())
+        return float(scores[best]), embedded_rels[best]
+
 
 class ArchitectAgentCreateRelationshipTool(BaseTool):
     name: str = "architect_agent_create_relationship"
@@ -140,33 +298,128 @@ class ArchitectAgentCreateRelationshipTool(BaseTool):
             args_schema=args_schema,
         )
 
-    @dataclass
-    class _ArchitectAgentInputRelationship:
-        subject: str
-        predicate: str
-        object: str
-        description: str
+    @staticmethod
+    def _index_entity(entity_index: Dict[str, object], entity) -> None:
+        """
+        Register an entity under its uuid and name; the first entity registered for a key wins.
+        """
+        for key in ("uuid", "name"):
+            value = (
+                entity.get(key) if isinstance(entity, dict) else getattr(entity, key, None)
+            )
+            if value is not None:
+                entity_index.setdefault(value, entity)
+
+    @staticmethod
+    def _attr(e, k, default=None):
+        return e.get(k, default) if isinstance(e, dict) else getattr(e, k, default)
+
+    @classmethod
+    def _to_architect_entity(cls, entity) -> ArchitectAgentEntity:
+        """
+        Build the ArchitectAgentEntity for a resolved entity, whether it is a ScoutEntity or a stripped mapping.
+        """
+        props = cls._attr(entity, "properties") or {}
+        happened_at = props.get("happened_at")
+        return ArchitectAgentEntity(
+            uuid=cls._attr(entity, "uuid"),
+            name=cls._attr(entity, "name"),
+            type=cls._attr(entity, "type"),
+            description=cls._attr(entity, "description"),
+            **({"happened_at": happened_at} if happened_at else {}),
+            properties=props,
+            polarity=cls._attr(entity, "polarity") or "neutral",
+        )
+
+    def _resolve_entity(
+        self, ref: str, entity_index: Dict[str, object], newly_created_nodes: list
+    ):
+        """
+        Resolve a subject/object reference to a known entity.
+
+        A "type:name" reference creates a new ScoutEntity, registered on the tool, the architect agent, `entity_index`
+        and `newly_created_nodes`. A uuid is looked up in the tool's entities, the used entities and then `entity_index`.
+        Anything else resolves to None, without scanning entities by name.
+        """
+        ref_is_uuid = is_uuid(ref)
+        if not ref_is_uuid and ":" in ref:
+            scout_entity = ScoutEntity(
+                uuid=str(uuid.uuid4()),
+                name=ref.split(":")[1],
+                type=ref.split(":")[0],
+                description="",
+                properties={},
+            )
+            self.entities[scout_entity.uuid] = scout_entity
+            self.architect_agent.entities.update({scout_entity.uuid: scout_entity})
+            self._index_entity(entity_index, scout_entity)
+            newly_created_nodes.append(scout_entity.model_dump(mode="json"))
+            return scout_entity
+        elif not ref_is_uuid:
+            return None
+        entity = self.entities.get(ref.lower())
+        if entity:
+            return entity
+        entity = self.architect_agent.used_entities_dict.get(ref.lower())
+        if entity:
+            return entity
+        return entity_index.get(ref)
+
+    def _most_similar_entities(
+        self, queries: List[str], limit: int = 5
+    ) -> List[List[str]]:
+        """
+        For each query, describe the `limit` known entities whose uuid or name is closest to it.
+        The candidates are collected once and the graph nodes of every suggestion are fetched in a single round-trip.
+        """
 
-    def _most_similar_entities(self, query: str, limit: int = 5) -> list[str]:
         def _e_attr(e, k):
             return e.get(k) if isinstance(e, dict) else getattr(e, k, None)
 
         all_entities = list(self.entities.values()) + list(
             self.architect_agent.used_entities_dict.values()
         )
-        scored = []
+        candidates = []
+        uuid_texts = []
+        name_texts = []
         for entity in all_entities:
             uuid_val = _e_attr(entity, "uuid")
             name_val = _e_attr(entity, "name")
             if not uuid_val and not name_val:
                 continue
-            uuid_sim = levenshtein_similarity(query, str(uuid_val)) if uuid_val else 0.0
-            name_sim = levenshtein_similarity(query, str(name_val)) if name_val else 0.0
-            best = max(uuid_sim, name_sim)
-            scored.append((entity, best))
-        scored.sort(key=lambda x: x[1], reverse=True)
-        result = []
-        uuids = [_e_attr(s[0], "uuid") for s in scored[:limit] if _e_attr(s[0], "uuid")]
+            candidates.append(entity)
+            uuid_texts.append(str(uuid_val) if uuid_val else None)
+            name_texts.append(str(name_val) if name_val else None)
+
+        # Query-independent: which candidates have a uuid/name and the texts to score them by.
+        uuid_present = [i for i, t in enumerate(uuid_texts) if t is not None]
+        uuid_choices = [uuid_texts[i] for i in uuid_present]
+        name_present = [i for i, t in enumerate(name_texts) if t is not None]
+        name_choices = [name_texts[i] for i in name_present]
+
+        top_entities_per_query = []
+        for query in queries:
+            best_sims = [0.0] * len(candidates)
+            for present, choices in (
+                (uuid_present, uuid_choices),
+                (name_present, name_choices),
+            ):
+                for i, sim in zip(present, levenshtein_similarities(query, choices)):
+                    if sim > best_sims[i]:
+                        best_sims[i] = sim
+            top_indices = heapq.nlargest(
+                limit, range(len(candidates)), key=best_sims.__getitem__
+            )
+            top_entities_per_query.append([candidates[i] for i in top_indices])
+
+        uuids = list(
+            dict.fromkeys(
+                _e_attr(entity, "uuid")
+                for top_entities in top_entities_per_query
+                for entity in top_entities
+                if _e_attr(entity, "uuid")
+            )
+        )
         nodes_by_uuid = {}
         if uuids:
             try:
@@ -174,16 +427,21 @@ class ArchitectAgentCreateRelationshipTool(BaseTool):
                 nodes_by_uuid = {n.uuid: n for n in nodes}
             except Exception:
                 pass
-        for entity, _ in scored[:limit]:
-            e_uuid = _e_attr(entity, "uuid")
-            e_name = _e_attr(entity, "name")
-            part = f"{e_name} ({e_uuid})"
-            node = nodes_by_uuid.get(e_uuid) if e_uuid else None
-            if node:
-                labels = ", ".join(node.labels) if node.labels else "?"
-                part += f" -> node: {node.name} [{labels}]"
-            result.append(part)
-        return result
+
+        results = []
+        for top_entities in top_entities_per_query:
+            result = []
+            for entity in top_entities:
+                e_uuid = _e_attr(entity, "uuid")
+                e_name = _e_attr(entity, "name")
+                part = f"{e_name} ({e_uuid})"
+                node = nodes_by_uuid.get(e_uuid) if e_uuid else None
+                if node:
+                    labels = ", ".join(node.labels) if node.labels else "?"
+                    part += f" -> node: {node.name} [{labels}]"
+                result.append(part)
+            results.append(result)
+        return results
 
     def _run(self, *args, **kwargs) -> str:
         """
@@ -197,18 +455,16 @@ class ArchitectAgentCreateRelationshipTool(BaseTool):
                         - description: textual description of the relationship
                         - amount: optional numeric value associated with the relationship
                         - properties: optional dict of additional properties
-                The method resolves subject and object against the tool's entity map and the architect_agent's used_entities_set.
+                The method resolves subject and object against the tool's entity map and the architect_agent's used_entities_dict.
 
         Returns:
                 A success JSON string on successful creation: '{"status": "success"}'.
                 An error string if the required "relationships" parameter is missing or if a subject/object cannot be resolved (e.g., 'Subject not found in entities: ...').
                 A dict with status "ERROR" when the JanitorAgent reports wrong relationships; the dict includes keys "wrong_relationships" and "newly_created_nodes".
         """
-        rel_key = str(uuid.uuid4())
+        rel_key = uuid.uuid4().hex
 
-        print(
-            "[DEBUG (architect_agent_create_relationship)]: Called ArchitectAgentCreateRelationshipTool"
-        )
+        logger.debug("[%s] Called ArchitectAgentCreateRelationshipTool", self.name)
 
         input_rels: List[_ArchitectAgentRelationship] = []
         output_rels: List[ArchitectAgentRelationship] = []
@@ -232,10 +488,26 @@ class ArchitectAgentCreateRelationshipTool(BaseTool):
         if not isinstance(relationships, list):
             return "Error: relationships must be a list"
 
-        print(
-            "[DEBUG (architect_agent_create_relationship)]: Relationships: ",
-            relationships,
-        )
+        logger.debug("[%s] Relationships: %s", self.name, relationships)
+
+        # uuid/name -> entity fallback lookup, built once per call instead of scanning
+        # every known entity for each unresolved reference.
+        entity_index: Dict[str, object] = {}
+        for entity in self.entities.values():
+            self._index_entity(entity_index, entity)
+        for entity in self.architect_agent.used_entities_dict.values():
+            self._index_entity(entity_index, entity)
+
+        # id(resolved entity) -> ArchitectAgentEntity; resolved entities are held by the tool or the agent for the
+        # whole call, so ids stay unique, and an entity shared by many relationships is converted once.
+        architect_entities: Dict[int, ArchitectAgentEntity] = {}
+
+        def _architect_entity(entity) -> ArchitectAgentEntity:
+            architect_entity = architect_entities.get(id(entity))
+            if architect_entity is None:
+                architect_entity = self._to_architect_entity(entity)
+                architect_entities[id(entity)] = architect_entity
+            return architect_entity
 
         for rel in relationships:
             newly_created_nodes = []
@@ -255,8 +527,11 @@ class ArchitectAgentCreateRelationshipTool(BaseTool):
             properties = rel.get("properties")
 
             if subject is None or object is None:
-                print(
-                    f"[DEBUG (architect_agent_create_relationship)]: Subject or object is None: subject={subject}, object={object}",
+                logger.debug(
+                    "[%s] Subject or object is None: subject=%s, object=%s",
+                    self.name,
+                    subject,
+                    object,
                 )
                 return f"Subject or object is None: subject={subject}, object={object}"
 
@@ -265,100 +540,30 @@ class ArchitectAgentCreateRelationshipTool(BaseTool):
             if isinstance(object, str):
                 object = object.strip()
 
-            def _resolve_entity(ref: str):
-                if not is_uuid(ref) and ":" in ref:
-                    scout_entity = ScoutEntity(
-                        uuid=str(uuid.uuid4()),
-                        name=ref.split(":")[1],
-                        type=ref.split(":")[0],
-                        description="",
-                        properties={},
-                    )
-                    self.entities[scout_entity.uuid] = scout_entity
-                    self.architect_agent.entities.update(
-                        {scout_entity.uuid: scout_entity}
-                    )
-                    newly_created_nodes.append(scout_entity.model_dump(mode="json"))
-                    return scout_entity
-                elif not is_uuid(ref):
-                    return None
-                entity = self.entities.get(ref.lower())
-                if entity:
-                    return entity
-                entity = self.architect_agent.used_entities_dict.get(ref.lower())
-                if entity:
-                    return entity
-                all_ents = list(self.entities.values()) + list(
-                    self.architect_agent.used_entities_dict.values()
+            subj_entity = self._resolve_entity(
+                subject, entity_index, newly_created_nodes
+            )
+            obj_entity = self._resolve_entity(object, entity_index, newly_created_nodes)
+
+            if subj_entity is None or obj_entity is None:
+                missing = []
+                if subj_entity is None:
+                    missing.append(("Subject", subject))
+                if obj_entity is None:
+                    missing.append(("Object", object))
+                similar_per_ref = self._most_similar_entities(
+                    [ref for _, ref in missing], limit=3
                 )
-                for e in all_ents:
-                    e_uuid = (
-                        e.get("uuid")
-                        if isinstance(e, dict)
-                        else getattr(e, "uuid", None)
-                    )
-                    e_name = (
-                        e.get("name")
-                        if isinstance(e, dict)
-                        else getattr(e, "name", None)
-                    )
-                    if ref in (e_uuid, e_name):
-                        return e
-                return None
-
-            subj_entity = _resolve_entity(subject)
-            obj_entity = _resolve_entity(object)
-
-            if subj_entity is None:
-                similar = self._most_similar_entities(subject, limit=3)
-                msg = (
-                    f"Subject not found in entities: {subject}. Most similar: {similar}"
+                msg = "\n".join(
+                    f"{role} not found in entities: {ref}. Most similar: {similar}"
+                    for (role, ref), similar in zip(missing, similar_per_ref)
                 )
 
-                print(f"[DEBUG (architect_agent_create_relationship)]: {msg}")
+                logger.debug("[%s] %s", self.name, msg)
                 return msg
 
-            if obj_entity is None:
-                similar = self._most_similar_entities(object, limit=3)
-                msg = f"Object not found in entities: {object}. Most similar: {similar}"
-
-                print(f"[DEBUG (architect_agent_create_relationship)]: {msg}")
-                return msg
-
-            def _attr(e, k, default=None):
-                return (
-                    e.get(k, default) if isinstance(e, dict) else getattr(e, k, default)
-                )
-
-            def _props(e):
-                return _attr(e, "properties") or {}
-
-            subj = ArchitectAgentEntity(
-                uuid=_attr(subj_entity, "uuid"),
-                name=_attr(subj_entity, "name"),
-                type=_attr(subj_entity, "type"),
-                description=_attr(subj_entity, "description"),
-                **(
-                    {"happened_at": _props(subj_entity).get("happened_at")}
-                    if _props(subj_entity).get("happened_at")
-                    else {}
-                ),
-                properties=_props(subj_entity),
-                polarity=_attr(subj_entity, "polarity") or "neutral",
-            )
-            obj = ArchitectAgentEntity(
-                uuid=_attr(obj_entity, "uuid"),
-                name=_attr(obj_entity, "name"),
-                type=_attr(obj_entity, "type"),
-                description=_attr(obj_entity, "description"),
-                **(
-                    {"happened_at": _props(obj_entity).get("happened_at")}
-                    if _props(obj_entity).get("happened_at")
-                    else {}
-                ),
-                properties=_props(obj_entity),
-                polarity=_attr(obj_entity, "polarity") or "neutral",
-            )
+            subj = _architect_entity(subj_entity)
+            obj = _architect_entity(obj_entity)
 
             input_rels.append(
                 _ArchitectAgentRelationship(
@@ -379,26 +584,15 @@ class ArchitectAgentCreateRelationshipTool(BaseTool):
         # )
 
         fixed_relationships = []
-        fixed_rels_sets = set()
         janitor_response = None
+        input_embeddings = None
 
         if self.mode == "granular":
-            from src.core.agents.janitor_agent import JanitorAgent
-
-            janitor_agent = getattr(self.architect_agent, "janitor_agent", None)
-            janitor_agent_brain_id = getattr(
-                self.architect_agent, "_janitor_agent_brain_id", None
+            # Embed the input-side texts while the janitor LLM call is in flight.
+            input_embeddings = relationship_embedding_cache.prefetch(
+                embeddings_small_adapter, relationship_texts(input_rels)
             )
-            if janitor_agent is None or janitor_agent_brain_id != self.brain_id:
-                janitor_agent = JanitorAgent(
-                    llm_small_adapter,
-                    kg=graph_adapter,
-                    vector_store=vector_store_adapter,
-                    embeddings=embeddings_adapter,
-                    database_desc=_neo4j_client.graphdb_description,
-                )
-                self.architect_agent.janitor_agent = janitor_agent
-                self.architect_agent._janitor_agent_brain_id = self.brain_id
+            janitor_agent = self.architect_agent.get_janitor_agent(self.brain_id)
             start_input_tokens = janitor_agent.input_tokens
             start_output_tokens = janitor_agent.output_tokens
             start_cached_tokens = janitor_agent.cached_tokens
@@ -415,10 +609,7 @@ class ArchitectAgentCreateRelationshipTool(BaseTool):
                 )
             )
 
-            print(
-                "[DEBUG (architect_agent_create_relationship)]: Janitor response: ",
-                janitor_response,
-            )
+            logger.debug("[%s] Janitor response: %s", self.name, janitor_response)
 
             janitor_token_detail = token_detail_from_token_counts(
                 janitor_agent.input_tokens - start_input_tokens,
@@ -446,18 +637,14 @@ class ArchitectAgentCreateRelationshipTool(BaseTool):
                     self.architect_agent.entities.update(
                         {scout_entity.uuid: scout_entity}
                     )
+                    self._index_entity(entity_index, scout_entity)
                     newly_created_nodes.append(scout_entity.model_dump(mode="json"))
 
-            fixed_rels_sets = set()
             fixed_relationships = (
                 getattr(janitor_response, "fixed_relationships", []) or []
             )
 
             if fixed_relationships:
-                fixed_rels_sets = set(
-                    frozenset((fr.tip.uuid, fr.tail.uuid, fr.name))
-                    for fr in fixed_relationships
-                )
                 output_rels.extend(
                     [
                         ArchitectAgentRelationship(
@@ -477,134 +664,101 @@ class ArchitectAgentCreateRelationshipTool(BaseTool):
                     ]
                 )
 
-        # Batch embed texts for similarity comparison
-        texts_to_embed = set()
-        for rel in input_rels:
-            texts_to_embed.add(rel.description if rel.description else rel.name)
-        for rel in fixed_relationships:
-            texts_to_embed.add(rel.description if rel.description else rel.name)
-
-        text_to_embedding = {}
-        if texts_to_embed:
-            texts_list = list(texts_to_embed)
-            vectors = embeddings_small_adapter.embed_texts(texts_list)
-            for text, vector in zip(texts_list, vectors):
-                text_to_embedding[text] = vector.embeddings
-
-        for rel in input_rels:
-            have_similar_relation = False
-            if frozenset((rel.tip.uuid, rel.tail.uuid, rel.name)) in fixed_rels_sets:
-                have_similar_relation = True
-            else:
-                rels_with_same_subject_and_object = [
-                    fr
-                    for fr in fixed_relationships
-                    if (fr.tip.uuid == rel.tip.uuid and fr.tail.uuid == rel.tail.uuid)
-                    or (fr.tip.uuid == rel.tail.uuid and fr.tail.uuid == rel.tip.uuid)
-                ]
-
-                if rels_with_same_subject_and_object:
-                    input_rel_text = rel.description if rel.description else rel.name
-                    input_embedding = text_to_embedding.get(input_rel_text)
-
-                    candidates = []
-                    for fr in rels_with_same_subject_and_object:
-                        fixed_rel_text = fr.description if fr.description else fr.name
-                        fixed_embedding = text_to_embedding.get(fixed_rel_text)
-
-                        if input_embedding and fixed_embedding:
-                            candidates.append(
-                                (
-                                    cosine_similarity(fixed_embedding, input_embedding),
-                                    fr,
-                                )
-                            )
-
-                    if candidates:
-                        similarity_score, most_similar_fixed_rel = max(
-                            candidates, key=lambda x: x[0]
-                        )
+        if fixed_relationships:
+            fixed_rels_keys, fixed_rels_by_pair = index_fixed_relationships(
+                fixed_relationships
+            )
+            scorer = FixedRelationshipScorer(fixed_rels_by_pair)
+            # Unit vectors, so each comparison is a dot product; only the pairs that a near-identical predicate
+            # name does not already decide need their fixed relationship texts embedded.
+            text_to_embedding = embed_fixed_relationship_texts(
+                input_embeddings,
+                scorer.fixed_relationships_to_embed(input_rels, fixed_rels_keys),
+                embeddings_small_adapter,
+            )
 
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+            new_rels = []
+            for rel in input_rels:
+                have_similar_relation = False
+                if relationship_key(rel) in fixed_rels_keys:
+                    have_similar_relation = True
+                else:
+                    similarity_score, most_similar_fixed_rel = scorer.most_similar(rel, text_to_embedding)
+                    if similarity_score is not None:
                         if (
                             similarity_score > 0.90
                         ):  # TODO: [similarity_threshold] check if this is the suitable threshold
                             have_similar_relation = True
-                        print(
-                            "[DEBUG (architect_agent_create_relationship)]: Have similar relation: ",
-                            have_similar_relation,
-                            "similarity_score: ",
-                            similarity_score,
-                            "rels: ",
-                            most_similar_fixed_rel,
-                            rel,
-                        )
+                        if debug_enabled:
+                            logger.debug(
+                                "[%s] Have similar relation: %s similarity_score: %s rels: %s %s",
+                                self.name,
+                                have_similar_relation,
+                                similarity_score,
+                                most_similar_fixed_rel,
+                                rel,
+                            )
 
-            if not have_similar_relation:
-                output_rels.append(
-                    ArchitectAgentRelationship(
-                        flow_key=rel_key,
-                        tip=rel.tip,
-                        name=rel.name,
-                        description=rel.description,
-                        tail=rel.tail,
-                        properties=getattr(rel, "properties", {}),
-                        **(
-                            {"amount": getattr(rel, "amount", None)}
-                            if getattr(rel, "amount", None)
-                            else {}
-                        ),
-                    )
-                )
+                if not have_similar_relation:
+                    new_rels.append(rel)
+        else:
+            # Nothing came back from the janitor to deduplicate against.
+            new_rels = input_rels
+
+        output_rels.extend(
+            ArchitectAgentRelationship(
+                flow_key=rel_key,
+                tip=rel.tip,
+                name=rel.name,
+                description=rel.description,
+                tail=rel.tail,
+                properties=getattr(rel, "properties", {}),
+                **(
+                    {"amount": getattr(rel, "amount", None)}
+                    if getattr(rel, "amount", None)
+                    else {}
+                ),
+            )
+            for rel in new_rels
+        )
 
         relationships_data = [
-            rel.model_dump(mode="json")
+            rel.model_dump_json()
             for rel in output_rels
             if isinstance(rel, ArchitectAgentRelationship)
         ]
-        print(
-            "[DEBUG (architect_agent_create_relationship)]: Relationships data: ",
-            relationships_data,
+        logger.debug(
+            "[%s] Relationships to ingest: %d", self.name, len(relationships_data)
         )
-        if relationships_data:
-            from src.workers.tasks.ingestion import process_architect_relationships
-            from src.lib.redis.client import _redis_client
 
-            print(
-                "[DEBUG (architect_agent_create_relationship)]: Sending relationships to ingestion task"
-            )
+        self.architect_agent.relationships_set.extend(output_rels)
+        self.architect_agent.relationships_set_json.extend(relationships_data)
 
-            session_id = getattr(self.architect_agent, "session_id", None)
-            if session_id:
-                _redis_client.client.incr(
-                    f"{self.brain_id}:session:{session_id}:pending_tasks"
+        session_id = getattr(self.architect_agent, "session_id", None)
+        if session_id and relationships_data:
+            # One round-trip for the pending-task counter and the session snapshot; the counter
+            # must be incremented before the task is queued, since the worker decrements it.
+            # The raw pipeline bypasses the client's key prefixing, so keys go through `_get_key`.
+            pipe = _redis_client.client.pipeline(transaction=False)
+            pipe.incr(
+                _redis_client._get_key(
+                    f"session:{session_id}:pending_tasks", self.brain_id
                 )
-
-            task_result = process_architect_relationships.delay(
-                {
-                    "relationships": relationships_data,
-                    "brain_id": self.brain_id,
-                    "session_id": session_id,
-                }
             )
-            print(
-                f"[DEBUG (architect_agent_create_relationship)]: Task {task_result.id} queued for session {session_id}"
+            pipe.set(
+                _redis_client._get_key(
+                    f"session:{session_id}:relationships", self.brain_id
+                ),
+                join_json_fragments(self.architect_agent.relationships_set_json),
+                ex=3600,
             )
+            pipe.execute()
 
-        self.architect_agent.relationships_set.extend(output_rels)
-
-        session_id = getattr(self.architect_agent, "session_id", None)
-        if session_id and output_rels:
-            from src.lib.redis.client import _redis_client
-
-            relationships_data = [
-                rel.model_dump(mode="json")
-                for rel in self.architect_agent.relationships_set
-            ]
-            _redis_client.set(
-                f"session:{session_id}:relationships",
-                json.dumps(relationships_data),
-                brain_id=self.brain_id,
-                expires_in=3600,
+        if relationships_data:
+            logger.debug("[%s] Sending relationships to ingestion task", self.name)
+            self.architect_agent.dispatch_relationships(
+                join_json_fragments(relationships_data), self.brain_id, session_id
             )
 
         wrong_relationships = []
@@ -612,8 +766,9 @@ class ArchitectAgentCreateRelationshipTool(BaseTool):
             wrong_relationships = getattr(janitor_response, "wrong_relationships", [])
 
         if len(wrong_relationships) > 0:
-            print(
-                "[DEBUG (architect_agent_create_relationship)]: Wrong relationships: ",
+            logger.debug(
+                "[%s] Wrong relationships: %s",
+                self.name,
                 getattr(janitor_response, "wrong_relationships", []),
             )
             return {
@@ -9,15 +9,29 @@ Modified By: Christian Nonis <alch.infoemail@gmail.com>
 -----
 """
 
-import json
+import logging
+from typing import Dict, List, Tuple
+
 from langchain.tools import BaseTool
+from pydantic import TypeAdapter
 
+from src.core.agents.scout_agent import ScoutEntity
 from src.utils.cleanup import strip_properties
+from src.utils.serialization.data import join_json_fragments, json_dumps
+
+logger = logging.getLogger(__name__)
+
+_SCOUT_ENTITY_LIST_ADAPTER = TypeAdapter(List[ScoutEntity])
+
+# Fields the architect does not need to pick relationships; dropped to keep the tool output small.
+REMAINING_ENTITY_DROPPED_FIELDS = frozenset(("description", "polarity"))
 
 
 class ArchitectAgentGetRemainingEntitiesToProcessTool(BaseTool):
     name: str = "architect_agent_get_remaining_entities_to_process"
     architect_agent: object
+    # entity key -> (entity object, its JSON), from the previous call
+    cached_fragments: Dict[str, Tuple[object, str]] = {}
 
     def __init__(
         self,
@@ -40,30 +54,62 @@ class ArchitectAgentGetRemainingEntitiesToProcessTool(BaseTool):
             description=description,
         )
 
+    @staticmethod
+    def _dump_entities(entities: list) -> list:
+        if all(isinstance(entity, ScoutEntity) for entity in entities):
+            # One pydantic-core pass for the whole list instead of a model_dump per entity.
+            dumped_entities = _SCOUT_ENTITY_LIST_ADAPTER.dump_python(
+                entities, mode="json"
+            )
+        else:
+            dumped_entities = [
+                (
+                    entity.model_dump(mode="json")
+                    if hasattr(entity, "model_dump")
+                    else entity
+                )
+                for entity in entities
+            ]
+        return strip_properties(
+            dumped_entities, pop_also=REMAINING_ENTITY_DROPPED_FIELDS
+        )
+
     def _run(self, *args, **kwargs) -> str:
         """
         Get a JSON string listing the remaining entities to process.
 
+        Each entity's JSON is cached under its key together with the entity object, and reused while that same
+        object is still registered, so only entities added (or replaced) since the previous call are serialized.
+
         Returns:
             str: A JSON array string where each element is the serialized representation of an entity produced by calling `model_dump(mode="json")` on each entity in `self.architect_agent.entities`.
         """
-        remaining_entities = json.dumps(
-            [
-                strip_properties(
-                    [
-                        (
-                            entity.model_dump(mode="json")
-                            if hasattr(entity, "model_dump")
-                            else entity
-                        )
-                    ],
-                    pop_also=["description", "polarity"],
-                )[0]
-                for entity in self.architect_agent.entities.values()
-            ]
+        previous_fragments = self.cached_fragments
+        fragments: Dict[str, Tuple[object, str]] = {}
+        stale_keys = []
+        for key, entity in self.architect_agent.entities.items():
+            cached = previous_fragments.get(key)
+            if cached is not None and cached[0] is entity:
+                fragments[key] = cached
+            else:
+                fragments[key] = None
+                stale_keys.append(key)
+
+        if stale_keys:
+            stale_entities = [self.architect_agent.entities[key] for key in stale_keys]
+            for key, entity, dumped_entity in zip(
+                stale_keys, stale_entities, self._dump_entities(stale_entities)
+            ):
+                fragments[key] = (entity, json_dumps(dumped_entity))
+
+        # Rebuilt every call, so entities that were marked as used are dropped from the cache.
+        self.cached_fragments = fragments
+        remaining_entities = join_json_fragments(
+            fragment for _, fragment in fragments.values()
         )
-        print(
-            "[DEBUG (architect_agent_get_remaining_entities_to_process)]: ",
-            remaining_entities,
+        logger.debug(
+            "[architect_agent_get_remaining_entities_to_process] remaining_entities=%d reserialized=%d",
+            len(fragments),
+            len(stale_keys),
         )
         return remaining_entities
@@ -9,29 +9,58 @@ Modified By: Christian Nonis <alch.infoemail@gmail.com>
 -----
 """
 
-import json
-from langchain.tools import BaseTool
+import logging
+from typing import List, Optional
 
-from src.utils.cleanup import strip_properties
+from langchain.tools import BaseTool
+from pydantic import Field
+
+from src.utils.cleanup import strip_object
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+_ENTITY_UUIDS_KEYS = ("entity_uuids", "entities", "uuids")
+
+
+def _entity_uuids_from_arguments(args: tuple, kwargs: dict):
+    """
+    Pick the uuids to mark out of the tool call: the first of `_ENTITY_UUIDS_KEYS` found in a dict first positional
+    argument or in the keywords, else a list first positional argument, else the value of a lone keyword.
+    """
+    first_arg = args[0] if args else None
+    for source in (first_arg, kwargs):
+        if isinstance(source, dict):
+            for key in _ENTITY_UUIDS_KEYS:
+                if key in source:
+                    return source[key]
+    if isinstance(first_arg, list):
+        return first_arg
+    if len(kwargs) == 1:
+        return next(iter(kwargs.values()))
+    return []
+
+
+_ARGS_SCHEMA: dict = {
+    "type": "object",
+    "properties": {
+        "entity_uuids": {
+            "type": "array",
+            "description": "A list of entity uuids to mark as used",
+            "items": {
+                "type": "string",
+                "description": "The uuid of the entity to mark as used.",
+            },
+        },
+    },
+    "required": ["entity_uuids"],
+}
 
 
 class ArchitectAgentMarkEntitiesAsUsedTool(BaseTool):
     name: str = "architect_agent_mark_entities_as_used"
     architect_agent: object
-    args_schema: dict = {
-        "type": "object",
-        "properties": {
-            "entity_uuids": {
-                "type": "array",
-                "description": "A list of entity uuids to mark as used",
-                "items": {
-                    "type": "string",
-                    "description": "The uuid of the entity to mark as used.",
-                },
-            },
-        },
-        "required": ["entity_uuids"],
-    }
+    args_schema: dict = Field(default_factory=lambda: _ARGS_SCHEMA)
 
     def __init__(
         self,
@@ -41,7 +70,7 @@ class ArchitectAgentMarkEntitiesAsUsedTool(BaseTool):
         Initialize the tool with a reference to the architect agent whose entities may be marked as used.
 
         Parameters:
-            architect_agent (object): The architect agent instance whose `entities` and `used_entities_set` this tool will update.
+            architect_agent (object): The architect agent instance whose `entities` and `used_entities_dict` this tool will update.
         """
         description: str = (
             "Tool that marks entities as used. "
@@ -53,43 +82,32 @@ class ArchitectAgentMarkEntitiesAsUsedTool(BaseTool):
             description=description,
         )
 
-    def _run(self, *args, **kwargs) -> str:
+    def _run(self, *args, entity_uuids: Optional[List[str]] = None, **kwargs) -> str:
         """
         Mark the given entity UUIDs as used on the associated architect agent.
 
         Accepts several input shapes to identify the UUIDs to mark: a dict argument with the key "entity_uuids", a keyword "entity_uuids", a list passed as the first positional argument, or keywords "entities" or "uuids". If a single string is provided it will be treated as a single UUID. If no recognizable input is provided, no entities are marked.
 
         Parameters:
+            entity_uuids (List[str] | str | None): The UUIDs to mark, as passed by a schema-conforming call; the other
+                shapes below are only looked at when it is missing.
             *args: Positional arguments; supported forms include:
                 - A dict containing the key "entity_uuids" with a list of UUID strings.
                 - A list of UUID strings as the first positional argument.
             **kwargs: Keyword arguments; supported keys include:
-                - "entity_uuids", "entities", or "uuids" with a list (or single string) of UUIDs.
+                - "entities" or "uuids" with a list (or single string) of UUIDs.
                 - If exactly one keyword is provided, its value is used as the UUID list.
 
         Returns:
             result (str): The string "OK" after processing.
 
         Side effects:
-            For each provided UUID found in self.architect_agent.entities, the entity is removed from that mapping and appended to self.architect_agent.used_entities_set.
+            For each provided UUID found in self.architect_agent.entities, the entity is removed from that mapping, stored in self.architect_agent.used_entities_dict and self.architect_agent.used_entities_version is bumped.
         """
-        entities_to_mark = []
-
-        if args and isinstance(args[0], dict) and "entity_uuids" in args[0]:
-            entities_to_mark = args[0]["entity_uuids"]
-        elif kwargs and "entity_uuids" in kwargs:
-            entities_to_mark = kwargs["entity_uuids"]
-        elif args and len(args) > 0 and isinstance(args[0], list):
-            entities_to_mark = args[0]
-        elif "entities" in kwargs:
-            entities_to_mark = kwargs["entities"]
-        elif "uuids" in kwargs:
-            entities_to_mark = kwargs["uuids"]
+        if entity_uuids is not None:
+            entities_to_mark = entity_uuids
         else:
-            if len(kwargs) == 1:
-                entities_to_mark = list(kwargs.values())[0]
-            else:
-                entities_to_mark = []
+            entities_to_mark = _entity_uuids_from_arguments(args, kwargs)
 
         if isinstance(entities_to_mark, str):
             entities_to_mark = [entities_to_mark]
@@ -97,33 +115,29 @@ class ArchitectAgentMarkEntitiesAsUsedTool(BaseTool):
         if entities_to_mark is None:
             entities_to_mark = []
 
+        entities = self.architect_agent.entities
+        used_entities_dict = self.architect_agent.used_entities_dict
         for entity_uuid in entities_to_mark:
-            if entity_uuid in self.architect_agent.entities:
-                removed_entity = self.architect_agent.entities.pop(entity_uuid)
-                if removed_entity:
-                    _ent = (
-                        removed_entity.model_dump(mode="json")
-                        if hasattr(removed_entity, "model_dump")
-                        else removed_entity
-                    )
-                    self.architect_agent.used_entities_dict[_ent["uuid"]] = (
-                        strip_properties([_ent])[0]
-                    )
-                else:
-                    print(
-                        "[DEBUG (architect_agent_mark_entities_as_used)]: Entity found but not removed: ",
-                        entity_uuid,
-                    )
-            else:
-                print(
-                    "[DEBUG (architect_agent_mark_entities_as_used)]: Entity not found: ",
+            removed_entity = entities.pop(entity_uuid, _MISSING)
+            if removed_entity is _MISSING:
+                logger.debug(
+                    "[architect_agent_mark_entities_as_used] Entity not found: %s",
                     entity_uuid,
                 )
-
-        print(
-            "[DEBUG (architect_agent_mark_entities_as_used)]: Used entities: ",
-            list(self.architect_agent.used_entities_dict.keys()),
-            entities_to_mark,
-        )
+                continue
+            _ent = (
+                removed_entity.model_dump(mode="json")
+                if hasattr(removed_entity, "model_dump")
+                else removed_entity
+            )
+            used_entities_dict[entity_uuid] = strip_object(_ent)
+            self.architect_agent.used_entities_version += 1
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "[architect_agent_mark_entities_as_used] Used entities: %s %s",
+                list(self.architect_agent.used_entities_dict.keys()),
+                entities_to_mark,
+            )
 
         return "OK"
@@ -12,6 +12,7 @@ import json
 import re
 
 from langchain.tools import BaseTool
+from pydantic import Field
 
 from src.adapters.graph import GraphAdapter
 
@@ -58,6 +59,18 @@ def _merge_graph_read_results(results: list[str]) -> str:
     return json.dumps(payload, default=str)
 
 
+_ARGS_SCHEMA: dict = {
+    "type": "object",
+    "properties": {
+        "query": {
+            "type": "string",
+            "description": "The query to execute on the knowledge graph. Should be a valid graph read only operation depending on the graph database type.",
+        },
+    },
+    "required": ["query"],
+}
+
+
 class JanitorAgentExecuteGraphReadOperationTool(BaseTool):
     """
     Tool for executing a graph read only operation.
@@ -69,16 +82,7 @@ class JanitorAgentExecuteGraphReadOperationTool(BaseTool):
     kg: GraphAdapter
     brain_id: str = "default"
 
-    args_schema: dict = {
-        "type": "object",
-        "properties": {
-            "query": {
-                "type": "string",
-                "description": "The query to execute on the knowledge graph. Should be a valid graph read only operation depending on the graph database type.",
-            },
-        },
-        "required": ["query"],
-    }
+    args_schema: dict = Field(default_factory=lambda: _ARGS_SCHEMA)
 
     def __init__(
         self,
@@ -8,10 +8,57 @@ Modified By: Christian Nonis <alch.infoemail@gmail.com>
 -----
 """
 
-import json
 from langchain.tools import BaseTool
+from pydantic import Field
 
 from src.adapters.graph import GraphAdapter
+from src.core.agents.tools.janitor_agent.tool_cache import janitor_tool_cache
+from src.utils.serialization.data import json_dumps
+
+_SCHEMA_TARGET_KEYS = {
+    "node_labels": "labels",
+    "relationship_types": "relationships",
+    "event_names": "event_names",
+}
+
+SCHEMA_TOOL_NAME = "get_schema"
+
+
+def schema_json(kg: GraphAdapter, brain_id: str, target: str) -> str:
+    """
+    Return the serialized `target` part of the brain's schema.
+
+    All three targets come from one get_schema call, so a cache miss serializes and caches every target; repeated
+    calls skip both the graph query and the dump. The cache is bypassed while writes to the brain are pending.
+    """
+    epoch = janitor_tool_cache.epoch(brain_id)
+    if epoch is not None:
+        target_json = janitor_tool_cache.get(brain_id, SCHEMA_TOOL_NAME, target)
+        if target_json is not None:
+            return target_json
+    schema_result = kg.get_schema(brain_id=brain_id)
+    for schema_target, key in _SCHEMA_TARGET_KEYS.items():
+        schema_target_json = json_dumps(schema_result.get(key, []))
+        if epoch is not None:
+            janitor_tool_cache.set(
+                brain_id, SCHEMA_TOOL_NAME, schema_target, schema_target_json, epoch
+            )
+        if schema_target == target:
+            target_json = schema_target_json
+    return target_json
+
+
+_ARGS_SCHEMA: dict = {
+    "type": "object",
+    "properties": {
+        "target": {
+            "type": "string",
+            "description": "The target to get the schema of. (node_labels or relationship_types)",
+            "enum": ["node_labels", "relationship_types", "event_names"],
+        },
+    },
+    "required": ["target"],
+}
 
 
 class JanitorAgentGetSchemaTool(BaseTool):
@@ -19,22 +66,12 @@ class JanitorAgentGetSchemaTool(BaseTool):
     Tool for getting the schema of the knowledge graph.
     """
 
-    name: str = "get_schema"
+    name: str = SCHEMA_TOOL_NAME
     janitor_agent: object
     kg: GraphAdapter
     brain_id: str = "default"
 
-    args_schema: dict = {
-        "type": "object",
-        "properties": {
-            "target": {
-                "type": "string",
-                "description": "The target to get the schema of. (node_labels or relationship_types)",
-                "enum": ["node_labels", "relationship_types", "event_names"],
-            },
-        },
-        "required": ["target"],
-    }
+    args_schema: dict = Field(default_factory=lambda: _ARGS_SCHEMA)
 
     def __init__(
         self,
@@ -53,32 +90,24 @@ class JanitorAgentGetSchemaTool(BaseTool):
             brain_id=brain_id,
         )
 
-    def _run(self, *args, **kwargs) -> str:
+    def _run(self, *args, target: str = "node_labels", **kwargs) -> str:
         """
-        Retrieve a specified part of the knowledge graph schema and return it as a pretty-printed JSON string.
+        Retrieve a specified part of the knowledge graph schema and return it as a compact JSON string.
         
         Parameters:
             target (str, optional): One of "node_labels", "relationship_types", or "event_names". Defaults to "node_labels".
         
         Returns:
-            str: A JSON-formatted string (indent=4) containing the requested list from the schema:
+            str: A compact JSON string containing the requested list from the schema:
                  - labels for "node_labels"
                  - relationships for "relationship_types"
                  - event_names for "event_names"
                  If `target` is not one of the accepted values, returns the error message
                  "Invalid target parameter. It must be either 'node_labels' or 'relationship_types' or 'event_names'".
         """
-        _target = kwargs.get("target", "node_labels").lower()
-
-        schema_result = self.kg.get_schema(brain_id=self.brain_id)
-
-        if _target == "node_labels":
-            labels = schema_result.get("labels", [])
-            return json.dumps(labels, indent=4)
-        elif _target == "relationship_types":
-            relationships = schema_result.get("relationships", [])
-            return json.dumps(relationships, indent=4)
-        elif _target == "event_names":
-            event_names = schema_result.get("event_names", [])
-            return json.dumps(event_names, indent=4)
-        return "Invalid target parameter. It must be either 'node_labels' or 'relationship_types' or 'event_names'"
\ No newline at end of file
+        _target = (target or "node_labels").lower()
+
+        if _target not in _SCHEMA_TARGET_KEYS:
+            return "Invalid target parameter. It must be either 'node_labels' or 'relationship_types' or 'event_names'"
+
+        return schema_json(self.kg, self.brain_id, _target)
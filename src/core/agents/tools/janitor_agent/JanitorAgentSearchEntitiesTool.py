@@ -9,13 +9,61 @@ Modified By: Christian Nonis <alch.infoemail@gmail.com>
 """
 
 import json
-from typing import Dict, List, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Union
 from langchain.tools import BaseTool
+from pydantic import Field
 
 from src.adapters.embeddings import EmbeddingsAdapter, VectorStoreAdapter
 from src.adapters.graph import GraphAdapter
 from src.constants.kg import Node
-from src.utils.cleanup import strip_properties
+from src.core.agents.tools.janitor_agent.tool_cache import (
+    janitor_tool_cache,
+    query_embedding_cache,
+)
+from src.utils.cleanup import strip_model
+from src.utils.serialization.data import json_dumps, json_loads
+
+SEARCH_MAX_WORKERS = 8
+SEARCH_RESULT_DROPPED_FIELDS = frozenset(("last_updated", "v_id", "properties"))
+_CLEAN_QUERY_TABLE = str.maketrans(" -", "__", "'.\"()[]{}\\|*/+=<>,!?:;")
+
+
+def _clean_query(query: str) -> str:
+    """
+    Sanitizes a query string into a normalized key suitable for dictionary lookup.
+
+    Removes common punctuation, trims leading/trailing whitespace, converts to lowercase,
+    and replaces spaces and hyphens with underscores.
+
+    Parameters:
+        query (str): The input query text to normalize.
+
+    Returns:
+        sanitized (str): The normalized query string with punctuation removed, spaces and hyphens replaced by underscores, trimmed and lowercased.
+    """
+    return query.strip().lower().translate(_CLEAN_QUERY_TABLE)
+
+
+def _has_exact_match(query: str, nodes: List[Node]) -> bool:
+    query = query.strip().lower()
+    return any(node.name and node.name.lower() == query for node in nodes)
+
+
+_ARGS_SCHEMA: dict = {
+    "type": "object",
+    "properties": {
+        "queries": {
+            "type": "array",
+            "items": {
+                "type": "string",
+                "description": "The plain text query to search for entities in the knowledge graph within their names.",
+            },
+            "description": "The list of things to search for in the knowledge graph.",
+        },
+    },
+    "required": ["queries"],
+}
 
 
 class JanitorAgentSearchEntitiesTool(BaseTool):
@@ -29,21 +77,9 @@ class JanitorAgentSearchEntitiesTool(BaseTool):
     embeddings: EmbeddingsAdapter
     vector_store: VectorStoreAdapter
     brain_id: str = "default"
+    skip_vector_on_exact: bool = True
 
-    args_schema: dict = {
-        "type": "object",
-        "properties": {
-            "queries": {
-                "type": "array",
-                "items": {
-                    "type": "string",
-                    "description": "The plain text query to search for entities in the knowledge graph within their names.",
-                },
-                "description": "The list of things to search for in the knowledge graph.",
-            },
-        },
-        "required": ["queries"],
-    }
+    args_schema: dict = Field(default_factory=lambda: _ARGS_SCHEMA)
 
     def __init__(
         self,
@@ -52,6 +88,7 @@ class JanitorAgentSearchEntitiesTool(BaseTool):
         embeddings: EmbeddingsAdapter,
         vector_store: VectorStoreAdapter,
         brain_id: str = "default",
+        skip_vector_on_exact: bool = True,
     ):
         """
         Initialize the JanitorAgentSearchEntitiesTool with the required adapters and configuration.
@@ -60,6 +97,8 @@ class JanitorAgentSearchEntitiesTool(BaseTool):
 
         Parameters:
             brain_id (str): Identifier of the brain (knowledge scope) to use for searches. Defaults to "default".
+            skip_vector_on_exact (bool): Skip the vector search for queries whose KG search already found an entity with
+                exactly that name (case-insensitive). Defaults to True.
         """
         description: str = (
             "Tool to search for entities in the knowledge graph by plain text names. "
@@ -75,30 +114,31 @@ class JanitorAgentSearchEntitiesTool(BaseTool):
             vector_store=vector_store,
             description=description,
             brain_id=brain_id,
+            skip_vector_on_exact=skip_vector_on_exact,
         )
 
-    def _run(self, *args, **kwargs) -> str:
+    def _run(self, *args, queries: Optional[List[str]] = None, **kwargs) -> str:
         """
         Search multiple query strings for matching entities in the knowledge graph and vector store, and return the aggregated results as a JSON-formatted mapping keyed by a sanitized query string.
 
         Parameters:
-            args: If provided, the first positional argument is treated as the list of query strings to process.
-            kwargs:
-                queries (List[str]): List of query strings to search for when not passed as a positional argument.
+            queries (List[str]): List of query strings to search for; the schema-conforming call passes them here.
+            args: Legacy input shapes, only read when `queries` is not a list: the first positional argument is treated
+                as the list of query strings (or a JSON string carrying it) to process.
 
         Returns:
             str: A JSON string mapping each sanitized query to either a list of found entity objects (each serialized to JSON) or a message indicating no matches were found.
         """
 
-        _queries = []
+        _queries = queries if isinstance(queries, list) else []
 
-        if len(args) > 0:
+        if not _queries and len(args) > 0:
             arg_val = args[0]
             if isinstance(arg_val, list):
                 _queries = arg_val
             elif isinstance(arg_val, str):
                 try:
-                    parsed = json.loads(arg_val)
+                    parsed = json_loads(arg_val)
                     if isinstance(parsed, dict) and parsed.get("queries"):
                         _queries = parsed.get("queries", [])
                     else:
@@ -108,8 +148,8 @@ class JanitorAgentSearchEntitiesTool(BaseTool):
             else:
                 _queries = [arg_val]
 
-        if not _queries and len(kwargs) > 0:
-            _queries = kwargs.get("queries", [])
+        if not _queries and queries:
+            _queries = queries
 
         if not isinstance(_queries, list):
             _queries = [_queries] if _queries else []
@@ -117,68 +157,138 @@ class JanitorAgentSearchEntitiesTool(BaseTool):
         if not _queries:
             return "No queries provided in the arguments or kwargs"
 
-        found_entities: Dict[str, Union[str, List[Node]]] = {}
+        # Queries that sanitize to the same key share one output entry, which the last of them fills, so only that
+        # one is searched.
+        unique_queries = {_clean_query(_query): _query for _query in _queries}
+
+        # Results are cached per exact query text and `skip_vector_on_exact` setting; only the queries missing from the
+        # cache are searched. The cache is bypassed while writes to the brain are pending.
+        epoch = janitor_tool_cache.epoch(self.brain_id)
+        query_results: Dict[str, Union[str, List[dict]]] = {}
+        if epoch is not None:
+            for _query in unique_queries.values():
+                cached = janitor_tool_cache.get(
+                    self.brain_id, self.name, (_query, self.skip_vector_on_exact)
+                )
+                if cached is not None:
+                    query_results[_query] = cached
+        queries_to_search = [
+            _query for _query in unique_queries.values() if _query not in query_results
+        ]
+        if queries_to_search:
+            for _query, result in self._search_queries(queries_to_search).items():
+                if epoch is not None:
+                    janitor_tool_cache.set(
+                        self.brain_id,
+                        self.name,
+                        (_query, self.skip_vector_on_exact),
+                        result,
+                        epoch,
+                    )
+                query_results[_query] = result
+
+        found_entities = {
+            key: query_results[_query] for key, _query in unique_queries.items()
+        }
+        return json_dumps(found_entities)
 
-        def _clean_query(query: str) -> str:
-            """
-            Sanitizes a query string into a normalized key suitable for dictionary lookup.
+    def _search_queries(
+        self, queries: List[str]
+    ) -> Dict[str, Union[str, List[dict]]]:
+        """
+        Search the knowledge graph and the vector store for every query.
 
-            Removes common punctuation, trims leading/trailing whitespace, converts to lowercase,
-            and replaces spaces and hyphens with underscores.
+        Returns:
+            Dict[str, Union[str, List[dict]]]: For each query, the stripped JSON dumps of the entities found or a
+            message saying nothing matched.
+        """
+        results: Dict[str, Union[str, List[dict]]] = {}
 
-            Parameters:
-                query (str): The input query text to normalize.
+        # The KG and vector store lookups are I/O bound, so the queries are searched concurrently.
+        with ThreadPoolExecutor(
+            max_workers=min(SEARCH_MAX_WORKERS, len(queries))
+        ) as executor:
+            kg_founds_per_query = list(executor.map(self._search_kg, queries))
 
-            Returns:
-                sanitized (str): The normalized query string with punctuation removed, spaces and hyphens replaced by underscores, trimmed and lowercased.
-            """
-            chars_to_remove = "'.\"()[]{}\\|*/+=<>,!?:;"
-            chars_to_underscore = " -"
-            translation_table = str.maketrans(
-                chars_to_underscore, "_" * len(chars_to_underscore), chars_to_remove
-            )
-            return query.strip().lower().translate(translation_table).replace(" ", "_")
+            # An exact name hit already answers the query, so it skips the embedding and the vector search.
+            vector_queries = [
+                _query
+                for _query, kg_founds in zip(queries, kg_founds_per_query)
+                if not (self.skip_vector_on_exact and _has_exact_match(_query, kg_founds))
+            ]
+            vector_uuids_per_query: Dict[str, List[str]] = {}
+            if vector_queries:
+                try:
+                    query_vectors = query_embedding_cache.embed(
+                        self.embeddings, vector_queries
+                    )
+                except Exception as e:
+                    print(f"Vector search failed, using KG results only: {e}")
+                    query_vectors = []
+                vector_uuids_per_query = dict(
+                    zip(vector_queries, executor.map(self._search_vectors, query_vectors))
+                )
 
-        for _query in _queries:
-            founds = []
-            kg_results = self.kg.search_entities(
-                brain_id=self.brain_id, query_text=_query
+        # The nodes behind every query's vector hits are fetched in one graph round-trip.
+        all_vector_uuids = list(
+            dict.fromkeys(
+                uuid
+                for vector_uuids in vector_uuids_per_query.values()
+                for uuid in vector_uuids
             )
-            founds.extend(kg_results.results)
+        )
+        nodes_by_uuid: Dict[str, List[Node]] = {}
+        if all_vector_uuids:
             try:
-                query_vector = self.embeddings.embed_text(_query)
-                if query_vector.embeddings and len(query_vector.embeddings) > 0:
-                    v_results = self.vector_store.search_vectors(
-                        query_vector.embeddings,
-                        store="nodes",
-                        brain_id=self.brain_id,
-                        k=3,
-                    )
-                    if len(v_results) > 0:
-                        founds.extend(
-                            self.kg.get_nodes_by_uuid(
-                                [
-                                    v_result.metadata.get("uuid")
-                                    for v_result in v_results
-                                    if v_result.metadata.get("uuid") is not None
-                                ],
-                                brain_id=self.brain_id,
-                            )
-                        )
+                for node in self.kg.get_nodes_by_uuid(
+                    all_vector_uuids, brain_id=self.brain_id
+                ):
+                    nodes_by_uuid.setdefault(node.uuid, []).append(node)
             except Exception as e:
                 print(f"Vector search failed, using KG results only: {e}")
 
+        for _query, kg_founds in zip(queries, kg_founds_per_query):
+            founds = list(kg_founds)
+            for uuid in vector_uuids_per_query.get(_query, ()):
+                founds.extend(nodes_by_uuid.get(uuid, ()))
+
             if len(founds) == 0:
-                found_entities[_clean_query(_query)] = (
+                results[_query] = (
                     "Knowledge graph does not contain any entities that match the query"
                 )
             else:
-                found_entities[_clean_query(_query)] = [
-                    strip_properties(
-                        [f.model_dump(mode="json")],
-                        pop_also=["last_updated", "v_id", "properties"],
-                    )[0]
+                results[_query] = [
+                    strip_model(f, pop_also=SEARCH_RESULT_DROPPED_FIELDS)
                     for f in founds
                 ]
 
-        return json.dumps(found_entities, indent=4)
+        return results
+
+    def _search_kg(self, query: str) -> List[Node]:
+        return self.kg.search_entities(brain_id=self.brain_id, query_text=query).results
+
+    def _search_vectors(self, query_vector) -> List[str]:
+        """
+        Return the distinct uuids behind the top vector store hits for `query_vector`, best first; empty when the
+        vector is empty or the vector search fails.
+        """
+        try:
+            if not query_vector.embeddings:
+                return []
+            v_results = self.vector_store.search_vectors(
+                query_vector.embeddings,
+                store="nodes",
+                brain_id=self.brain_id,
+                k=3,
+            )
+            # Each hit's uuid is read once; repeated uuids keep their best-ranked position.
+            return [
+                uuid
+                for uuid in dict.fromkeys(
+                    v_result.metadata.get("uuid") for v_result in v_results
+                )
+                if uuid is not None
+            ]
+        except Exception as e:
+            print(f"Vector search failed, using KG results only: {e}")
+            return []
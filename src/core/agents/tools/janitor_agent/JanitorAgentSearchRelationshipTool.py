@@ -12,11 +12,42 @@ Modified By: Christian Nonis <alch.infoemail@gmail.com>
 import json
 from typing import Dict, List, Tuple, Union
 from langchain.tools import BaseTool
+from pydantic import Field
 
 from src.adapters.embeddings import EmbeddingsAdapter, VectorStoreAdapter
 from src.adapters.graph import GraphAdapter
 from src.constants.kg import Node, Predicate
-from src.utils.cleanup import strip_properties
+from src.core.agents.tools.janitor_agent.JanitorAgentSearchEntitiesTool import (
+    SEARCH_RESULT_DROPPED_FIELDS,
+)
+from src.utils.cleanup import strip_model
+from src.utils.serialization.data import json_dumps, json_loads
+
+
+_ARGS_SCHEMA: dict = {
+    "type": "object",
+    "properties": {
+        "queries": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "subject": {
+                        "type": "string",
+                        "description": "The uuid of the subject",
+                    },
+                    "object": {
+                        "type": "string",
+                        "description": "The uuid of the object",
+                    },
+                },
+                "required": ["subject", "object"],
+            },
+            "description": "Lists the relationships between the subject and object.",
+        },
+    },
+    "required": ["queries"],
+}
 
 
 class JanitorAgentSearchRelationshipsTool(BaseTool):
@@ -29,30 +60,7 @@ class JanitorAgentSearchRelationshipsTool(BaseTool):
     kg: GraphAdapter
     brain_id: str = "default"
 
-    args_schema: dict = {
-        "type": "object",
-        "properties": {
-            "queries": {
-                "type": "array",
-                "items": {
-                    "type": "object",
-                    "properties": {
-                        "subject": {
-                            "type": "string",
-                            "description": "The uuid of the subject",
-                        },
-                        "object": {
-                            "type": "string",
-                            "description": "The uuid of the object",
-                        },
-                    },
-                    "required": ["subject", "object"],
-                },
-                "description": "Lists the relationships between the subject and object.",
-            },
-        },
-        "required": ["queries"],
-    }
+    args_schema: dict = Field(default_factory=lambda: _ARGS_SCHEMA)
 
     def __init__(
         self,
@@ -101,7 +109,7 @@ class JanitorAgentSearchRelationshipsTool(BaseTool):
                 _queries = arg_val
             elif isinstance(arg_val, str):
                 try:
-                    parsed = json.loads(arg_val)
+                    parsed = json_loads(arg_val)
                     if isinstance(parsed, dict) and parsed.get("queries"):
                         _queries = parsed.get("queries", [])
                     else:
@@ -143,27 +151,21 @@ class JanitorAgentSearchRelationshipsTool(BaseTool):
                     if isinstance(f, tuple):
                         subject_node, predicate, object_node = f
                         entry = {
-                            "subject": strip_properties(
-                                [subject_node.model_dump(mode="json")],
-                                pop_also=["last_updated", "v_id", "properties"],
-                            )[0],
-                            "predicate": strip_properties(
-                                [predicate.model_dump(mode="json")],
-                                pop_also=["last_updated", "v_id", "properties"],
-                            )[0],
-                            "object": strip_properties(
-                                [object_node.model_dump(mode="json")],
-                                pop_also=["last_updated", "v_id", "properties"],
-                            )[0],
+                            "subject": strip_model(
+                                subject_node, pop_also=SEARCH_RESULT_DROPPED_FIELDS
+                            ),
+                            "predicate": strip_model(
+                                predicate, pop_also=SEARCH_RESULT_DROPPED_FIELDS
+                            ),
+                            "object": strip_model(
+                                object_node, pop_also=SEARCH_RESULT_DROPPED_FIELDS
+                            ),
                         }
                     else:
-                        entry = strip_properties(
-                            [f.model_dump(mode="json")],
-                            pop_also=["last_updated", "v_id", "properties"],
-                        )[0]
+                        entry = strip_model(f, pop_also=SEARCH_RESULT_DROPPED_FIELDS)
                     serialized.append(entry)
                 found_relationships[
                     _query.get("subject") + " -> " + _query.get("object")
                 ] = serialized
 
-        return json.dumps(found_relationships, indent=4)
+        return json_dumps(found_relationships)
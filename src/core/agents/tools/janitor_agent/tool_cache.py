@@ -0,0 +1,195 @@
+"""
+File: /tool_cache.py
+Created Date: Saturday October 17th 2026
+Author: Christian Nonis <alch.infoemail@gmail.com>
+-----
+Last Modified: Saturday October 17th 2026
+Modified By: Christian Nonis <alch.infoemail@gmail.com>
+-----
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from src.adapters.graph import add_graph_write_listener
+from src.config import config
+
+TOOL_CACHE_MAXSIZE = 1024
+TOOL_CACHE_TTL_SECONDS = 60.0
+QUERY_EMBEDDING_CACHE_MAXSIZE = 1024
+
+
+def _session_pending_tasks(brain_id: str, session_id: str) -> int:
+    """
+    Number of relationship batches of an ingestion session still waiting to be written by the workers.
+    """
+    # Deferred: importing the Redis client connects to Redis.
+    from src.lib.redis.client import _redis_client
+
+    pending = _redis_client.client.get(
+        f"{brain_id}:session:{session_id}:pending_tasks"
+    )
+    return int(pending) if pending is not None else 0
+
+
+class ToolResultCache:
+    """
+    Process-local LRU of read-only janitor tool results, scoped per brain.
+
+    Entries are keyed by `(brain_id, tool, key)`. Every write made through a GraphAdapter in this process calls
+    `graph_written`, which drops the brain's entries. Relationship batches handed to the ingestion workers are written
+    later, in another process, so `begin_write` records them instead: while a brain has queued writes that are not
+    known to be done, `epoch` returns None and callers neither read nor fill the cache. A queued write counts as done
+    when its session's pending-task counter is back to zero; one queued without a session cannot be tracked, so it
+    turns the brain's cache off for the rest of the process. The TTL bounds how stale a result can get because of
+    writes made elsewhere (e.g. by other API processes).
+    """
+
+    def __init__(
+        self,
+        maxsize: int = TOOL_CACHE_MAXSIZE,
+        ttl: float = TOOL_CACHE_TTL_SECONDS,
+        pending_tasks: Callable[[str, str], int] = _session_pending_tasks,
+        enabled: bool = True,
+    ) -> None:
+        self._enabled = enabled
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._pending_tasks = pending_tasks
+        self._entries: "OrderedDict[tuple, Tuple[float, object]]" = OrderedDict()
+        self._epochs: Dict[str, int] = {}
+        self._pending_sessions: Dict[str, Set[Optional[str]]] = {}
+        self._lock = threading.Lock()
+
+    def begin_write(self, brain_id: str, session_id: Optional[str]) -> None:
+        """
+        Record a graph write queued for `brain_id` by `session_id`, whose pending-task counter must already count it,
+        and drop the brain's cached results.
+        """
+        with self._lock:
+            self._pending_sessions.setdefault(brain_id, set()).add(session_id)
+            self._bump_epoch(brain_id)
+
+    def graph_written(self, brain_id: str) -> None:
+        """
+        Drop the brain's cached results after its graph was written to; results computed before are not cached.
+        """
+        with self._lock:
+            self._bump_epoch(brain_id)
+
+    def epoch(self, brain_id: str) -> Optional[int]:
+        """
+        Return the brain's current cache epoch, to pass to `set`, or None while the brain has writes pending, in
+        which case the cache must not be used. Always None when the cache is disabled.
+        """
+        if not self._enabled:
+            return None
+        with self._lock:
+            sessions = set(self._pending_sessions.get(brain_id, ()))
+        if sessions:
+            if None in sessions:
+                return None
+            done = set()
+            for session_id in sessions:
+                try:
+                    if self._pending_tasks(brain_id, session_id) > 0:
+                        return None
+                except Exception:  # pylint: disable=broad-exception-caught
+                    return None
+                done.add(session_id)
+            with self._lock:
+                pending_sessions = self._pending_sessions.get(brain_id, set())
+                pending_sessions -= done
+                if not pending_sessions:
+                    self._pending_sessions.pop(brain_id, None)
+                    # Results computed while the writes were pending must not be cached once they are done.
+                    self._bump_epoch(brain_id)
+                else:
+                    return None
+        with self._lock:
+            return self._epochs.get(brain_id, 0)
+
+    def get(self, brain_id: str, tool: str, key: Hashable) -> Optional[object]:
+        """
+        Return the cached result of `tool` for `key`, or None when it is missing or expired.
+        """
+        with self._lock:
+            cache_key = (brain_id, tool, key)
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[cache_key]
+                return None
+            self._entries.move_to_end(cache_key)
+            return value
+
+    def set(
+        self, brain_id: str, tool: str, key: Hashable, value: object, epoch: int
+    ) -> None:
+        """
+        Cache a result computed after `epoch` was read; it is dropped when a write was queued or finished meanwhile.
+        """
+        with self._lock:
+            if (
+                epoch != self._epochs.get(brain_id, 0)
+                or brain_id in self._pending_sessions
+            ):
+                return
+            cache_key = (brain_id, tool, key)
+            self._entries[cache_key] = (time.monotonic() + self._ttl, value)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def _bump_epoch(self, brain_id: str) -> None:
+        self._epochs[brain_id] = self._epochs.get(brain_id, 0) + 1
+        for cache_key in [k for k in self._entries if k[0] == brain_id]:
+            del self._entries[cache_key]
+
+
+class QueryEmbeddingCache:
+    """
+    Process-local LRU of search query embeddings, keyed by the embeddings adapter and the stripped query text.
+
+    Unlike tool results, embeddings do not go stale when the graph changes, so this cache is never invalidated.
+    Failed (empty) embeddings are not cached.
+    """
+
+    def __init__(self, maxsize: int = QUERY_EMBEDDING_CACHE_MAXSIZE) -> None:
+        self._maxsize = maxsize
+        self._vectors: "OrderedDict[tuple, object]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def embed(self, embeddings_adapter, queries: List[str]) -> List[object]:
+        """
+        Return one vector per query, in order, embedding only the cache misses in one `embed_texts` batch.
+        """
+        keys = [(id(embeddings_adapter), query.strip()) for query in queries]
+        vectors: Dict[tuple, object] = {}
+        with self._lock:
+            for key in keys:
+                vector = self._vectors.get(key)
+                if vector is not None:
+                    self._vectors.move_to_end(key)
+                    vectors[key] = vector
+
+        missing = [key for key in dict.fromkeys(keys) if key not in vectors]
+        if missing:
+            embedded = embeddings_adapter.embed_texts([text for _, text in missing])
+            with self._lock:
+                for key, vector in zip(missing, embedded):
+                    vectors[key] = vector
+                    if vector.embeddings:
+                        self._vectors[key] = vector
+                while len(self._vectors) > self._maxsize:
+                    self._vectors.popitem(last=False)
+        return [vectors[key] for key in keys]
+
+
+janitor_tool_cache = ToolResultCache(enabled=config.janitor_tool_cache_enabled)
+add_graph_write_listener(janitor_tool_cache.graph_written)
+query_embedding_cache = QueryEmbeddingCache()
@@ -11,12 +11,25 @@ Modified By: the developer formerly known as Christian Nonis at <alch.infoemail@
 import uuid
 from typing import Optional
 from langchain.tools import BaseTool
+from pydantic import Field
 
 from src.adapters.graph import GraphAdapter
 from src.constants.kg import Node
 from src.services.api.constants.tool_schemas import NODE_SCHEMA
 
 
+_ARGS_SCHEMA: dict = {
+    "type": "object",
+    "properties": {
+        "nodes": {
+            "type": "array",
+            "items": NODE_SCHEMA,
+        },
+    },
+    "required": ["nodes"],
+}
+
+
 class KGAgentAddNodesTool(BaseTool):
     """
     Tool for adding nodes to the knowledge graph.
@@ -29,16 +42,7 @@ class KGAgentAddNodesTool(BaseTool):
     identification_params: Optional[dict] = None
     metadata: Optional[dict] = None
 
-    args_schema: dict = {
-        "type": "object",
-        "properties": {
-            "nodes": {
-                "type": "array",
-                "items": NODE_SCHEMA,
-            },
-        },
-        "required": ["nodes"],
-    }
+    args_schema: dict = Field(default_factory=lambda: _ARGS_SCHEMA)
 
     def __init__(
         self,
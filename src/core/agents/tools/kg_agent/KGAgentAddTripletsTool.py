@@ -8,9 +8,10 @@ Modified By: the developer formerly known as Christian Nonis at <alch.infoemail@
 -----
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from uuid import uuid4
 from langchain.tools import BaseTool
+from pydantic import Field
 
 from src.adapters.graph import GraphAdapter
 from src.adapters.embeddings import EmbeddingsAdapter, VectorStoreAdapter
@@ -23,12 +24,25 @@ from src.constants.data import (
     KGChangesType,
     PartialPredicate,
 )
+from src.constants.embeddings import Vector
 from src.constants.kg import Node, Predicate, Triple
 from src.services.api.constants.tool_schemas import TRIPLE_SCHEMA
 from src.services.data.main import data_adapter
 from src.utils.nlp.names import most_similar_name_with_labels_or_none
 
 
+_ARGS_SCHEMA: dict = {
+    "type": "object",
+    "properties": {
+        "triplets": {
+            "type": "array",
+            "description": ("The triplets to add to the knowledge graph."),
+            "items": TRIPLE_SCHEMA,
+        },
+    },
+}
+
+
 class KGAgentAddTripletsTool(BaseTool):
     """
     Tool for adding triplets to the knowledge graph.
@@ -43,16 +57,7 @@ class KGAgentAddTripletsTool(BaseTool):
     metadata: Optional[dict] = None
     brain_id: str = "default"
 
-    args_schema: dict = {
-        "type": "object",
-        "properties": {
-            "triplets": {
-                "type": "array",
-                "description": ("The triplets to add to the knowledge graph."),
-                "items": TRIPLE_SCHEMA,
-            },
-        },
-    }
+    args_schema: dict = Field(default_factory=lambda: _ARGS_SCHEMA)
 
     def __init__(
         self,
@@ -79,8 +84,61 @@ class KGAgentAddTripletsTool(BaseTool):
             brain_id=brain_id or "default",
         )
 
+    def _resolve_node(
+        self,
+        node: Node,
+        vector: Vector,
+        hits: List[Vector],
+        resolved_nodes: Dict[Tuple[str, Tuple[str, ...]], Node],
+    ) -> Node:
+        """
+        Return the stored node that `node` matches among its similarity `hits`, or register `node` in the vector store
+        as a new one. Results are memoized in `resolved_nodes` by name and labels for the rest of the call.
+        """
+        key = (node.name, tuple(node.labels))
+        if key in resolved_nodes:
+            return resolved_nodes[key]
+
+        sim_name = most_similar_name_with_labels_or_none(
+            node.name,
+            [v.metadata.get("name", []) for v in hits],
+            node.labels,
+            [v.metadata.get("labels", []) for v in hits],
+        )
+        if sim_name:
+            sim_vector = next(
+                (v for v in hits if v.metadata.get("name", []) == sim_name),
+                None,
+            )
+            node = Node(
+                name=sim_vector.metadata.get("name", []),
+                uuid=sim_vector.metadata.get("uuid"),
+                labels=sim_vector.metadata.get("labels", []),
+            )
+            # TODO: update changelog to record any eventual merge if sim_name is not the same as node.name
+        else:
+            node.uuid = str(uuid4())
+            self.vector_store.add_vectors(
+                [
+                    Vector(
+                        id=str(uuid4()),
+                        embeddings=vector.embeddings,
+                        metadata={
+                            "name": node.name,
+                            "labels": node.labels,
+                            "uuid": node.uuid,
+                        },
+                    )
+                ],
+                store="nodes",
+                brain_id=self.brain_id,
+            )
+
+        resolved_nodes[key] = node
+        return node
+
     def _run(self, *args, **kwargs) -> str:
-        triplets: List[Triple] = []
+        parsed_triplets: List[Tuple[Node, Node, Predicate]] = []
         for triplet_data in kwargs.get("triplets", []):
             try:
                 subject = Node(**triplet_data["subject"])
@@ -88,107 +146,97 @@ class KGAgentAddTripletsTool(BaseTool):
             except Exception as e:
                 print(f"Error creating nodes: {e} -  {triplet_data}")
                 continue
+            predicate = Predicate(
+                name=triplet_data["predicate"]["name"].replace(" ", "_").upper(),
+                description=triplet_data["predicate"]["description"],
+            )
+            parsed_triplets.append((subject, object_node, predicate))
 
-            v_sub = self.embeddings.embed_text(subject.name)
-            v_obj = self.embeddings.embed_text(object_node.name)
+        if not parsed_triplets:
+            return "Triplets added successfully: []"
 
-            v_sim_sub = self.vector_store.search_vectors(
-                v_sub.embeddings,
-                store="nodes",
-                brain_id=self.brain_id,
-                k=5,
+        # One embeddings round trip and one vector search round trip for the whole call. A name repeated across
+        # triplets is embedded and searched once, and a node resolved earlier in the call is reused, so an entity
+        # that several triplets mention is only created once.
+        names = list(
+            dict.fromkeys(
+                node.name
+                for subject, object_node, _ in parsed_triplets
+                for node in (subject, object_node)
             )
-            v_sim_obj = self.vector_store.search_vectors(
-                v_obj.embeddings,
-                store="nodes",
-                brain_id=self.brain_id,
-                k=5,
+        )
+        vectors = self.embeddings.embed_texts(
+            names + [predicate.description for _, _, predicate in parsed_triplets]
+        )
+        name_vectors = dict(zip(names, vectors[: len(names)]))
+        predicate_vectors = vectors[len(names) :]
+        name_hits = dict(
+            zip(
+                names,
+                self.vector_store.search_vectors_batch(
+                    [name_vectors[name].embeddings for name in names],
+                    store="nodes",
+                    brain_id=self.brain_id,
+                    k=5,
+                ),
             )
+        )
 
-            sim_sub = most_similar_name_with_labels_or_none(
-                subject.name,
-                [v.metadata.get("name", []) for v in v_sim_sub],
-                subject.labels,
-                [v.metadata.get("labels", []) for v in v_sim_sub],
+        resolved_nodes: Dict[Tuple[str, Tuple[str, ...]], Node] = {}
+        triplets: List[Triple] = []
+        for subject, object_node, predicate in parsed_triplets:
+            subject = self._resolve_node(
+                subject,
+                name_vectors[subject.name],
+                name_hits[subject.name],
+                resolved_nodes,
             )
-            sim_obj = most_similar_name_with_labels_or_none(
-                object_node.name,
-                [v.metadata.get("name", []) for v in v_sim_obj],
-                object_node.labels,
-                [v.metadata.get("labels", []) for v in v_sim_obj],
-            )
-            if sim_sub:
-                sim_sub_vector = next(
-                    (v for v in v_sim_sub if v.metadata.get("name", []) == sim_sub),
-                    None,
-                )
-                subject = Node(
-                    name=sim_sub_vector.metadata.get("name", []),
-                    uuid=sim_sub_vector.metadata.get("uuid"),
-                    labels=sim_sub_vector.metadata.get("labels", []),
-                )
-                # TODO: update changelog to record any eventual merge if sim_sub is not the same as subject.name
-            else:
-                v_sub.metadata = {
-                    "name": subject.name,
-                    "labels": subject.labels,
-                    "uuid": str(uuid4()),
-                }
-                vector = self.vector_store.add_vectors(
-                    [v_sub], store="nodes", brain_id=self.brain_id
-                )
-                subject.uuid = v_sub.metadata.get("uuid")
-
-            if sim_obj:
-                sim_obj_vector = next(
-                    (v for v in v_sim_obj if v.metadata.get("name", []) == sim_obj),
-                    None,
-                )
-
-                object_node = Node(
-                    name=sim_obj_vector.metadata.get("name", []),
-                    uuid=sim_obj_vector.metadata.get("uuid"),
-                    labels=sim_obj_vector.metadata.get("labels", []),
-                )
-                # TODO: update changelog to record any eventual merge if sim_obj is not the same as object_node.name
-            else:
-                v_obj.metadata = {
-                    "name": object_node.name,
-                    "labels": object_node.labels,
-                    "uuid": str(uuid4()),
-                }
-                vector = self.vector_store.add_vectors(
-                    [v_obj], store="nodes", brain_id=self.brain_id
-                )
-                object_node.uuid = v_obj.metadata.get("uuid")
-
-            predicate = Predicate(
-                name=triplet_data["predicate"]["name"].replace(" ", "_").upper(),
-                description=triplet_data["predicate"]["description"],
+            object_node = self._resolve_node(
+                object_node,
+                name_vectors[object_node.name],
+                name_hits[object_node.name],
+                resolved_nodes,
             )
 
             triplet = Triple(subject=subject, predicate=predicate, object=object_node)
             triplets.append(triplet)
 
-        for triplet in triplets:
-            vector = self.embeddings.embed_text(triplet.predicate.description)
+        # The triplet vectors, the nodes and the relationships are each written with one bulk call for the whole
+        # batch rather than one round trip per triplet. Nodes go first, since relationships are matched by node name.
+        for triplet, vector in zip(triplets, predicate_vectors):
             vector.metadata = {
                 **(self.metadata or {}),
                 "node_ids": [triplet.subject.uuid, triplet.object.uuid],
                 "predicate": triplet.predicate.name,
             }
-            self.vector_store.add_vectors([vector], "triplets", brain_id=self.brain_id)
+        self.vector_store.add_vectors(
+            list(predicate_vectors), "triplets", brain_id=self.brain_id
+        )
+        self.kg.add_nodes(
+            list(
+                {
+                    node.uuid: node
+                    for triplet in triplets
+                    for node in (triplet.subject, triplet.object)
+                }.values()
+            ),
+            brain_id=self.brain_id,
+            metadata=self.metadata,
+        )
+        self.kg.add_relationships(
+            [
+                (triplet.subject, triplet.predicate, triplet.object)
+                for triplet in triplets
+            ],
+            brain_id=self.brain_id,
+        )
 
-            self.kg.add_nodes(
-                [triplet.subject, triplet.object],
-                brain_id=self.brain_id,
-                metadata=self.metadata,
-            )
+        for triplet in triplets:
             sub_kg_changelog = KGChanges(
                 type=KGChangesType.NODE_PROPERTIES_UPDATED,
                 change=KGChangeLogNodePropertiesUpdated(
                     node=PartialNode(
-                        **triplet.subject.model_dump(mode="json"),
+                        **triplet.subject.model_dump(),
                     ),
                     properties=[
                         KGChangeLogPredicateUpdatedProperty(
@@ -204,7 +252,7 @@ class KGAgentAddTripletsTool(BaseTool):
                 type=KGChangesType.NODE_PROPERTIES_UPDATED,
                 change=KGChangeLogNodePropertiesUpdated(
                     node=PartialNode(
-                        **triplet.object.model_dump(mode="json"),
+                        **triplet.object.model_dump(),
                     ),
                     properties=[
                         KGChangeLogPredicateUpdatedProperty(
@@ -218,18 +266,12 @@ class KGAgentAddTripletsTool(BaseTool):
             )
             data_adapter.save_kg_changes(sub_kg_changelog, brain_id=self.brain_id)
             data_adapter.save_kg_changes(obj_kg_changelog, brain_id=self.brain_id)
-            self.kg.add_relationship(
-                triplet.subject,
-                triplet.predicate,
-                triplet.object,
-                brain_id=self.brain_id,
-            )
             kg_changes = KGChanges(
                 type=KGChangesType.RELATIONSHIP_CREATED,
                 change=KGChangeLogRelationshipCreated(
                     type=KGChangesType.RELATIONSHIP_CREATED,
                     subject=PartialNode(
-                        **triplet.subject.model_dump(mode="json"),
+                        **triplet.subject.model_dump(),
                     ),
                     predicate=PartialPredicate(
                         uuid=triplet.predicate.uuid,
@@ -237,7 +279,7 @@ class KGAgentAddTripletsTool(BaseTool):
                         description=triplet.predicate.description,
                     ),
                     object=PartialNode(
-                        **triplet.object.model_dump(mode="json"),
+                        **triplet.object.model_dump(),
                     ),
                 ),
             )
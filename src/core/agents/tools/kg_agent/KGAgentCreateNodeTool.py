@@ -10,12 +10,47 @@ Modified By: Christian Nonis <alch.infoemail@gmail.com>
 """
 
 from langchain.tools import BaseTool
+from pydantic import Field
 
 from src.adapters.embeddings import EmbeddingsAdapter, VectorStoreAdapter
 from src.adapters.graph import GraphAdapter
 from src.constants.kg import Node
 
 
+_ARGS_SCHEMA: dict = {
+    "type": "object",
+    "properties": {
+        "node": {
+            "type": "object",
+            "properties": {
+                "name": {
+                    "type": "string",
+                    "description": "The name of the tail node.",
+                },
+                "labels": {
+                    "type": "array",
+                    "description": "The labels of the tail node.",
+                    "items": {
+                        "type": "string",
+                    },
+                },
+                "description": {
+                    "type": "string",
+                    "description": "The description of the tail node.",
+                },
+                "polarity": {
+                    "type": "string",
+                    "description": "The polarity of the node, describing if the node rapresents a good thing or bad.",
+                    "enum": ["positive", "negative", "neutral"],
+                },
+            },
+            "required": ["name", "labels"],
+        },
+    },
+    "required": ["node"],
+}
+
+
 class KGAgentCreateNodeTool(BaseTool):
     """
     Tool for creating a node in the knowledge graph.
@@ -29,38 +64,7 @@ class KGAgentCreateNodeTool(BaseTool):
     vector_store_adapter: VectorStoreAdapter
     brain_id: str = "default"
 
-    args_schema: dict = {
-        "type": "object",
-        "properties": {
-            "node": {
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "The name of the tail node.",
-                    },
-                    "labels": {
-                        "type": "array",
-                        "description": "The labels of the tail node.",
-                        "items": {
-                            "type": "string",
-                        },
-                    },
-                    "description": {
-                        "type": "string",
-                        "description": "The description of the tail node.",
-                    },
-                    "polarity": {
-                        "type": "string",
-                        "description": "The polarity of the node, describing if the node rapresents a good thing or bad.",
-                        "enum": ["positive", "negative", "neutral"],
-                    },
-                },
-                "required": ["name", "labels"],
-            },
-        },
-        "required": ["node"],
-    }
+    args_schema: dict = Field(default_factory=lambda: _ARGS_SCHEMA)
 
     def __init__(
         self,
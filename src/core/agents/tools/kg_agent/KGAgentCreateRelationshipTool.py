@@ -11,12 +11,91 @@ Modified By: Christian Nonis <alch.infoemail@gmail.com>
 
 import uuid
 from langchain.tools import BaseTool
+from pydantic import Field
 
 from src.adapters.embeddings import EmbeddingsAdapter, VectorStoreAdapter
 from src.adapters.graph import GraphAdapter
 from src.constants.kg import Node, Predicate
 
 
+_ARGS_SCHEMA: dict = {
+    "type": "object",
+    "properties": {
+        "tail": {
+            "type": "object",
+            "properties": {
+                "name": {
+                    "type": "string",
+                    "description": "The name of the tail node.",
+                },
+                "labels": {
+                    "type": "array",
+                    "description": "The labels of the tail node.",
+                    "items": {
+                        "type": "string",
+                    },
+                },
+                "description": {
+                    "type": "string",
+                    "description": "The description of the tail node.",
+                },
+                "polarity": {
+                    "type": "string",
+                    "description": "The polarity of the node, describing if the node rapresents a good thing or bad.",
+                    "enum": ["positive", "negative", "neutral"],
+                },
+            },
+            "required": ["name", "labels"],
+        },
+        "predicate": {
+            "type": "object",
+            "properties": {
+                "name": {
+                    "type": "string",
+                    "description": "The name of the predicate.",
+                },
+                "description": {
+                    "type": "string",
+                    "description": "The description of the predicate.",
+                },
+                "amount": {
+                    "type": "number",
+                    "description": "The amount of the predicate.",
+                },
+            },
+            "required": ["name", "description"],
+        },
+        "head": {
+            "type": "object",
+            "properties": {
+                "name": {
+                    "type": "string",
+                    "description": "The name of the tail node.",
+                },
+                "labels": {
+                    "type": "array",
+                    "description": "The labels of the tail node.",
+                    "items": {
+                        "type": "string",
+                    },
+                },
+                "description": {
+                    "type": "string",
+                    "description": "The description of the tail node.",
+                },
+                "polarity": {
+                    "type": "string",
+                    "description": "The polarity of the node, describing if the node rapresents a good thing or bad.",
+                    "enum": ["positive", "negative", "neutral"],
+                },
+            },
+            "required": ["name", "labels"],
+        },
+    },
+    "required": ["tail", "predicate", "head"],
+}
+
+
 class KGAgentCreateRelationshipTool(BaseTool):
     """
     Tool for creating a relationship in the knowledge graph.
@@ -30,82 +109,7 @@ class KGAgentCreateRelationshipTool(BaseTool):
     embeddings_adapter: EmbeddingsAdapter
     vector_store_adapter: VectorStoreAdapter
 
-    args_schema: dict = {
-        "type": "object",
-        "properties": {
-            "tail": {
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "The name of the tail node.",
-                    },
-                    "labels": {
-                        "type": "array",
-                        "description": "The labels of the tail node.",
-                        "items": {
-                            "type": "string",
-                        },
-                    },
-                    "description": {
-                        "type": "string",
-                        "description": "The description of the tail node.",
-                    },
-                    "polarity": {
-                        "type": "string",
-                        "description": "The polarity of the node, describing if the node rapresents a good thing or bad.",
-                        "enum": ["positive", "negative", "neutral"],
-                    },
-                },
-                "required": ["name", "labels"],
-            },
-            "predicate": {
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "The name of the predicate.",
-                    },
-                    "description": {
-                        "type": "string",
-                        "description": "The description of the predicate.",
-                    },
-                    "amount": {
-                        "type": "number",
-                        "description": "The amount of the predicate.",
-                    },
-                },
-                "required": ["name", "description"],
-            },
-            "head": {
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "The name of the tail node.",
-                    },
-                    "labels": {
-                        "type": "array",
-                        "description": "The labels of the tail node.",
-                        "items": {
-                            "type": "string",
-                        },
-                    },
-                    "description": {
-                        "type": "string",
-                        "description": "The description of the tail node.",
-                    },
-                    "polarity": {
-                        "type": "string",
-                        "description": "The polarity of the node, describing if the node rapresents a good thing or bad.",
-                        "enum": ["positive", "negative", "neutral"],
-                    },
-                },
-                "required": ["name", "labels"],
-            },
-        },
-        "required": ["tail", "predicate", "head"],
-    }
+    args_schema: dict = Field(default_factory=lambda: _ARGS_SCHEMA)
 
     def __init__(
         self,
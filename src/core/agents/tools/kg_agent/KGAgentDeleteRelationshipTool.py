@@ -11,6 +11,7 @@ Modified By: the developer formerly known as Christian Nonis at <alch.infoemail@
 from typing import List, Optional, Tuple
 from uuid import uuid4
 from langchain.tools import BaseTool
+from pydantic import Field
 
 from src.adapters.graph import GraphAdapter
 from src.adapters.embeddings import EmbeddingsAdapter, VectorStoreAdapter
@@ -23,67 +24,70 @@ from src.constants.kg import Node, Predicate
 from src.services.data.main import data_adapter
 
 
-class KGAgentDeleteRelationshipTool(BaseTool):
-    """
-    Tool for deleting a relationship from the knowledge graph.
-    """
-
-    name: str = "kg_agent_delete_relationship"
-    kg_agent: object
-    kg: GraphAdapter
-    vector_store: VectorStoreAdapter
-    brain_id: str = "default"
-
-    args_schema: dict = {
-        "type": "object",
-        "properties": {
-            "subject": {
-                "type": "object",
-                "properties": {
-                    "labels": {
-                        "type": "array",
-                        "description": ("The labels of the subject node."),
-                        "items": {
-                            "type": "string",
-                        },
-                    },
-                    "name": {
+_ARGS_SCHEMA: dict = {
+    "type": "object",
+    "properties": {
+        "subject": {
+            "type": "object",
+            "properties": {
+                "labels": {
+                    "type": "array",
+                    "description": ("The labels of the subject node."),
+                    "items": {
                         "type": "string",
-                        "description": ("The name of the subject node."),
                     },
                 },
-                "required": ["labels", "name"],
+                "name": {
+                    "type": "string",
+                    "description": ("The name of the subject node."),
+                },
             },
-            "predicate": {
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": ("The name of the predicate."),
-                    },
+            "required": ["labels", "name"],
+        },
+        "predicate": {
+            "type": "object",
+            "properties": {
+                "name": {
+                    "type": "string",
+                    "description": ("The name of the predicate."),
                 },
-                "required": ["name"],
             },
-            "object": {
-                "type": "object",
-                "properties": {
-                    "labels": {
-                        "type": "array",
-                        "description": ("The labels of the object node."),
-                        "items": {
-                            "type": "string",
-                        },
-                    },
-                    "name": {
+            "required": ["name"],
+        },
+        "object": {
+            "type": "object",
+            "properties": {
+                "labels": {
+                    "type": "array",
+                    "description": ("The labels of the object node."),
+                    "items": {
                         "type": "string",
-                        "description": ("The name of the object node."),
                     },
                 },
-                "required": ["labels", "name"],
+                "name": {
+                    "type": "string",
+                    "description": ("The name of the object node."),
+                },
             },
+            "required": ["labels", "name"],
         },
-        "required": ["subject", "predicate", "object"],
-    }
+    },
+    "required": ["subject", "predicate", "object"],
+}
+
+
+class KGAgentDeleteRelationshipTool(BaseTool):
+    """
+    Tool for deleting a relationship from the knowledge graph.
+    """
+
+    name: str = "kg_agent_delete_relationship"
+    kg_agent: object
+    kg: GraphAdapter
+    vector_store: VectorStoreAdapter
+    brain_id: str = "default"
+
+    args_schema: dict = Field(default_factory=lambda: _ARGS_SCHEMA)
 
     def __init__(
         self,
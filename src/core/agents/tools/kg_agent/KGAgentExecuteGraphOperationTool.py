@@ -9,10 +9,13 @@ Modified By: Christian Nonis <alch.infoemail@gmail.com>
 """
 
 import json
+import logging
 from langchain.tools import BaseTool
 
 from src.adapters.graph import GraphAdapter
 
+logger = logging.getLogger(__name__)
+
 
 class KGAgentExecuteGraphOperationTool(BaseTool):
     """
@@ -103,24 +106,17 @@ class KGAgentExecuteGraphOperationTool(BaseTool):
 
         _query = _query or ""
 
-        print(
-            f"[DEBUG (kg_agent_execute_graph_operation)]: kwargs: {kwargs} args: {args}"
-        )
+        logger.debug("[%s] kwargs: %s args: %s", self.name, kwargs, args)
 
         if not _query:
             return "No query provided in the arguments or kwargs"
 
-        print(
-            "[DEBUG (kg_agent_execute_graph_operation)]: Executing query: ",
-            _query,
-        )
+        logger.debug("[%s] Executing query: %s", self.name, _query)
 
         try:
             response = self.kg.execute_operation(_query, brain_id=self.brain_id)
         except Exception as e:
-            print(
-                f"[DEBUG (kg_agent_execute_graph_operation)]: Error executing query: {e}"
-            )
+            logger.debug("[%s] Error executing query: %s", self.name, e)
             return f"Error executing query: {e}"
 
         return response
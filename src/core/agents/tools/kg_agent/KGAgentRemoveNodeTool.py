@@ -9,11 +9,27 @@ Modified By: Christian Nonis <alch.infoemail@gmail.com>
 -----
 """
 
+import logging
+
 from langchain.tools import BaseTool
+from pydantic import Field
 
 from src.adapters.embeddings import VectorStoreAdapter
 from src.adapters.graph import GraphAdapter
 
+logger = logging.getLogger(__name__)
+
+
+_ARGS_SCHEMA: dict = {
+    "type": "object",
+    "properties": {
+        "uuid": {
+            "type": "string",
+            "description": "The UUID of the node to remove.",
+        },
+    },
+}
+
 
 class KGAgentRemoveNodeTool(BaseTool):
     """
@@ -27,15 +43,7 @@ class KGAgentRemoveNodeTool(BaseTool):
     vector_store: VectorStoreAdapter
     brain_id: str = "default"
 
-    args_schema: dict = {
-        "type": "object",
-        "properties": {
-            "uuid": {
-                "type": "string",
-                "description": "The UUID of the node to remove.",
-            },
-        },
-    }
+    args_schema: dict = Field(default_factory=lambda: _ARGS_SCHEMA)
 
     def __init__(
         self,
@@ -95,12 +103,12 @@ class KGAgentRemoveNodeTool(BaseTool):
                 elif isinstance(first_arg, dict):
                     _uuid = first_arg.get("uuid", "")
 
-        print(f"[DEBUG (kg_agent_remove_node)]: kwargs: {kwargs} args: {args}")
+        logger.debug("[%s] kwargs: %s args: %s", self.name, kwargs, args)
 
         if len(_query) == 0:
             return "No UUID provided in the arguments or kwargs"
 
-        print(f"[DEBUG (kg_agent_remove_node)]: Removing node: {_uuid}")
+        logger.debug("[%s] Removing node: %s", self.name, _uuid)
         removed_nodes = self.kg.remove_nodes(uuids=[_uuid], brain_id=self.brain_id)
 
         if len(removed_nodes) > 0:
@@ -9,12 +9,75 @@ Modified By: Christian Nonis <alch.infoemail@gmail.com>
 -----
 """
 
+import logging
+
 from langchain.tools import BaseTool
+from pydantic import Field
 
 from src.adapters.embeddings import VectorStoreAdapter
 from src.adapters.graph import GraphAdapter
 from src.constants.kg import NodeDict, PredicateDict
 
+logger = logging.getLogger(__name__)
+
+
+_ARGS_SCHEMA: dict = {
+    "type": "object",
+    "properties": {
+        "relationship": {
+            "type": "string",
+            "description": "The UUID of the relationship to remove.",
+        },
+        "tail": {
+            "type": "object",
+            "properties": {
+                "uuid": {
+                    "type": "string",
+                    "description": "The UUID of the tail node.",
+                },
+                "name": {
+                    "type": "string",
+                    "description": "The name of the tail node.",
+                },
+                "labels": {
+                    "type": "array",
+                    "description": "The labels of the tail node.",
+                    "items": {
+                        "type": "string",
+                    },
+                },
+            },
+            "description": "The tail node of the relationship to remove. Can contain the UUID of the tail node, OR the name AND labels of the tail node.",
+        },
+        "head": {
+            "type": "object",
+            "properties": {
+                "uuid": {
+                    "type": "string",
+                    "description": "The UUID of the head node.",
+                },
+                "name": {
+                    "type": "string",
+                    "description": "The name of the head node.",
+                },
+                "labels": {
+                    "type": "array",
+                    "description": "The labels of the head node.",
+                    "items": {
+                        "type": "string",
+                    },
+                },
+            },
+            "description": "The head node of the relationship to remove. Can contain the UUID of the head node, OR the name AND labels of the head node.",
+        },
+        "relationship_name": {
+            "type": "string",
+            "description": "The name of the relationship to remove to be provided along with the tail and head nodes.",
+        },
+    },
+    "description": "The relationship to remove. Can contain the UUID of the relationship, OR the tail and head nodes and the relationship name.",
+}
+
 
 class KGAgentRemoveRelationshipTool(BaseTool):
     """
@@ -28,62 +91,7 @@ class KGAgentRemoveRelationshipTool(BaseTool):
     vector_store: VectorStoreAdapter
     brain_id: str = "default"
 
-    args_schema: dict = {
-        "type": "object",
-        "properties": {
-            "relationship": {
-                "type": "string",
-                "description": "The UUID of the relationship to remove.",
-            },
-            "tail": {
-                "type": "object",
-                "properties": {
-                    "uuid": {
-                        "type": "string",
-                        "description": "The UUID of the tail node.",
-                    },
-                    "name": {
-                        "type": "string",
-                        "description": "The name of the tail node.",
-                    },
-                    "labels": {
-                        "type": "array",
-                        "description": "The labels of the tail node.",
-                        "items": {
-                            "type": "string",
-                        },
-                    },
-                },
-                "description": "The tail node of the relationship to remove. Can contain the UUID of the tail node, OR the name AND labels of the tail node.",
-            },
-            "head": {
-                "type": "object",
-                "properties": {
-                    "uuid": {
-                        "type": "string",
-                        "description": "The UUID of the head node.",
-                    },
-                    "name": {
-                        "type": "string",
-                        "description": "The name of the head node.",
-                    },
-                    "labels": {
-                        "type": "array",
-                        "description": "The labels of the head node.",
-                        "items": {
-                            "type": "string",
-                        },
-                    },
-                },
-                "description": "The head node of the relationship to remove. Can contain the UUID of the head node, OR the name AND labels of the head node.",
-            },
-            "relationship_name": {
-                "type": "string",
-                "description": "The name of the relationship to remove to be provided along with the tail and head nodes.",
-            },
-        },
-        "description": "The relationship to remove. Can contain the UUID of the relationship, OR the tail and head nodes and the relationship name.",
-    }
+    args_schema: dict = Field(default_factory=lambda: _ARGS_SCHEMA)
 
     def __init__(
         self,
@@ -124,7 +132,7 @@ class KGAgentRemoveRelationshipTool(BaseTool):
         _tail: NodeDict = None
         _head: NodeDict = None
         _relationship_name: str = None
-        print(f"[DEBUG (kg_agent_remove_relationship)]: kwargs: {kwargs} args: {args}")
+        logger.debug("[%s] kwargs: %s args: %s", self.name, kwargs, args)
         if len(kwargs) > 0:
             args_uuid = kwargs.get("args", {})
             if isinstance(args_uuid, dict):
@@ -146,8 +154,13 @@ class KGAgentRemoveRelationshipTool(BaseTool):
                     if "relationship_name" in first_arg:
                         _relationship_name = first_arg.get("relationship_name", "")
 
-        print(
-            f"[DEBUG (kg_agent_remove_relationship)]: Removing relationship: {_rel_uuid} - {_tail} - {_head} - {_relationship_name}"
+        logger.debug(
+            "[%s] Removing relationship: %s - %s - %s - %s",
+            self.name,
+            _rel_uuid,
+            _tail,
+            _head,
+            _relationship_name,
         )
         if _relationship_name:
             if not _tail or not _head:
@@ -186,9 +199,7 @@ class KGAgentRemoveRelationshipTool(BaseTool):
                 brain_id=self.brain_id,
             )
         except Exception as e:
-            print(
-                f"[DEBUG (kg_agent_remove_relationship)]: Error removing relationship: {e}"
-            )
+            logger.debug("[%s] Error removing relationship: %s", self.name, e)
             return f"Error removing relationship: {e}"
 
         if len(removed_relationships) > 0:
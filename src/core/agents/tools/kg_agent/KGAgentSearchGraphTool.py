@@ -11,6 +11,7 @@ Modified By: the developer formerly known as Christian Nonis at <alch.infoemail@
 import json
 from typing import Optional
 from langchain.tools import BaseTool
+from pydantic import Field
 
 from src.adapters.graph import GraphAdapter
 from src.adapters.embeddings import EmbeddingsAdapter, VectorStoreAdapter
@@ -18,6 +19,48 @@ from src.constants.embeddings import Vector
 from src.constants.kg import Node
 
 
+_ARGS_SCHEMA: dict = {
+    "type": "object",
+    "properties": {
+        "query": {
+            "type": "string",
+            "description": (
+                "Add this parameter if you want to search textually into the knowledge graph. "
+                "This will perform hybrid search combining semantic and textual search."
+            ),
+        },
+        "nodes": {
+            "type": "array",
+            "description": (
+                "Add this parameter if you want to search for specific nodes "
+                "in the knowledge graph by their name and label."
+            ),
+            "items": {
+                "type": "object",
+                "properties": {
+                    "labels": {
+                        "type": "array",
+                        "items": {
+                            "type": "string",
+                            "description": (
+                                "The category of the node to search for. "
+                                "(eg: Person, Organization, "
+                                "Location, Product, Service, Event, etc.)"
+                            ),
+                        },
+                    },
+                    "name": {
+                        "type": "string",
+                        "description": "The name of the node to search for.",
+                    },
+                },
+                "required": ["labels", "name"],
+            },
+        },
+    },
+}
+
+
 class KGAgentSearchGraphTool(BaseTool):
     """
     Tool for searching the knowledge graph.
@@ -32,46 +75,7 @@ class KGAgentSearchGraphTool(BaseTool):
     metadata: Optional[dict] = None
     brain_id: str = "default"
 
-    args_schema: dict = {
-        "type": "object",
-        "properties": {
-            "query": {
-                "type": "string",
-                "description": (
-                    "Add this parameter if you want to search textually into the knowledge graph. "
-                    "This will perform hybrid search combining semantic and textual search."
-                ),
-            },
-            "nodes": {
-                "type": "array",
-                "description": (
-                    "Add this parameter if you want to search for specific nodes "
-                    "in the knowledge graph by their name and label."
-                ),
-                "items": {
-                    "type": "object",
-                    "properties": {
-                        "labels": {
-                            "type": "array",
-                            "items": {
-                                "type": "string",
-                                "description": (
-                                    "The category of the node to search for. "
-                                    "(eg: Person, Organization, "
-                                    "Location, Product, Service, Event, etc.)"
-                                ),
-                            },
-                        },
-                        "name": {
-                            "type": "string",
-                            "description": "The name of the node to search for.",
-                        },
-                    },
-                    "required": ["labels", "name"],
-                },
-            },
-        },
-    }
+    args_schema: dict = Field(default_factory=lambda: _ARGS_SCHEMA)
 
     def __init__(
         self,
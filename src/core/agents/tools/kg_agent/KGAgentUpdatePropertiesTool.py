@@ -9,10 +9,53 @@ Modified By: the developer formerly known as Christian Nonis at <alch.infoemail@
 """
 
 from langchain.tools import BaseTool
+from pydantic import Field
 
 from src.adapters.graph import GraphAdapter
 
 
+_ARGS_SCHEMA: dict = {
+    "type": "object",
+    "properties": {
+        "updating": {
+            "type": "string",
+            "description": ("What to update, a relationship or a node"),
+            "enum": ["relationship", "node"],
+        },
+        "uuid": {
+            "type": "string",
+            "description": ("The UUID of the node or relationship to update."),
+        },
+        "new_properties": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "property": {
+                        "type": "string",
+                        "description": ("The property to update."),
+                    },
+                    "value": {
+                        "type": "string",
+                        "description": ("The new value of the property."),
+                    },
+                },
+            },
+            "description": ("The new properties to update."),
+        },
+        "properties_to_remove": {
+            "type": "array",
+            "items": {
+                "type": "string",
+                "description": ("The properties to remove."),
+            },
+            "description": ("The properties to remove."),
+        },
+    },
+    "required": ["updating", "uuid", "properties"],
+}
+
+
 class KGAgentUpdatePropertiesTool(BaseTool):
     """
     Tool for updating the properties of a node or relationship in the knowledge graph.
@@ -23,46 +66,7 @@ class KGAgentUpdatePropertiesTool(BaseTool):
     kg: GraphAdapter
     brain_id: str = "default"
 
-    args_schema: dict = {
-        "type": "object",
-        "properties": {
-            "updating": {
-                "type": "string",
-                "description": ("What to update, a relationship or a node"),
-                "enum": ["relationship", "node"],
-            },
-            "uuid": {
-                "type": "string",
-                "description": ("The UUID of the node or relationship to update."),
-            },
-            "new_properties": {
-                "type": "array",
-                "items": {
-                    "type": "object",
-                    "properties": {
-                        "property": {
-                            "type": "string",
-                            "description": ("The property to update."),
-                        },
-                        "value": {
-                            "type": "string",
-                            "description": ("The new value of the property."),
-                        },
-                    },
-                },
-                "description": ("The new properties to update."),
-            },
-            "properties_to_remove": {
-                "type": "array",
-                "items": {
-                    "type": "string",
-                    "description": ("The properties to remove."),
-                },
-                "description": ("The properties to remove."),
-            },
-        },
-        "required": ["updating", "uuid", "properties"],
-    }
+    args_schema: dict = Field(default_factory=lambda: _ARGS_SCHEMA)
 
     def __init__(
         self,
@@ -9,11 +9,15 @@ Modified By: Christian Nonis <alch.infoemail@gmail.com>
 -----
 """
 
+import uuid
+from typing import Dict, List, Optional
+
 from src.adapters.embeddings import EmbeddingsAdapter
 from src.adapters.graph import GraphAdapter
 from src.adapters.embeddings import VectorStoreAdapter
 from src.core.agents.scout_agent import ScoutEntity
 from src.core.agents.architect_agent import ArchitectAgentRelationship
+from src.constants.embeddings import Vector
 
 
 class IngestionManager:
@@ -79,7 +83,38 @@ class IngestionManager:
             print("[ ! ]Node not embedded:", node_data)
         return node_data.uuid
 
-    def process_rel_vectors(self, rel_data: ArchitectAgentRelationship, brain_id):
+    @staticmethod
+    def rel_text(rel_data: ArchitectAgentRelationship) -> str:
+        """
+        The text a relationship is embedded by: its description, or its name when the description is blank.
+        """
+        return (rel_data.description or "").strip() or rel_data.name
+
+    def embed_rel_texts(
+        self, relationships: List[ArchitectAgentRelationship]
+    ) -> Dict[str, list[float]]:
+        """
+        Embed the distinct texts of `relationships` in a single batch.
+
+        Returns:
+            dict: text -> embeddings, for every text that was embedded successfully.
+        """
+        texts = list(dict.fromkeys(filter(None, map(self.rel_text, relationships))))
+        if not texts:
+            return {}
+        vectors = self.embeddings.embed_texts(texts)
+        return {
+            text: vector.embeddings
+            for text, vector in zip(texts, vectors)
+            if vector.embeddings
+        }
+
+    def process_rel_vectors(
+        self,
+        rel_data: ArchitectAgentRelationship,
+        brain_id,
+        embeddings: Optional[list[float]] = None,
+    ):
         """
         Embed a relationship's description and store the resulting vector in the relationships vector store.
         
@@ -88,6 +123,7 @@ class IngestionManager:
         Parameters:
             rel_data (ArchitectAgentRelationship): Relationship object whose description will be embedded.
             brain_id: Identifier for the brain/context to use when storing the vector.
+            embeddings (list[float], optional): Precomputed embeddings of the relationship text (see `embed_rel_texts`); the text is embedded here when omitted.
         
         Returns:
             tuple: (relationship UUID, vector ID string if a vector was stored, otherwise None)
@@ -102,9 +138,12 @@ class IngestionManager:
             raise TypeError(
                 f"Expected ArchitectAgentRelationship, got {type(rel_data)}"
             )
-        text_to_embed = (rel_data.description or "").strip() or rel_data.name
+        text_to_embed = self.rel_text(rel_data)
         if text_to_embed:
-            v_rel = self.embeddings.embed_text(text_to_embed)
+            if embeddings:
+                v_rel = Vector(id=str(uuid.uuid4()), embeddings=embeddings, metadata={})
+            else:
+                v_rel = self.embeddings.embed_text(text_to_embed)
             v_rel.metadata = {
                 **(self.metadata or {}),
                 "uuid": rel_data.uuid,
@@ -8,9 +8,12 @@ Modified By: Christian Nonis <alch.infoemail@gmail.com>
 -----
 """
 
+import os
+import threading
 import requests
 import base64
 import struct
+from requests.adapters import HTTPAdapter
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -24,6 +27,9 @@ from src.config import config
 from src.adapters.interfaces.embeddings import EmbeddingsClient
 
 
+EMBEDDINGS_POOL_SIZE = 32
+
+
 class EmbeddingError(Exception):
     """Custom exception for embedding failures after retries."""
 
@@ -37,6 +43,37 @@ class EmbeddingsClient(EmbeddingsClient):
 
     def __init__(self):
         self.embeddings = None
+        self._session: requests.Session | None = None
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        Keep-alive session shared by every embedding request of this process, so calls reuse pooled
+        connections instead of paying a TCP/TLS handshake each time. Rebuilt after a fork.
+        """
+        if os.getpid() != self._pid:
+            self._session = None
+            self._pid = os.getpid()
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=EMBEDDINGS_POOL_SIZE,
+                        pool_maxsize=EMBEDDINGS_POOL_SIZE,
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    session.headers.update(
+                        {
+                            "api-key": config.azure.embedding_key,
+                            "Content-Type": "application/json",
+                        }
+                    )
+                    self._session = session
+        return self._session
 
     @retry(
         stop=stop_after_attempt(5),
@@ -48,13 +85,9 @@ class EmbeddingsClient(EmbeddingsClient):
         """
         Internal method to embed text with retry logic for network errors.
         """
-        response = requests.post(
+        response = self.session.post(
             config.azure.embedding_full_endpoint,
             json={"input": [text], "encoding_format": "base64"},
-            headers={
-                "api-key": config.azure.embedding_key,
-                "Content-Type": "application/json",
-            },
             timeout=60.0,
         )
         response.raise_for_status()
@@ -73,13 +106,9 @@ class EmbeddingsClient(EmbeddingsClient):
         """
         Internal method to embed multiple texts with retry logic for network errors.
         """
-        response = requests.post(
+        response = self.session.post(
             config.azure.embedding_full_endpoint,
             json={"input": texts, "encoding_format": "base64"},
-            headers={
-                "api-key": config.azure.embedding_key,
-                "Content-Type": "application/json",
-            },
             timeout=60.0,
         )
         response.raise_for_status()
@@ -221,6 +221,14 @@ class MilvusClient(VectorStoreClient):
         """
         Search vectors in the vector store and return the top k vectors.
         """
+        return self.search_vectors_batch([data_vector], brain_id, store, k)[0]
+
+    def search_vectors_batch(
+        self, data_vectors: list[list[float]], brain_id: str, store: str, k: int = 10
+    ) -> list[list[Vector]]:
+        """
+        Search the top k vectors for each of the given vectors with a single Milvus search request.
+        """
         client = self._get_client(brain_id)
         self._ensure_store(store, brain_id)
 
@@ -230,24 +238,25 @@ class MilvusClient(VectorStoreClient):
             pass
 
         _results = client.search(
-            store, data=[data_vector], limit=k, output_fields=["$meta"]
+            store, data=data_vectors, limit=k, output_fields=["$meta"]
         )
-        results = []
+        batch_results = []
         for query_results in _results:
-            for result in query_results:
-                results.append(
-                    Vector(
-                        id=str(result["id"]),
-                        metadata={
-                            k: v
-                            for k, v in result.get("entity").items()
-                            if k not in ["id", "embeddings", "distance"]
-                        },
-                        distance=result["distance"],
-                    )
+            results = [
+                Vector(
+                    id=str(result["id"]),
+                    metadata={
+                        k: v
+                        for k, v in result.get("entity").items()
+                        if k not in ["id", "embeddings", "distance"]
+                    },
+                    distance=result["distance"],
                 )
-        results.sort(key=lambda x: x.distance)
-        return results
+                for result in query_results
+            ]
+            results.sort(key=lambda x: x.distance)
+            batch_results.append(results)
+        return batch_results
 
     def get_by_ids(self, ids: list[str], store: str, brain_id: str) -> list[Vector]:
         """
@@ -30,6 +30,8 @@ from src.constants.kg import (
 from src.utils.logging import log
 from src.utils.serialization.data import always_dict
 
+RELATIONSHIP_BATCH_SIZE = 1000
+
 
 class Neo4jClient(GraphClient):
     """
@@ -354,6 +356,98 @@ class Neo4jClient(GraphClient):
         result = self.driver.execute_query(cypher_query, database_=brain_id)
         return result
 
+    def _format_param_value(self, value: Any) -> Any:
+        """
+        Convert a value to the query parameter `_format_value` would inline: primitives as they are, anything else as its string.
+        """
+        if value is None or isinstance(value, (str, int, float, bool)):
+            return value
+        return str(value)
+
+    def add_relationships(
+        self,
+        relationships: list[tuple[Node, Predicate, Node]],
+        brain_id: str,
+    ) -> list:
+        """
+        Create or update many relationships with one UNWIND query per (subject labels, predicate, object labels) group.
+
+        Labels and relationship types cannot be parameterized in Cypher, so relationships are grouped by them and each
+        group is written in batches of RELATIONSHIP_BATCH_SIZE rows. Every row gets the same treatment as `add_relationship`:
+        nodes are matched by labels and name, the relationship is merged, `description`, `uuid`, `v_id` and `flow_key` are
+        set on create, and the truthy `properties`, `description`, `happened_at`, `flow_key`, `last_updated` and `amount`
+        of the subject, object and predicate (in that order, later ones winning) are set on every write.
+
+        Returns:
+            list: The raw Neo4j driver results, one per executed batch.
+        """
+        attributes = [
+            "properties",
+            "description",
+            "happened_at",
+            "flow_key",
+            "last_updated",
+            "amount",
+        ]
+
+        groups: Dict[Tuple[str, str, str], List[dict]] = {}
+        for subject, predicate, to_object in relationships:
+            rel_props = {}
+            for obj in (subject, to_object, predicate):
+                for attr in attributes:
+                    value = getattr(obj, attr, None)
+                    if value:
+                        rel_props[attr] = self._format_param_value(value)
+            key = (
+                ":".join(self._clean_labels(subject.labels)),
+                ":".join(self._clean_labels([predicate.name])),
+                ":".join(self._clean_labels(to_object.labels)),
+            )
+            groups.setdefault(key, []).append(
+                {
+                    "subject_name": self._format_param_value(subject.name),
+                    "object_name": self._format_param_value(to_object.name),
+                    "description": self._format_param_value(predicate.description),
+                    "uuid": self._format_param_value(predicate.uuid),
+                    "v_id": self._format_param_value(
+                        (predicate.properties or {}).get("v_id")
+                    ),
+                    "flow_key": self._format_param_value(predicate.flow_key),
+                    "props": rel_props,
+                }
+            )
+
+        if not groups:
+            return []
+
+        self.ensure_database(brain_id)
+        results = []
+        for (subject_labels, rel_type, object_labels), rows in groups.items():
+            cypher_query = f"""
+        UNWIND $rows AS row
+        MATCH (a:{subject_labels}) WHERE a['name'] = row.subject_name
+        MATCH (b:{object_labels}) WHERE b['name'] = row.object_name
+        MERGE (a)-[r:{rel_type}]->(b)
+        ON CREATE
+        SET r['description'] = row.description,
+        r['uuid'] = row.uuid,
+        r['v_id'] = row.v_id,
+        r['flow_key'] = row.flow_key
+        SET r += row.props
+        RETURN count(r) AS relationships
+        """
+            for start in range(0, len(rows), RELATIONSHIP_BATCH_SIZE):
+                results.append(
+                    self.driver.execute_query(
+                        cypher_query,
+                        parameters_={
+                            "rows": rows[start : start + RELATIONSHIP_BATCH_SIZE]
+                        },
+                        database_=brain_id,
+                    )
+                )
+        return results
+
     def search_graph(self, nodes: list[Node], brain_id: str) -> list[Node]:
         """
         Search the graph for nodes and 1 degree relationships.
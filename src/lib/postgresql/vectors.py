@@ -96,6 +96,9 @@ class PostgreSQLVectorStoreClient(VectorStoreClient):
     is enabled lazily, once per brain database.
     """
 
+    # `<=>` is pgvector's cosine distance: 0 for identical vectors, up to 2 for opposite ones.
+    distance_is_similarity = False
+
     def __init__(self):
         self._lock = threading.RLock()
         self._brain_extensions_ready: set[str] = set()
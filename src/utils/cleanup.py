@@ -51,57 +51,63 @@ def _extract_json_array_after_key(text: str, key: str):
     return None
 
 
-def strip_properties(
-    objs: list[dict], pop_also: list[str] | None = None
-) -> list[dict]:
+def strip_object(obj, pop_also: frozenset | set | list | None = None):
+    """
+    Strip a single object: drop empty strings, None values, empty dicts/lists and the `pop_also`
+    keys, recursing into nested dicts and into dicts inside lists. Non-dict values are returned as is.
+    """
+    if not isinstance(obj, dict):
+        return obj
     if pop_also is None:
-        pop_also = []
-    cleaned_objs = []
-    for obj in objs:
-        if not isinstance(obj, dict):
-            cleaned_objs.append(obj)
+        pop_also = ()
+    cleaned_obj = {}
+    for key, value in obj.items():
+        if key in pop_also:
             continue
-        cleaned_obj = obj.copy()
 
-        keys_to_pop = []
-        for key, value in cleaned_obj.items():
-            if key in pop_also:
-                keys_to_pop.append(key)
-                continue
+        # Python's bool type are subclasses of int, False is 0 and True is 1.
+        # This can lead to unexpected behavior if '0' or '1' are used as keys.
+        if isinstance(key, bool):
+            cleaned_obj[key] = value
+            continue
 
-            # Python's bool type are subclasses of int, False is 0 and True is 1.
-            # This can lead to unexpected behavior if '0' or '1' are used as keys.
-            if isinstance(key, bool):
+        if isinstance(value, dict):
+            if not value:
                 continue
+            cleaned_obj[key] = strip_object(value, pop_also)
+        elif isinstance(value, list):
+            if not value:
+                continue
+            cleaned_obj[key] = [
+                strip_object(item, pop_also) if isinstance(item, dict) else item
+                for item in value
+            ]
+        elif isinstance(value, str):
+            if not value.strip():
+                continue
+            cleaned_obj[key] = value
+        elif value is None:
+            continue
+        else:
+            cleaned_obj[key] = value
+
+    return cleaned_obj
+
+
+def strip_properties(
+    objs: list[dict], pop_also: frozenset | set | list | None = None
+) -> list[dict]:
+    pop_also = frozenset(pop_also) if pop_also else ()
+    return [strip_object(obj, pop_also) for obj in objs]
+
 
-            if isinstance(value, dict):
-                if len(value.keys()) == 0:
-                    keys_to_pop.append(key)
-                else:
-                    cleaned_obj[key] = strip_properties([value], pop_also)[0]
-            elif isinstance(value, list):
-                if len(value) == 0:
-                    keys_to_pop.append(key)
-                else:
-                    new_list = []
-                    for item in value:
-                        if isinstance(item, dict):
-                            new_list.append(strip_properties([item], pop_also)[0])
-                        else:
-                            new_list.append(item)
-                    cleaned_obj[key] = new_list
-            elif isinstance(value, str):
-                if len(value.strip()) == 0:
-                    keys_to_pop.append(key)
-            elif value is None:
-                keys_to_pop.append(key)
-
-        for key in keys_to_pop:
-            cleaned_obj.pop(key)
-
-        cleaned_objs.append(cleaned_obj)
-
-    return cleaned_objs
+def strip_model(model, pop_also: frozenset | set | list | None = None) -> dict:
+    """
+    `strip_object` of a pydantic model's JSON dump; the top-level `pop_also` fields are excluded from the dump
+    itself, so they are never serialized.
+    """
+    pop_also = frozenset(pop_also) if pop_also else frozenset()
+    return strip_object(model.model_dump(mode="json", exclude=pop_also), pop_also)
 
 
 def _last_json_object(text: str) -> dict:
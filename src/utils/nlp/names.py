@@ -10,6 +10,13 @@ Modified By: the developer formerly known as Christian Nonis at <alch.infoemail@
 
 import Levenshtein
 
+try:
+    from rapidfuzz import process as rapidfuzz_process
+    from rapidfuzz.distance import Indel
+except ModuleNotFoundError:
+    rapidfuzz_process = None
+    Indel = None
+
 
 def levenshtein_similarity(name1: str, name2: str) -> float:
     """
@@ -18,6 +25,19 @@ def levenshtein_similarity(name1: str, name2: str) -> float:
     return Levenshtein.ratio(name1, name2)
 
 
+def levenshtein_similarities(query: str, choices: list[str]) -> list[float]:
+    """
+    `levenshtein_similarity` of `query` against every choice, computed in one batched rapidfuzz call when available.
+    """
+    if not choices:
+        return []
+    if rapidfuzz_process is not None:
+        return rapidfuzz_process.cdist(
+            [query], choices, scorer=Indel.normalized_similarity
+        )[0].tolist()
+    return [Levenshtein.ratio(query, choice) for choice in choices]
+
+
 def labels_similarity(labels_a: list[str], labels_b: list[str]) -> float:
     """
     Calculate the similarity between two lists of labels using Jaccard similarity.
@@ -10,9 +10,14 @@ Modified By: Christian Nonis <alch.infoemail@gmail.com>
 
 import json
 import re
-from typing import Any
+from typing import Any, Iterable
 import uuid
 
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
+
 
 def str_to_json(text: str | None, empty_fallback: bool = False) -> list[str]:
     """
@@ -68,4 +73,47 @@ def is_uuid(text: str) -> bool:
         uuid.UUID(text.strip())
         return True
     except Exception:
-        return False
\ No newline at end of file
+        return False
+
+
+def json_dumps(obj: Any) -> str:
+    """
+    Serialize an object to a compact JSON string, using orjson when it is installed.
+    Falls back to the standard library for payloads orjson rejects (e.g. integers above 64 bits).
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def join_json_fragments(fragments: Iterable[str]) -> str:
+    """
+    Assemble already-serialized JSON values (e.g. from pydantic's `model_dump_json`) into a JSON array string.
+    """
+    return "[" + ",".join(fragments) + "]"
+
+
+def json_dumps_bytes(obj: Any) -> bytes:
+    """
+    Same as `json_dumps` but returns UTF-8 bytes, for sinks that accept bytes (e.g. Redis values).
+    Skips the decode/encode round-trip orjson would otherwise need.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def json_loads(text: str | bytes) -> Any:
+    """
+    Parse a JSON document, using orjson when it is installed.
+    orjson's decode error subclasses `json.JSONDecodeError`, so callers can catch the standard library exception.
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
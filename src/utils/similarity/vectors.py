@@ -8,22 +8,111 @@ Modified By: the developer formerly known as Christian Nonis at <alch.infoemail@
 -----
 """
 
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List
+
 import numpy as np
-from typing import List
 
 
 def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
-    vec1_np = np.array(vec1)
-    vec2_np = np.array(vec2)
+    vec1_np = np.asarray(vec1, dtype=np.float64)
+    vec2_np = np.asarray(vec2, dtype=np.float64)
     dot_product = np.dot(vec1_np, vec2_np)
-    norm1 = np.linalg.norm(vec1_np)
-    norm2 = np.linalg.norm(vec2_np)
-    if norm1 == 0 or norm2 == 0:
+    # Three dot products and one sqrt instead of two `np.linalg.norm` calls; arrays are not copied when
+    # the inputs already are float64 arrays.
+    squared_norms = np.dot(vec1_np, vec1_np) * np.dot(vec2_np, vec2_np)
+    if squared_norms == 0:
         return 0.0
-    return dot_product / (norm1 * norm2)
+    return dot_product / np.sqrt(squared_norms)
+
+
+def normalize_vector(vec: List[float]) -> np.ndarray:
+    """
+    Return `vec` as a float32 unit vector, so cosine similarity reduces to a dot product.
+    Zero vectors stay zero and therefore score 0.0 against anything, as in `cosine_similarity`.
+    """
+    vec_np = np.asarray(vec, dtype=np.float32)
+    norm = np.linalg.norm(vec_np)
+    if norm == 0:
+        return vec_np
+    return vec_np / norm
 
 
 def euclidean_distance(vec1: List[float], vec2: List[float]) -> float:
     vec1_np = np.array(vec1)
     vec2_np = np.array(vec2)
     return np.linalg.norm(vec1_np - vec2_np)
+
+
+class NormalizedEmbeddingCache:
+    """
+    Process-local LRU of unit embeddings keyed by a content hash of the embedded text.
+
+    Relationship descriptions (and predicate names used in their place) repeat a lot within a session;
+    `embed` only sends the texts it has not seen to the embeddings adapter. Failed (empty) embeddings are not cached.
+    """
+
+    def __init__(self, maxsize: int = 8192, prefetch_workers: int = 4) -> None:
+        self._maxsize = maxsize
+        self._vectors: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._prefetch_workers = prefetch_workers
+        self._prefetch_executor: ThreadPoolExecutor | None = None
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def embed(self, embeddings_adapter, texts: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Return `{text: unit vector}` for every text that could be embedded, embedding only the cache misses in one batch.
+        Texts are folded by their digest, so a repeated text is hashed and embedded once.
+        """
+        result: Dict[str, np.ndarray] = {}
+        missing: Dict[bytes, str] = {}
+        with self._lock:
+            for text in texts:
+                key = self._key(text)
+                if key in missing:
+                    continue
+                vector = self._vectors.get(key)
+                if vector is None:
+                    missing[key] = text
+                else:
+                    self._vectors.move_to_end(key)
+                    result[text] = vector
+
+        if not missing:
+            return result
+
+        vectors = embeddings_adapter.embed_texts(list(missing.values()))
+        with self._lock:
+            for (key, text), vector in zip(missing.items(), vectors):
+                if not vector.embeddings:
+                    continue
+                normalized = normalize_vector(vector.embeddings)
+                result[text] = normalized
+                self._vectors[key] = normalized
+            while len(self._vectors) > self._maxsize:
+                self._vectors.popitem(last=False)
+        return result
+
+    def prefetch(
+        self, embeddings_adapter, texts: List[str]
+    ) -> "Future[Dict[str, np.ndarray]]":
+        """
+        Start `embed` on a background thread, so the embedding round-trip can overlap other work (e.g. an LLM call).
+        """
+        with self._lock:
+            if self._prefetch_executor is None:
+                self._prefetch_executor = ThreadPoolExecutor(
+                    max_workers=self._prefetch_workers,
+                    thread_name_prefix="embedding-prefetch",
+                )
+        return self._prefetch_executor.submit(self.embed, embeddings_adapter, texts)
+
+
+relationship_embedding_cache = NormalizedEmbeddingCache()
@@ -107,6 +107,22 @@ def _normalize_relationship_dates(
                 entity.happened_at = normalize_date_string(entity.happened_at)
 
 
+def _write_relationships(
+    relationships: List[Tuple[Node, Predicate, Node]], brain_id: str
+) -> None:
+    try:
+        graph_adapter.add_relationships(relationships, brain_id=brain_id)
+    except Exception as e:
+        print(f"[!] Bulk relationship write failed, adding one by one: {e}")
+        for subject, predicate, to_object in relationships:
+            try:
+                graph_adapter.add_relationship(
+                    subject, predicate, to_object, brain_id=brain_id
+                )
+            except Exception as rel_e:
+                print(f"[!] Relationship write failed for {predicate.name}: {rel_e}")
+
+
 def _resolve_relationship_entities(
     relationships: List[ArchitectAgentRelationship], brain_id: str
 ) -> None:
@@ -403,11 +419,12 @@ def process_architect_relationships(self, args: dict):
 
     Parameters:
         args (dict): Task payload containing:
-            - "relationships" (List[dict]): List of relationship payloads convertible to ArchitectAgentRelationship.
+            - "relationships_json" (str): JSON array of relationship payloads convertible to ArchitectAgentRelationship.
+            - "relationships" (List[dict], optional): Already-decoded relationship payloads, used when "relationships_json" is absent.
             - "brain_id" (str, optional): Target brain identifier; defaults to "default".
 
     Description:
-        For each relationship in `args["relationships"]`, the task generates embeddings for the relationship (and for any missing subject/object nodes), creates or updates graph nodes, and adds the relationship edge to the knowledge graph. Progress and final status are stored in the task cache under the current task id. Individual relationship or node failures (including timeouts) are skipped so remaining items continue processing.
+        For each relationship in the payload, the task generates embeddings for the relationship (and for any missing subject/object nodes), creates or updates graph nodes, and adds the relationship edge to the knowledge graph. Progress and final status are stored in the task cache under the current task id. Individual relationship or node failures (including timeouts) are skipped so remaining items continue processing.
 
     Returns:
         str: The Celery task id for the ingestion run.
@@ -416,13 +433,19 @@ def process_architect_relationships(self, args: dict):
         Exception: Any unhandled exception is recorded to the task cache with status "failed" and then re-raised.
     """
 
+    relationships_json: Optional[str] = args.get("relationships_json")
+    relationships_data: List[dict] = (
+        json.loads(relationships_json)
+        if relationships_json
+        else args.get("relationships", [])
+    )
+
     print(
         "[DEBUG (process_architect_relationships)]: Processing ",
-        len(args.get("relationships", [])),
+        len(relationships_data),
         " architect relationships",
     )
 
-    relationships_data: List[dict] = args.get("relationships", [])
     brain_id: str = args.get("brain_id", "default")
     session_id: Optional[str] = args.get("session_id")
 
@@ -450,23 +473,38 @@ def process_architect_relationships(self, args: dict):
         _normalize_relationship_dates(relationships)
         _resolve_relationship_entities(relationships, brain_id)
 
+        pending_relationships: List[Tuple[Node, Predicate, Node]] = []
+
+        def _flush_relationships():
+            if not pending_relationships:
+                return
+            _write_relationships(pending_relationships, brain_id)
+            print(f"> Added {len(pending_relationships)} relationships")
+            pending_relationships.clear()
+
+        relationships_to_ingest: List[ArchitectAgentRelationship] = []
+        for relationship in relationships:
+            if not isinstance(relationship, ArchitectAgentRelationship):
+                print(f"[!] Skipping invalid relationship type: {type(relationship)}")
+                continue
+            if relationship.tail.uuid == relationship.tip.uuid:
+                print(
+                    f"[!] Skipping self-relationship {relationship.name} on {relationship.tail.name}"
+                )
+                continue
+            relationships_to_ingest.append(relationship)
+
+        # One embeddings request for the whole batch; texts that fail are re-embedded one by one.
+        rel_text_embeddings = ingestion_manager.embed_rel_texts(relationships_to_ingest)
+
         with ThreadPoolExecutor(max_workers=10) as io_executor:
             rel_embedding_futures: List[Tuple[Future, ArchitectAgentRelationship]] = []
-            for relationship in relationships:
-                if not isinstance(relationship, ArchitectAgentRelationship):
-                    print(
-                        f"[!] Skipping invalid relationship type: {type(relationship)}"
-                    )
-                    continue
-                if relationship.tail.uuid == relationship.tip.uuid:
-                    print(
-                        f"[!] Skipping self-relationship {relationship.name} on {relationship.tail.name}"
-                    )
-                    continue
+            for relationship in relationships_to_ingest:
                 future = io_executor.submit(
                     ingestion_manager.process_rel_vectors,
                     relationship,
                     brain_id,
+                    rel_text_embeddings.get(ingestion_manager.rel_text(relationship)),
                 )
                 rel_embedding_futures.append((future, relationship))
 
@@ -502,6 +540,8 @@ def process_architect_relationships(self, args: dict):
                                 k=10,
                             )
                     if similar_v_rels and similar_v_rels[0].distance > 0.9:
+                        # The similar relationship may still be buffered from this batch.
+                        _flush_relationships()
                         similar_rel = graph_adapter.get_triples_by_uuid(
                             [similar_v_rels[0].metadata.get("uuid")],
                             brain_id=brain_id,
@@ -579,64 +619,65 @@ def process_architect_relationships(self, args: dict):
 
                     graph_adapter.add_nodes(graph_nodes, brain_id=brain_id)
                     print(f"> Added {len(graph_nodes)} nodes")
-                    graph_adapter.add_relationship(
-                        Node(
-                            uuid=relationship.tail.uuid,
-                            labels=[relationship.tail.type],
-                            name=relationship.tail.name,
-                            polarity=(
-                                relationship.tail.polarity
-                                if relationship.tail.polarity
-                                else "neutral"
-                            ),
-                            **(
-                                {"happened_at": relationship.tail.happened_at}
-                                if relationship.tail.happened_at
-                                else {}
+                    pending_relationships.append(
+                        (
+                            Node(
+                                uuid=relationship.tail.uuid,
+                                labels=[relationship.tail.type],
+                                name=relationship.tail.name,
+                                polarity=(
+                                    relationship.tail.polarity
+                                    if relationship.tail.polarity
+                                    else "neutral"
+                                ),
+                                **(
+                                    {"happened_at": relationship.tail.happened_at}
+                                    if relationship.tail.happened_at
+                                    else {}
+                                ),
+                                properties={
+                                    **(relationship.tail.properties or {}),
+                                },
                             ),
-                            properties={
-                                **(relationship.tail.properties or {}),
-                            },
-                        ),
-                        Predicate(
-                            uuid=relationship.uuid,
-                            flow_key=relationship.flow_key,
-                            name=relationship.name,
-                            description=relationship.description or "",
-                            properties={
-                                **{
-                                    k: v
-                                    for k, v in (relationship.properties or {}).items()
-                                    if v is not None
+                            Predicate(
+                                uuid=relationship.uuid,
+                                flow_key=relationship.flow_key,
+                                name=relationship.name,
+                                description=relationship.description or "",
+                                properties={
+                                    **{
+                                        k: v
+                                        for k, v in (relationship.properties or {}).items()
+                                        if v is not None
+                                    },
+                                    **(
+                                        {"v_id": v_rel_id}
+                                        if v_rel_id is not None
+                                        else {}
+                                    ),
                                 },
+                                last_updated=datetime.datetime.now(),
+                                amount=relationship.amount,
+                            ),
+                            Node(
+                                uuid=relationship.tip.uuid,
+                                labels=[relationship.tip.type],
+                                name=relationship.tip.name,
+                                polarity=(
+                                    relationship.tip.polarity
+                                    if relationship.tip.polarity
+                                    else "neutral"
+                                ),
                                 **(
-                                    {"v_id": v_rel_id}
-                                    if v_rel_id is not None
+                                    {"happened_at": relationship.tip.happened_at}
+                                    if relationship.tip.happened_at
                                     else {}
                                 ),
-                            },
-                            last_updated=datetime.datetime.now(),
-                            amount=relationship.amount,
-                        ),
-                        Node(
-                            uuid=relationship.tip.uuid,
-                            labels=[relationship.tip.type],
-                            name=relationship.tip.name,
-                            polarity=(
-                                relationship.tip.polarity
-                                if relationship.tip.polarity
-                                else "neutral"
-                            ),
-                            **(
-                                {"happened_at": relationship.tip.happened_at}
-                                if relationship.tip.happened_at
-                                else {}
+                                properties={
+                                    **(relationship.tip.properties or {}),
+                                },
                             ),
-                            properties={
-                                **(relationship.tip.properties or {}),
-                            },
-                        ),
-                        brain_id=brain_id,
+                        )
                     )
                 except FutureTimeoutError:
                     rel_name = getattr(relationship, "name", "unknown")
@@ -651,6 +692,8 @@ def process_architect_relationships(self, args: dict):
                     )
                     continue
 
+        _flush_relationships()
+
         cache_adapter.set(
             key=f"task:{self.request.id}",
             value=json.dumps({"status": "completed", "task_id": self.request.id}),
@@ -44,6 +44,12 @@ class KGAgentPromptStrategyArchitectureTests(unittest.TestCase):
         self.assertIn('raise ValueError(f"Invalid type: {type_}")', source)
         self.assertIn("system_prompt = self._SYSTEM_PROMPT_BUILDERS[type_](", source)
 
+    def test_kg_agent_exposes_fused_session(self):
+        self.assertIn("session", method_names("src/core/agents/kg_agent.py", "KGAgent"))
+        methods = method_names("src/core/agents/kg_agent.py", "KGAgentSession")
+        self.assertIn("update", methods)
+        self.assertIn("retrieve", methods)
+
 
 class JanitorAgentPromptAndSchemaArchitectureTests(unittest.TestCase):
     def test_janitor_agent_has_prompt_registry_mapping(self):
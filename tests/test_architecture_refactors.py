@@ -139,6 +139,22 @@ class RuntimeAgentFactoryTests(unittest.TestCase):
         self.assertEqual(built["kind"], "langchain")
         self.assertEqual(built["kwargs"]["response_format"], dict)
         self.assertEqual(built["kwargs"]["tools"], ["t1"])
+        self.assertNotIn("checkpointer", built["kwargs"])
+
+    def test_factory_forwards_checkpointer_to_langchain_backend(self):
+        def fake_create_agent(**kwargs):
+            return {"kind": "langchain", "kwargs": kwargs}
+
+        checkpointer = object()
+        factory = RuntimeAgentFactory(create_agent_fn=fake_create_agent)
+        built = factory.build(
+            model=object(),
+            tools=[],
+            system_prompt="system",
+            architecture="langchain",
+            checkpointer=checkpointer,
+        )
+        self.assertIs(built["kwargs"]["checkpointer"], checkpointer)
 
 
 class EmbeddingsStrategyTests(unittest.TestCase):
@@ -0,0 +1,160 @@
+import os
+import unittest
+from unittest.mock import patch
+
+os.environ.setdefault("BRAINPAT_TOKEN", "test-token")
+
+from src.adapters.interfaces.graph import GraphClient
+from src.constants.kg import Node, Predicate
+from src.lib.neo4j import client as neo4j_client
+from src.lib.neo4j.client import Neo4jClient
+
+
+class _RecordingDriver:
+    def __init__(self):
+        self.calls = []
+
+    def execute_query(self, query, parameters_=None, database_=None):
+        self.calls.append((query, parameters_, database_))
+        return len(self.calls)
+
+
+def _neo4j_client():
+    client = Neo4jClient.__new__(Neo4jClient)
+    client.driver = _RecordingDriver()
+    client.ensure_database = lambda database: None
+    return client
+
+
+def _relationship(subject_labels, name, object_labels, index=0):
+    return (
+        Node(labels=subject_labels, name=f"subject-{index}"),
+        Predicate(name=name, description=f"{name} {index}"),
+        Node(labels=object_labels, name=f"object-{index}"),
+    )
+
+
+class Neo4jAddRelationshipsTests(unittest.TestCase):
+    def test_groups_rows_by_labels_and_type(self):
+        client = _neo4j_client()
+        client.add_relationships(
+            [
+                _relationship(["Person"], "WORKS_AT", ["Company"], 0),
+                _relationship(["Person"], "WORKS_AT", ["Company"], 1),
+                _relationship(["Person"], "WORKS_AT", ["City"], 2),
+                _relationship(["Person"], "LIVES_IN", ["City"], 3),
+            ],
+            brain_id="b",
+        )
+
+        calls = client.driver.calls
+        self.assertEqual(len(calls), 3)
+        self.assertIn("MATCH (a:PERSON)", calls[0][0])
+        self.assertIn("MERGE (a)-[r:WORKS_AT]->(b)", calls[0][0])
+        self.assertIn("MATCH (b:COMPANY)", calls[0][0])
+        self.assertEqual(
+            [row["subject_name"] for row in calls[0][1]["rows"]],
+            ["subject-0", "subject-1"],
+        )
+        self.assertIn("MATCH (b:CITY)", calls[1][0])
+        self.assertIn("MERGE (a)-[r:LIVES_IN]->(b)", calls[2][0])
+        self.assertTrue(all(database == "b" for _, _, database in calls))
+
+    def test_splits_groups_at_the_batch_size(self):
+        client = _neo4j_client()
+        relationships = [
+            _relationship(["Person"], "KNOWS", ["Person"], index) for index in range(5)
+        ]
+        with patch.object(neo4j_client, "RELATIONSHIP_BATCH_SIZE", 2):
+            results = client.add_relationships(relationships, brain_id="b")
+
+        self.assertEqual(
+            [len(params["rows"]) for _, params, _ in client.driver.calls], [2, 2, 1]
+        )
+        self.assertEqual(len(results), 3)
+
+    def test_props_follow_the_set_order_of_add_relationship(self):
+        client = _neo4j_client()
+        subject = Node(
+            labels=["Person"],
+            name="Ada",
+            description="subject description",
+            happened_at="2020-01-01",
+        )
+        to_object = Node(
+            labels=["Company"],
+            name="Acme",
+            description="object description",
+            properties={"source": "object"},
+        )
+        predicate = Predicate(
+            name="WORKS_AT",
+            description="predicate description",
+            flow_key="flow-1",
+            amount=3.5,
+        )
+        client.add_relationships([(subject, predicate, to_object)], brain_id="b")
+
+        props = client.driver.calls[0][1]["rows"][0]["props"]
+        self.assertEqual(props["description"], "predicate description")
+        self.assertEqual(props["happened_at"], "2020-01-01")
+        self.assertEqual(props["properties"], str({"source": "object"}))
+        self.assertEqual(props["flow_key"], "flow-1")
+        self.assertEqual(props["amount"], 3.5)
+        self.assertEqual(props["last_updated"], str(predicate.last_updated))
+
+    def test_no_relationships_runs_no_query(self):
+        client = _neo4j_client()
+        self.assertEqual(client.add_relationships([], brain_id="b"), [])
+        self.assertEqual(client.driver.calls, [])
+
+
+class GraphClientAddRelationshipsFallbackTests(unittest.TestCase):
+    def test_default_adds_relationships_one_by_one(self):
+        class SingleWriteClient:
+            def __init__(self):
+                self.written = []
+
+            def add_relationship(self, subject, predicate, to_object, brain_id):
+                self.written.append((predicate.description, brain_id))
+                return predicate.description
+
+        client = SingleWriteClient()
+        relationships = [
+            _relationship(["Person"], "KNOWS", ["Person"], index) for index in range(2)
+        ]
+
+        results = GraphClient.add_relationships(client, relationships, "b")
+
+        self.assertEqual(results, ["KNOWS 0", "KNOWS 1"])
+        self.assertEqual(client.written, [("KNOWS 0", "b"), ("KNOWS 1", "b")])
+
+
+class IngestionRelationshipWriteTests(unittest.TestCase):
+    def test_falls_back_to_single_writes_when_the_bulk_write_fails(self):
+        from src.workers.tasks import ingestion
+
+        class FlakyGraphAdapter:
+            def __init__(self):
+                self.written = []
+
+            def add_relationships(self, relationships, brain_id):
+                raise RuntimeError("bulk write failed")
+
+            def add_relationship(self, subject, predicate, to_object, brain_id):
+                if predicate.description == "KNOWS 1":
+                    raise RuntimeError("single write failed")
+                self.written.append(predicate.description)
+
+        adapter = FlakyGraphAdapter()
+        relationships = [
+            _relationship(["Person"], "KNOWS", ["Person"], index) for index in range(3)
+        ]
+        with patch.object(ingestion, "graph_adapter", adapter):
+            ingestion._write_relationships(relationships, "b")
+
+        self.assertEqual(adapter.written, ["KNOWS 0", "KNOWS 2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import unittest
+
+os.environ.setdefault("BRAINPAT_TOKEN", "test-token")
+
+from src.adapters.graph import GraphAdapter, add_graph_write_listener
+from src.core.agents.tools.janitor_agent.tool_cache import ToolResultCache
+
+
+class _PendingTasks:
+    def __init__(self):
+        self.counts = {}
+
+    def __call__(self, brain_id, session_id):
+        return self.counts.get((brain_id, session_id), 0)
+
+
+class ToolResultCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.pending = _PendingTasks()
+        self.cache = ToolResultCache(pending_tasks=self.pending)
+
+    def test_caches_results_while_no_write_is_pending(self):
+        epoch = self.cache.epoch("b")
+        self.cache.set("b", "search_entities", "john", "result", epoch)
+        self.assertEqual(self.cache.get("b", "search_entities", "john"), "result")
+
+    def test_bypasses_the_cache_while_a_queued_write_is_pending(self):
+        epoch = self.cache.epoch("b")
+        self.cache.set("b", "search_entities", "john", "before", epoch)
+        self.pending.counts[("b", "s1")] = 1
+        self.cache.begin_write("b", "s1")
+
+        self.assertIsNone(self.cache.get("b", "search_entities", "john"))
+        self.assertIsNone(self.cache.epoch("b"))
+        self.assertIsNone(self.cache.epoch("b"))
+        self.assertEqual(self.cache.epoch("other"), 0)
+
+    def test_resumes_caching_when_the_pending_counter_returns_to_zero(self):
+        self.pending.counts[("b", "s1")] = 1
+        self.cache.begin_write("b", "s1")
+        self.assertIsNone(self.cache.epoch("b"))
+
+        self.pending.counts[("b", "s1")] = 0
+        epoch = self.cache.epoch("b")
+        self.assertIsNotNone(epoch)
+        self.cache.set("b", "search_entities", "john", "after", epoch)
+        self.assertEqual(self.cache.get("b", "search_entities", "john"), "after")
+
+    def test_drops_a_set_with_a_stale_epoch(self):
+        epoch = self.cache.epoch("b")
+        self.pending.counts[("b", "s1")] = 1
+        self.cache.begin_write("b", "s1")
+        self.cache.set("b", "search_entities", "john", "racy", epoch)
+        self.pending.counts[("b", "s1")] = 0
+        self.cache.epoch("b")
+        self.assertIsNone(self.cache.get("b", "search_entities", "john"))
+
+    def test_drops_results_computed_before_an_in_process_write(self):
+        epoch = self.cache.epoch("b")
+        self.cache.set("b", "get_schema", "node_labels", "old", epoch)
+        self.cache.graph_written("b")
+        self.assertIsNone(self.cache.get("b", "get_schema", "node_labels"))
+        self.cache.set("b", "get_schema", "node_labels", "racy", epoch)
+        self.assertIsNone(self.cache.get("b", "get_schema", "node_labels"))
+
+    def test_a_write_without_session_turns_the_brain_cache_off(self):
+        self.cache.begin_write("b", None)
+        self.assertIsNone(self.cache.epoch("b"))
+
+    def test_a_failing_counter_read_counts_as_pending(self):
+        def failing_pending_tasks(brain_id, session_id):
+            raise ConnectionError("redis down")
+
+        cache = ToolResultCache(pending_tasks=failing_pending_tasks)
+        cache.begin_write("b", "s1")
+        self.assertIsNone(cache.epoch("b"))
+
+    def test_disabled_cache_is_never_used(self):
+        cache = ToolResultCache(enabled=False)
+        self.assertIsNone(cache.epoch("b"))
+
+
+class GraphWriteListenerTests(unittest.TestCase):
+    def test_graph_adapter_writes_notify_the_listeners(self):
+        class FakeGraphClient:
+            def add_nodes(self, nodes, brain_id, identification_params, metadata):
+                return nodes
+
+            def remove_nodes(self, uuids, brain_id):
+                raise RuntimeError("write failed")
+
+            def execute_operation(self, operation, brain_id):
+                return []
+
+        written = []
+        add_graph_write_listener(written.append)
+        adapter = GraphAdapter()
+        adapter.add_client(FakeGraphClient())
+
+        adapter.add_nodes([], brain_id="b1")
+        with self.assertRaises(RuntimeError):
+            adapter.remove_nodes(["n1"], brain_id="b2")
+        adapter.execute_operation("MATCH (n) RETURN n", brain_id="b3")
+        adapter.execute_operation("MATCH (n) DETACH DELETE n", brain_id="b4")
+
+        self.assertEqual(written, ["b1", "b2", "b4"])
+
+
+if __name__ == "__main__":
+    unittest.main()
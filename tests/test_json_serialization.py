@@ -0,0 +1,49 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from src.utils.serialization import data
+
+
+class JsonDumpsTests(unittest.TestCase):
+    def test_json_dumps_round_trips_nested_payload(self):
+        payload = [{"uuid": "a", "name": "Zürich", "properties": {"count": 2}}]
+        self.assertEqual(json.loads(data.json_dumps(payload)), payload)
+
+    def test_json_dumps_accepts_non_string_keys(self):
+        self.assertEqual(json.loads(data.json_dumps({1: "x"})), {"1": "x"})
+
+    def test_json_dumps_falls_back_to_stdlib_without_orjson(self):
+        with patch.object(data, "orjson", None):
+            self.assertEqual(data.json_dumps({"a": [1, 2]}), '{"a":[1,2]}')
+
+    def test_json_dumps_bytes_matches_json_dumps(self):
+        payload = [{"name": "Zürich", "properties": {1: "x"}}]
+        self.assertEqual(
+            data.json_dumps_bytes(payload), data.json_dumps(payload).encode("utf-8")
+        )
+        with patch.object(data, "orjson", None):
+            self.assertEqual(
+                data.json_dumps_bytes(payload),
+                data.json_dumps(payload).encode("utf-8"),
+            )
+
+    def test_join_json_fragments_builds_array(self):
+        fragments = [json.dumps({"a": 1}), json.dumps({"b": [2]})]
+        self.assertEqual(
+            json.loads(data.join_json_fragments(fragments)), [{"a": 1}, {"b": [2]}]
+        )
+        self.assertEqual(json.loads(data.join_json_fragments([])), [])
+
+    def test_json_loads_raises_stdlib_decode_error(self):
+        self.assertEqual(data.json_loads('{"queries": ["a"]}'), {"queries": ["a"]})
+        with self.assertRaises(json.JSONDecodeError):
+            data.json_loads("John Doe")
+        with patch.object(data, "orjson", None):
+            self.assertEqual(data.json_loads("[1, 2]"), [1, 2])
+            with self.assertRaises(json.JSONDecodeError):
+                data.json_loads("John Doe")
+
+
+if __name__ == "__main__":
+    unittest.main()
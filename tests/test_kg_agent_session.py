@@ -0,0 +1,104 @@
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+os.environ.setdefault("BRAINPAT_TOKEN", "test-token")
+
+from src.config import config
+from src.constants.kg import Node
+from src.constants.output_schemas import RetrieveNeighborsOutputSchema
+from src.core.agents import kg_agent as kg_agent_module
+from src.core.agents.kg_agent import KGAgentSession
+
+
+class _FakeAgent:
+    def __init__(self, answers):
+        self.answers = list(answers)
+        self.calls = []
+
+    def invoke(self, payload, config=None):
+        self.calls.append((payload, config))
+        return {"messages": [{"role": "assistant", "content": self.answers.pop(0)}]}
+
+
+class KGAgentSessionTests(unittest.TestCase):
+    def _session(self, architecture, answers):
+        self.agent = _FakeAgent(answers)
+        self.kg_agent = MagicMock()
+        patches = [
+            patch.object(config, "agentic_architecture", architecture),
+            patch.object(
+                kg_agent_module.runtime_agent_factory,
+                "build",
+                return_value=self.agent,
+            ),
+            patch.object(kg_agent_module, "KGAgentAddTripletsTool"),
+            patch.object(kg_agent_module, "KGAgentSearchGraphTool"),
+            patch.object(kg_agent_module, "KGAgentExecuteGraphOperationTool"),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        return KGAgentSession(
+            self.kg_agent,
+            identification_params={},
+            metadata={},
+            brain_id="b",
+            thread_id="thread-1",
+        )
+
+    def test_checkpointer_turns_send_only_the_new_message(self):
+        session = self._session("langchain", ["updated", '{"neighbors": []}'])
+
+        session.update("Ada works at Acme.")
+        session.retrieve(Node(labels=["Person"], name="Ada"))
+
+        for payload, invoke_config in self.agent.calls:
+            self.assertEqual(len(payload["messages"]), 1)
+            self.assertEqual(payload["messages"][0]["role"], "user")
+            self.assertEqual(invoke_config["configurable"], {"thread_id": "thread-1"})
+        self.assertEqual(session.history, [])
+
+    def test_custom_backend_replays_the_history(self):
+        session = self._session("custom", ["updated", '{"neighbors": []}'])
+
+        session.update("Ada works at Acme.")
+        session.retrieve(Node(labels=["Person"], name="Ada"))
+
+        first_payload, first_config = self.agent.calls[0]
+        second_payload, _ = self.agent.calls[1]
+        self.assertNotIn("configurable", first_config)
+        self.assertEqual(len(first_payload["messages"]), 1)
+        self.assertEqual(
+            [m["role"] for m in second_payload["messages"]],
+            ["user", "assistant", "user"],
+        )
+        self.assertEqual(second_payload["messages"][1]["content"], "updated")
+
+    def test_retrieve_parses_the_session_answer(self):
+        session = self._session(
+            "custom",
+            ['{"neighbors": [{"uuid": "n1", "similarities": ["same employer"]}]}'],
+        )
+
+        result = session.retrieve(Node(labels=["Person"], name="Ada"))
+
+        self.assertEqual([n.uuid for n in result.neighbors], ["n1"])
+        self.kg_agent.retrieve_neighbors.assert_not_called()
+
+    def test_retrieve_falls_back_to_one_shot_retrieval_on_unparsable_answer(self):
+        session = self._session("custom", ["I could not find any neighbors."])
+        fallback = RetrieveNeighborsOutputSchema(neighbors=[])
+        self.kg_agent.retrieve_neighbors.return_value = fallback
+        node = Node(labels=["Person"], name="Ada")
+
+        result = session.retrieve(node, looking_for="colleagues", limit=5)
+
+        self.assertIs(result, fallback)
+        self.kg_agent.retrieve_neighbors.assert_called_once_with(
+            node, "colleagues", 5, brain_id="b"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+import os
+import time
+import unittest
+from unittest.mock import patch
+
+os.environ.setdefault("BRAINPAT_TOKEN", "test-token")
+
+from src.config import config
+from src.constants.embeddings import Vector
+from src.constants.kg import Node
+from src.core.agents.scout_agent import ScoutAgent, _ScoutAgentResponse, _ScoutEntity
+
+
+class _FakeCacheAdapter:
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key, brain_id="default"):
+        return self.values.get((brain_id, key))
+
+    def set(self, key, value, brain_id="default", expires_in=None):
+        self.values[(brain_id, key)] = value
+
+
+class _FakeVectorStore:
+    def __init__(self, hits=None):
+        self.hits = hits or []
+        self.added = []
+        self.removed = []
+
+    def search_vectors(self, data_vector, brain_id="default", store="default", k=10):
+        return self.hits
+
+    def similarity(self, vector):
+        return vector.distance
+
+    def add_vectors(self, vectors, store, brain_id="default"):
+        self.added.extend(vectors)
+
+    def remove_vectors(self, ids, store, brain_id="default"):
+        self.removed.extend(ids)
+
+
+class _FakeEmbeddings:
+    def embed_text(self, text):
+        return Vector(id="query", embeddings=[1.0, 0.0], metadata={})
+
+
+def _extraction(name):
+    return {
+        "structured_response": _ScoutAgentResponse(
+            entities=[_ScoutEntity(type="Person", name=name)]
+        )
+    }
+
+
+class ScoutAgentCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.cache_adapter = _FakeCacheAdapter()
+        self.vector_store = _FakeVectorStore()
+        self.agent = ScoutAgent(
+            llm_adapter=None,
+            cache_adapter=self.cache_adapter,
+            kg=None,
+            vector_store=self.vector_store,
+            embeddings=_FakeEmbeddings(),
+        )
+        self.addCleanup(self.agent.close)
+        for name, value in (
+            ("scout_cache_enabled", True),
+            ("scout_cache_semantic_enabled", False),
+        ):
+            patcher = patch.object(config, name, value, create=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _run(self, text, targeting=None, extracted="Ada"):
+        with (
+            patch.object(self.agent, "_get_agent", return_value=object()),
+            patch.object(
+                self.agent,
+                "_invoke_agent_with_retry",
+                return_value=_extraction(extracted),
+            ) as invoke,
+        ):
+            result = self.agent.run(text, targeting=targeting, brain_id="b")
+        return result, invoke.call_count
+
+    def test_exact_hit_skips_the_llm(self):
+        first, first_calls = self._run("Ada met Alan.")
+        second, second_calls = self._run("Ada met Alan.", extracted="Other")
+
+        self.assertEqual(first_calls, 1)
+        self.assertEqual(second_calls, 0)
+        self.assertEqual([e.name for e in second.entities], ["Ada"])
+        self.assertNotEqual(first.entities[0].uuid, second.entities[0].uuid)
+
+    def test_targeting_with_the_same_name_but_other_details_misses(self):
+        acme_a = Node(labels=["Company"], name="Acme", description="A bakery")
+        acme_b = Node(labels=["Company"], name="Acme", description="A law firm")
+
+        _, first_calls = self._run("Ada joined Acme.", targeting=acme_a)
+        _, second_calls = self._run("Ada joined Acme.", targeting=acme_b)
+
+        self.assertEqual(first_calls, 1)
+        self.assertEqual(second_calls, 1)
+
+    def test_semantic_lookup_skips_and_removes_expired_hits(self):
+        prompt = self.agent._build_prompt("Ada met Alan.")
+        _, context = self.agent._cache_identity(prompt, None, "granular")
+        stored_key = "scout_cache:stored"
+        self.cache_adapter.set(
+            stored_key,
+            _ScoutAgentResponse(
+                entities=[_ScoutEntity(type="Person", name="Ada")]
+            ).model_dump_json(),
+            brain_id="b",
+        )
+
+        def hit(expires_at):
+            return Vector(
+                id="stored-vector",
+                metadata={
+                    "cache_key": stored_key,
+                    "context": context,
+                    "expires_at": expires_at,
+                },
+                distance=0.99,
+            )
+
+        with patch.object(config, "scout_cache_semantic_enabled", True, create=True):
+            self.vector_store.hits = [hit(time.time() - 1)]
+            cached, vector = self.agent._cache_lookup(
+                "scout_cache:query", context, "Ada met Alan!", None, "b"
+            )
+            self.assertIsNone(cached)
+            self.assertIsNotNone(vector)
+            self.assertEqual(self.vector_store.removed, ["stored-vector"])
+
+            self.vector_store.hits = [hit(time.time() + 60)]
+            cached, _ = self.agent._cache_lookup(
+                "scout_cache:query", context, "Ada met Alan!", None, "b"
+            )
+            self.assertEqual([e.name for e in cached.entities], ["Ada"])
+
+            cached, _ = self.agent._cache_lookup(
+                "scout_cache:query", "other-context", "Ada met Alan!", None, "b"
+            )
+            self.assertIsNone(cached)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -200,5 +200,25 @@ class JanitorToolDeduplicationTests(unittest.TestCase):
         self.assertNotIn("JanitorAgentExecuteGraphOperationTool", source)
 
 
+class BulkRelationshipWriteTests(unittest.TestCase):
+    def test_neo4j_client_unwinds_relationship_batches(self):
+        source = read_source("src/lib/neo4j/client.py")
+        self.assertIn("def add_relationships(", source)
+        self.assertIn("UNWIND $rows AS row", source)
+        self.assertIn("RELATIONSHIP_BATCH_SIZE = 1000", source)
+
+    def test_graph_interface_falls_back_to_single_writes(self):
+        source = read_source("src/adapters/interfaces/graph.py")
+        self.assertIn("def add_relationships(", source)
+        self.assertIn(
+            "self.add_relationship(subject, predicate, to_object, brain_id)", source
+        )
+
+    def test_architect_ingestion_buffers_relationship_writes(self):
+        source = read_source("src/workers/tasks/ingestion.py")
+        self.assertIn("pending_relationships.append(", source)
+        self.assertIn("graph_adapter.add_relationships(", source)
+
+
 if __name__ == "__main__":
     unittest.main()
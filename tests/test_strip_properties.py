@@ -0,0 +1,41 @@
+import unittest
+
+from src.utils.cleanup import strip_model, strip_object, strip_properties
+
+
+class StripPropertiesTests(unittest.TestCase):
+    def test_strips_nested_empty_values_and_popped_keys(self):
+        objs = [
+            {
+                "name": "Alice",
+                "blank": "  ",
+                "missing": None,
+                "empty": {},
+                "nested": {"keep": 1, "drop": None, "items": [{"x": ""}, 2]},
+                "uuid": "abc",
+            },
+            "raw",
+        ]
+        self.assertEqual(
+            strip_properties(objs, ["uuid"]),
+            [{"name": "Alice", "nested": {"keep": 1, "items": [{}, 2]}}, "raw"],
+        )
+
+    def test_strip_object_matches_single_item_list(self):
+        obj = {"a": {"b": None, "c": [{"d": " "}]}, "e": 0}
+        self.assertEqual(strip_object(obj), strip_properties([obj])[0])
+
+    def test_strip_model_excludes_popped_fields_from_the_dump(self):
+        class _Model:
+            def model_dump(self, mode=None, exclude=None):
+                dumped = {"name": "Alice", "v_id": "v1", "meta": {"v_id": "v2", "x": ""}}
+                return {k: v for k, v in dumped.items() if k not in (exclude or ())}
+
+        self.assertEqual(strip_model(_Model(), ["v_id"]), {"name": "Alice", "meta": {}})
+        self.assertEqual(
+            strip_model(_Model()), {"name": "Alice", "v_id": "v1", "meta": {"v_id": "v2"}}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()